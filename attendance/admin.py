@@ -1,10 +1,25 @@
 from django.contrib import admin
 
-from .models import AttendanceRecord
+from core.admin_tools import ScalableAdminMixin
+
+from .models import AttendanceAlertEvent, AttendanceRecord
 
 
 @admin.register(AttendanceRecord)
-class AttendanceRecordAdmin(admin.ModelAdmin):
+class AttendanceRecordAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("id", "employee", "date", "status", "check_in_time", "check_out_time")
-    search_fields = ("employee__first_name", "employee__last_name", "notes")
-    list_filter = ("status", "date")
+    list_select_related = ("employee",)
+    # Searched by indexed name prefix; free-text notes search would scan the table.
+    search_fields = ("employee__last_name", "employee__first_name")
+    list_filter = ("status",)
+    date_hierarchy = "date"
+    autocomplete_fields = ("employee",)
+    # Newest first, walking the (date, status) index; -id keeps page order stable.
+    ordering = ("-date", "-status", "-id")
+
+
+@admin.register(AttendanceAlertEvent)
+class AttendanceAlertEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "employee", "kind", "attendance_rate", "window_end", "created_at")
+    list_filter = ("kind",)
+    list_select_related = ("employee",)
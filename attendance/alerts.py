@@ -0,0 +1,153 @@
+"""Incremental low-attendance alerting.
+
+Every employee has an ``AttendanceWindow`` holding one status code per day of a
+trailing window that ends today. Writing an ``AttendanceRecord`` only rewrites
+one slot, so the alert set stays live without rescanning history. Records
+dated after today (planned leave) are left out until their day comes, and a
+window left over from an earlier day is recounted from the records in its new
+range, which also expires alerts for employees who stop recording attendance.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AttendanceAlertEvent, AttendanceRecord, AttendanceWindow
+
+EMPTY_SLOT = "."
+STATUS_CODES = {
+    AttendanceRecord.Status.PRESENT: "p",
+    AttendanceRecord.Status.ABSENT: "a",
+    AttendanceRecord.Status.REMOTE: "r",
+    AttendanceRecord.Status.SICK: "s",
+    AttendanceRecord.Status.VACATION: "v",
+}
+# Present and remote both count as working days, matching the portal dashboard.
+ATTENDED_CODES = frozenset(
+    {STATUS_CODES[AttendanceRecord.Status.PRESENT], STATUS_CODES[AttendanceRecord.Status.REMOTE]}
+)
+
+
+def _reporting_config() -> dict[str, Any]:
+    return getattr(settings, "REPORTING_CONFIG", {})
+
+
+def window_days() -> int:
+    config = _reporting_config()
+    return int(config.get("ATTENDANCE_ALERT_WINDOW_DAYS", config.get("RECENT_PERIOD_DAYS", 30)))
+
+
+def alert_threshold() -> float:
+    return float(_reporting_config().get("ATTENDANCE_ALERT_THRESHOLD", 0.9))
+
+
+def min_recorded_days() -> int:
+    return int(_reporting_config().get("ATTENDANCE_ALERT_MIN_DAYS", 5))
+
+
+def _slot_weights(code: str) -> tuple[int, int]:
+    """Return the (attended, recorded) contribution of a slot code."""
+    if code == EMPTY_SLOT:
+        return 0, 0
+    return (1 if code in ATTENDED_CODES else 0), 1
+
+
+def _evaluate(window: AttendanceWindow) -> None:
+    """Flip ``is_alerting`` when the rate crosses the threshold and log the transition."""
+    rate = window.attendance_rate
+    alerting = rate is not None and window.recorded_days >= min_recorded_days() and rate < alert_threshold()
+    if alerting == window.is_alerting:
+        return
+    window.is_alerting = alerting
+    AttendanceAlertEvent.objects.create(
+        employee_id=window.employee_id,
+        kind=AttendanceAlertEvent.Kind.ENTERED if alerting else AttendanceAlertEvent.Kind.CLEARED,
+        attendance_rate=rate or 0.0,
+        window_end=window.window_end,
+    )
+
+
+def coerce_date(value: date | str) -> date:
+    """Accept the ISO strings callers sometimes pass to ``objects.create``."""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _set_slot(employee_id: int, day: date | str, code: str) -> None:
+    size = window_days()
+    today = timezone.localdate()
+    offset = (today - coerce_date(day)).days
+    if not 0 <= offset < size:
+        return  # Outside the window; future days are counted once the calendar reaches them.
+    with transaction.atomic():
+        window = AttendanceWindow.objects.select_for_update().filter(employee_id=employee_id).first()
+        if window is None or window.window_end != today or len(window.slots) != size:
+            # New, left over from an earlier day, or the configured size changed: recount it.
+            rebuild_window(employee_id)
+            return
+        previous = window.slots[offset]
+        if previous == code:
+            return
+        old_attended, old_recorded = _slot_weights(previous)
+        new_attended, new_recorded = _slot_weights(code)
+        window.attended_days += new_attended - old_attended
+        window.recorded_days += new_recorded - old_recorded
+        window.slots = window.slots[:offset] + code + window.slots[offset + 1:]
+        _evaluate(window)
+        window.save()
+
+
+def record_attendance(employee_id: int, day: date | str, status: str) -> None:
+    """Account for an attendance record being written for ``day``."""
+    _set_slot(employee_id, day, STATUS_CODES.get(status, EMPTY_SLOT))
+
+
+def clear_attendance(employee_id: int, day: date | str) -> None:
+    """Account for the attendance record on ``day`` going away."""
+    _set_slot(employee_id, day, EMPTY_SLOT)
+
+
+def rebuild_window(employee_id: int) -> AttendanceWindow | None:
+    """Recompute an employee's window ending today from ``AttendanceRecord``."""
+    size = window_days()
+    today = timezone.localdate()
+    records = AttendanceRecord.objects.filter(
+        employee_id=employee_id, date__range=(today - timedelta(days=size - 1), today)
+    ).values_list("date", "status")
+    with transaction.atomic():
+        window = AttendanceWindow.objects.select_for_update().filter(employee_id=employee_id).first()
+        rows = list(records)
+        if window is None:
+            if not rows:
+                return None
+            window = AttendanceWindow(employee_id=employee_id)
+        slots = [EMPTY_SLOT] * size
+        for day, status in rows:
+            slots[(today - day).days] = STATUS_CODES.get(status, EMPTY_SLOT)
+        window.window_end = today
+        window.slots = "".join(slots)
+        window.attended_days = sum(_slot_weights(code)[0] for code in slots)
+        window.recorded_days = sum(_slot_weights(code)[1] for code in slots)
+        _evaluate(window)
+        window.save()
+    return window
+
+
+def advance_windows() -> int:
+    """Move every window that does not end today forward to today; return how many moved."""
+    employee_ids = AttendanceWindow.objects.exclude(window_end=timezone.localdate()).values_list(
+        "employee_id", flat=True
+    )
+    advanced = 0
+    for employee_id in employee_ids.iterator():
+        rebuild_window(employee_id)
+        advanced += 1
+    return advanced
+
+
+def current_alerts():
+    """Return the windows of every employee currently below the attendance threshold."""
+    return AttendanceWindow.objects.filter(is_alerting=True).select_related("employee")
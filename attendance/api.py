@@ -1,13 +1,23 @@
 """API endpoints for attendance records."""
+from dataclasses import asdict
+from datetime import date, timedelta
+
 import django_filters
-from django.db.models import Count
+from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.changefeed import ChangeFeedMixin
+from core.fastpath import FastReadMixin
+from employees.api import EmployeeFilter
+from employees.models import Employee, full_name_expression
+from reports import services as report_services
+
+from . import alerts, heatmap, sync
 from .models import AttendanceRecord
-from .serializers import AttendanceRecordSerializer
+from .serializers import AttendanceRecordSerializer, KioskSyncSerializer
 
 
 class AttendanceRecordFilter(django_filters.FilterSet):
@@ -22,11 +32,12 @@ class AttendanceRecordFilter(django_filters.FilterSet):
         }
 
 
-class AttendanceRecordViewSet(viewsets.ModelViewSet):
+class AttendanceRecordViewSet(ChangeFeedMixin, FastReadMixin, viewsets.ModelViewSet):
     queryset = AttendanceRecord.objects.select_related("employee")
     serializer_class = AttendanceRecordSerializer
     filterset_class = AttendanceRecordFilter
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    fast_read_annotations = {"employee_name": full_name_expression("employee__")}
     search_fields = [
         "employee__first_name",
         "employee__last_name",
@@ -46,7 +57,77 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
                 target_date = timezone.datetime.strptime(date_str, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"detail": "Invalid date format. Use YYYY-MM-DD."}, status=400)
-        records = self.queryset.filter(date=target_date)
-        totals = records.values("status").order_by().annotate(count=Count("id"))
-        summary = {item["status"]: item["count"] for item in totals}
-        return Response({"date": target_date, "summary": summary})
+        return Response(report_services.daily_summary(target_date))
+
+    @action(detail=False, methods=["get"], url_path="alerts", url_name="alerts")
+    def low_attendance_alerts(self, request):
+        """List employees whose rolling attendance rate is below the alert threshold."""
+        windows = alerts.current_alerts().order_by("employee__last_name", "employee__first_name")
+        results = [
+            {
+                "employee_id": window.employee_id,
+                "employee_name": str(window.employee),
+                "attendance_rate": round(window.attendance_rate, 3),
+                "attended_days": window.attended_days,
+                "recorded_days": window.recorded_days,
+                "window_end": window.window_end,
+            }
+            for window in windows
+        ]
+        return Response(
+            {
+                "threshold": alerts.alert_threshold(),
+                "window_days": alerts.window_days(),
+                "results": results,
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="heatmap")
+    def heatmap(self, request):
+        """
+        Employees x days attendance grid as a packed binary payload (see ``attendance.heatmap``).
+
+        Employees are selected with the employee list filters (``department``,
+        ``department_id``, ``manager``, ``status``, ...); ``start``/``end`` default
+        to the year ending today and ``encoding`` is ``status`` or ``presence``.
+        """
+        params = request.query_params
+        try:
+            end = date.fromisoformat(params["end"]) if params.get("end") else timezone.localdate()
+            start = (
+                date.fromisoformat(params["start"])
+                if params.get("start")
+                else end - timedelta(days=heatmap.MAX_DAYS - 1)
+            )
+        except ValueError:
+            return Response({"detail": "start and end must be YYYY-MM-DD dates."}, status=400)
+        employees = EmployeeFilter(params, queryset=Employee.objects.order_by("id"), request=request)
+        if not employees.is_valid():
+            return Response(employees.errors, status=400)
+        try:
+            payload = heatmap.build(employees.qs, start, end, params.get("encoding", "status"))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+        return HttpResponse(payload, content_type="application/octet-stream")
+
+    @action(detail=False, methods=["post"], url_path="sync", url_name="sync")
+    def kiosk_sync(self, request):
+        """
+        Apply a batch of queued kiosk events and acknowledge every key (see ``attendance.sync``).
+
+        Body: ``{"device": "lobby-1", "events": [{"key", "employee", "action", "at", ...}]}``
+        where ``action`` is ``check_in``, ``check_out`` or ``mark``. The response
+        lists the keys that were ``applied``, ``stale`` (older than the record),
+        ``duplicate`` (already seen) or ``rejected`` (with errors); the kiosk can
+        drop all of them from its queue.
+        """
+        envelope = KioskSyncSerializer(data=request.data)
+        if not envelope.is_valid():
+            return Response(envelope.errors, status=400)
+        try:
+            result = sync.sync_events(envelope.validated_data["device"], envelope.validated_data["events"])
+        except sync.SyncConflict as exc:
+            return Response({"detail": str(exc)}, status=409)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+        return Response({**asdict(result), "server_time": timezone.now()})
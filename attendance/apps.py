@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AttendanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "attendance"
+
+    def ready(self):
+        import attendance.signals  # noqa: F401  Registers the alert window handlers.
@@ -0,0 +1,268 @@
+"""Per-employee yearly attendance bitmaps.
+
+``AttendanceBitmap`` keeps, for every employee and calendar year, one 368-bit
+field per status (bit ``n`` = day ``n + 1`` of the year). The signal handlers
+flip a single bit when a record is written, so all-time totals, counts over
+any date range and attendance streaks are answered from a handful of small
+rows with ``int.bit_count()`` and masks instead of counting records.
+"""
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.db.models import Aggregate, Func, Subquery, TextField
+
+from .models import BITMAP_BYTES, AttendanceBitmap, AttendanceRecord
+
+CATEGORIES = tuple(AttendanceRecord.Status.values)
+ATTENDED = (AttendanceRecord.Status.PRESENT, AttendanceRecord.Status.REMOTE)
+
+# {year: {status: bits}} for one employee
+YearBits = dict[int, dict[str, int]]
+
+
+def _bit(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def _to_int(value) -> int:
+    return int.from_bytes(bytes(value), "little")
+
+
+def _to_bytes(bits: int) -> bytes:
+    return bits.to_bytes(BITMAP_BYTES, "little")
+
+
+def _mask(first_bit: int, last_bit: int) -> int:
+    """Bits ``first_bit``..``last_bit`` inclusive."""
+    return ((1 << (last_bit + 1)) - 1) ^ ((1 << first_bit) - 1)
+
+
+def set_day(employee_id: int, day: date, status: str | None) -> None:
+    """Record ``status`` for ``day`` (``None`` clears the day)."""
+    bit = 1 << _bit(day)
+    # No savepoint: this runs inside the record's own save transaction, and any error aborts both.
+    with transaction.atomic(savepoint=False):
+        row = AttendanceBitmap.objects.select_for_update().filter(employee_id=employee_id, year=day.year).first()
+        if row is None:
+            if status is None:
+                return
+            row = AttendanceBitmap(employee_id=employee_id, year=day.year)
+        changed = []
+        for category in CATEGORIES:
+            bits = _to_int(getattr(row, category))
+            updated = (bits | bit) if category == status else (bits & ~bit)
+            if updated != bits:
+                setattr(row, category, _to_bytes(updated))
+                changed.append(category)
+        if row.pk is None:
+            row.save()
+        elif changed:
+            row.save(update_fields=[*changed, "updated_at"])
+
+
+def record_attendance(employee_id: int, day: date, status: str) -> None:
+    set_day(employee_id, day, status if status in CATEGORIES else None)
+
+
+def clear_attendance(employee_id: int, day: date) -> None:
+    set_day(employee_id, day, None)
+
+
+def bitmap_rows(employee_id: int):
+    """Values queryset of an employee's bitmap rows (await it for async callers)."""
+    return AttendanceBitmap.objects.filter(employee_id=employee_id).values_list("year", *CATEGORIES)
+
+
+def from_rows(rows: Iterable[tuple]) -> YearBits:
+    return {year: {category: _to_int(value) for category, value in zip(CATEGORIES, values)} for year, *values in rows}
+
+
+def load(employee_id: int) -> YearBits:
+    """All of an employee's bitmaps in one query."""
+    return from_rows(bitmap_rows(employee_id))
+
+
+class _Hex(Func):
+    """A ``BinaryField`` as hex text, so it can travel inside JSON."""
+
+    function = "HEX"
+    output_field = TextField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="ENCODE(%(expressions)s, 'hex')", **extra_context)
+
+
+class _JSONArray(Func):
+    """``JSON_ARRAY()`` without ``functions.JSONArray``'s JSON1 feature probe query."""
+
+    function = "JSON_ARRAY"
+    output_field = TextField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="JSON_BUILD_ARRAY", **extra_context)
+
+
+class _JSONGroupArray(Aggregate):
+    """The grouped rows' values as the text of one JSON array."""
+
+    function = "JSON_GROUP_ARRAY"
+    output_field = TextField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="JSON_AGG(%(expressions)s)::text", **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="JSON_ARRAYAGG", **extra_context)
+
+
+def rows_subquery(employee) -> Subquery:
+    """
+    All of an employee's bitmaps as one JSON value, for annotating a query that
+    already loads the employee (``employee`` is usually an ``OuterRef``);
+    ``from_json()`` turns it back into ``YearBits``.
+    """
+    rows = (
+        AttendanceBitmap.objects.filter(employee=employee)
+        .order_by()
+        .values("employee")
+        .annotate(rows=_JSONGroupArray(_JSONArray("year", *map(_Hex, CATEGORIES))))
+        .values("rows")
+    )
+    return Subquery(rows, output_field=TextField())
+
+
+def from_json(rows: str | None) -> YearBits:
+    return from_rows((year, *map(bytes.fromhex, values)) for year, *values in json.loads(rows or "[]"))
+
+
+def count_range(bitmaps: YearBits, start: date | None = None, end: date | None = None) -> dict[str, int]:
+    """Days per status between ``start`` and ``end`` (inclusive; open-ended when omitted)."""
+    counts = dict.fromkeys(CATEGORIES, 0)
+    for year, bits in bitmaps.items():
+        if (start and year < start.year) or (end and year > end.year):
+            continue
+        first = _bit(start) if start and start.year == year else 0
+        last = _bit(end) if end and end.year == year else BITMAP_BYTES * 8 - 1
+        mask = _mask(first, last)
+        for category in CATEGORIES:
+            counts[category] += (bits[category] & mask).bit_count()
+    return counts
+
+
+def summary(bitmaps: YearBits, start: date | None = None, end: date | None = None) -> dict[str, int]:
+    """``total_days``/``present_days``/``absent_days`` as the reports and insights have always counted them."""
+    counts = count_range(bitmaps, start, end)
+    return {
+        "total_days": sum(counts.values()),
+        "present_days": counts[AttendanceRecord.Status.PRESENT],
+        "absent_days": counts[AttendanceRecord.Status.ABSENT],
+    }
+
+
+def current_streak(bitmaps: YearBits, as_of: date, statuses: Iterable[str] = ATTENDED) -> int:
+    """
+    Consecutive recorded days up to ``as_of`` whose status is in ``statuses``.
+
+    Days without a record (weekends, holidays) neither extend nor break a streak.
+    """
+    statuses = tuple(statuses)
+    streak = 0
+    for year in sorted((year for year in bitmaps if year <= as_of.year), reverse=True):
+        bits = bitmaps[year]
+        last = _bit(as_of) if year == as_of.year else BITMAP_BYTES * 8 - 1
+        window = _mask(0, last)
+        recorded = 0
+        for category in CATEGORIES:
+            recorded |= bits[category]
+        matching = 0
+        for category in statuses:
+            matching |= bits[category]
+        breaks = recorded & ~matching & window
+        if breaks:
+            # Only the matching days after the most recent break count.
+            return streak + (matching & window & ~_mask(0, breaks.bit_length() - 1)).bit_count()
+        streak += (matching & window).bit_count()
+    return streak
+
+
+def longest_streak(bitmaps: YearBits, statuses: Iterable[str] = ATTENDED) -> int:
+    """Longest run of recorded days with a status in ``statuses`` (unrecorded days are skipped)."""
+    statuses = tuple(statuses)
+    longest = current = 0
+    for year in sorted(bitmaps):
+        bits = bitmaps[year]
+        recorded = matching = 0
+        for category in CATEGORIES:
+            recorded |= bits[category]
+        for category in statuses:
+            matching |= bits[category]
+        while recorded:
+            low = recorded & -recorded
+            current = current + 1 if matching & low else 0
+            longest = max(longest, current)
+            recorded ^= low
+    return longest
+
+
+def expected_bitmaps(queryset=None) -> dict[tuple[int, int], dict[str, int]]:
+    """Bitmaps computed from ``AttendanceRecord`` rows, keyed by ``(employee_id, year)``."""
+    queryset = AttendanceRecord.objects.all() if queryset is None else queryset
+    expected: dict[tuple[int, int], dict[str, int]] = defaultdict(lambda: dict.fromkeys(CATEGORIES, 0))
+    rows = queryset.order_by().values_list("employee_id", "date", "status").iterator(chunk_size=5000)
+    for employee_id, day, status in rows:
+        if status in CATEGORIES:
+            expected[(employee_id, day.year)][status] |= 1 << _bit(day)
+    return expected
+
+
+def check(employee_ids: list[int] | None = None) -> list[dict[str, Any]]:
+    """Compare stored bitmaps with ``AttendanceRecord``; return one entry per mismatching employee/year."""
+    records = AttendanceRecord.objects.all()
+    stored_rows = AttendanceBitmap.objects.all()
+    if employee_ids is not None:
+        records = records.filter(employee_id__in=employee_ids)
+        stored_rows = stored_rows.filter(employee_id__in=employee_ids)
+    expected = expected_bitmaps(records)
+    empty = dict.fromkeys(CATEGORIES, 0)
+    stored = {
+        (employee_id, year): {category: _to_int(value) for category, value in zip(CATEGORIES, values)}
+        for employee_id, year, *values in stored_rows.values_list("employee_id", "year", *CATEGORIES).iterator()
+    }
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want, have = expected.get(key, empty), stored.get(key, empty)
+        wrong = {
+            category: (have[category] ^ want[category]).bit_count()
+            for category in CATEGORIES
+            if have[category] != want[category]
+        }
+        if wrong:
+            mismatches.append({"employee_id": key[0], "year": key[1], "wrong_days": wrong})
+    return mismatches
+
+
+def rebuild(employee_ids: list[int] | None = None) -> int:
+    """Recompute bitmaps from ``AttendanceRecord``; return the number of rows written."""
+    records = AttendanceRecord.objects.all()
+    stale = AttendanceBitmap.objects.all()
+    if employee_ids is not None:
+        records = records.filter(employee_id__in=employee_ids)
+        stale = stale.filter(employee_id__in=employee_ids)
+    with transaction.atomic():
+        # Lock the rows first: record writes in flight either commit before the read below or
+        # wait and then apply their change to the rebuilt rows.
+        list(stale.select_for_update().values_list("pk", flat=True))
+        rows = [
+            AttendanceBitmap(
+                employee_id=employee_id, year=year, **{category: _to_bytes(bits[category]) for category in CATEGORIES}
+            )
+            for (employee_id, year), bits in expected_bitmaps(records).items()
+        ]
+        stale.delete()
+        AttendanceBitmap.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,26 @@
+"""Scheduled attendance maintenance."""
+from core.scheduler import job
+from employees.models import Employee
+
+from . import alerts, bitmaps
+
+
+@job("5 0 * * *", lock_ttl=3600)
+def advance_alert_windows():
+    """Daily move of alert windows to the new day, so alerts expire for employees without new records."""
+    alerts.advance_windows()
+
+
+@job("0 2 * * 0", lock_ttl=4 * 3600)
+def rebuild_alert_windows():
+    """Weekly repair of alert windows, in case records were written around the ORM (raw SQL, imports)."""
+    for employee_id in Employee.objects.values_list("id", flat=True).iterator():
+        alerts.rebuild_window(employee_id)
+
+
+@job("30 2 * * 0", lock_ttl=4 * 3600)
+def repair_bitmaps():
+    """Weekly consistency check of the attendance bitmaps; rebuilds the employees that drifted."""
+    drifted = sorted({mismatch["employee_id"] for mismatch in bitmaps.check()})
+    if drifted:
+        bitmaps.rebuild(drifted)
@@ -0,0 +1,29 @@
+"""Management command to rebuild rolling attendance alert windows from history."""
+from django.core.management.base import BaseCommand
+
+from attendance import alerts
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Rebuild attendance alert windows from AttendanceRecord (for backfills and bulk imports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employee',
+            type=int,
+            action='append',
+            dest='employees',
+            help='Only rebuild the given employee id (can be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        employee_ids = options['employees'] or Employee.objects.values_list('id', flat=True)
+        rebuilt = 0
+        for employee_id in employee_ids:
+            alerts.rebuild_window(employee_id)
+            rebuilt += 1
+        alerting = alerts.current_alerts().count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {rebuilt} attendance windows; {alerting} employees are below the threshold.')
+        )
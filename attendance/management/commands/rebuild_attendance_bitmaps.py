@@ -0,0 +1,35 @@
+"""Management command to rebuild or verify the yearly attendance bitmaps."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance import bitmaps
+
+
+class Command(BaseCommand):
+    help = 'Rebuild attendance bitmaps from AttendanceRecord, or --check them for drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employee',
+            type=int,
+            action='append',
+            dest='employees',
+            help='Only process the given employee id (can be repeated)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compare the bitmaps with AttendanceRecord without changing them; fail on mismatches',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = bitmaps.check(options['employees'])
+            if mismatches:
+                self.stdout.write(json.dumps(mismatches, indent=2))
+                raise CommandError(f'{len(mismatches)} employee-years have bitmaps that disagree with their records.')
+            self.stdout.write(self.style.SUCCESS('Attendance bitmaps match AttendanceRecord.'))
+            return
+        written = bitmaps.rebuild(options['employees'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} attendance bitmaps.'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+        ('employees', '0002_employee_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_end', models.DateField()),
+                ('slots', models.CharField(max_length=366)),
+                ('attended_days', models.PositiveIntegerField(default=0)),
+                ('recorded_days', models.PositiveIntegerField(default=0)),
+                ('is_alerting', models.BooleanField(db_index=True, default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_window', to='employees.employee')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AttendanceAlertEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('entered', 'Entered'), ('cleared', 'Cleared')], max_length=10)),
+                ('attendance_rate', models.FloatField()),
+                ('window_end', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_alert_events', to='employees.employee')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['employee', 'created_at'], name='attendance__employe_9a16f5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:09
+
+import attendance.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+STATUSES = ('present', 'absent', 'remote', 'sick', 'vacation')
+
+
+def build_bitmaps(apps, schema_editor):
+    """Fill the bitmaps from existing attendance records."""
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceBitmap = apps.get_model('attendance', 'AttendanceBitmap')
+    bitmaps = {}
+    rows = AttendanceRecord.objects.order_by().values_list('employee_id', 'date', 'status').iterator(chunk_size=5000)
+    for employee_id, day, status in rows:
+        if status in STATUSES:
+            bits = bitmaps.setdefault((employee_id, day.year), dict.fromkeys(STATUSES, 0))
+            bits[status] |= 1 << (day.timetuple().tm_yday - 1)
+    AttendanceBitmap.objects.bulk_create(
+        (
+            AttendanceBitmap(
+                employee_id=employee_id,
+                year=year,
+                **{status: value.to_bytes(46, 'little') for status, value in bits.items()},
+            )
+            for (employee_id, year), bits in bitmaps.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_attendance_alerts'),
+        ('employees', '0005_employee_name_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('present', models.BinaryField(default=attendance.models.empty_bitmap, max_length=46)),
+                ('absent', models.BinaryField(default=attendance.models.empty_bitmap, max_length=46)),
+                ('remote', models.BinaryField(default=attendance.models.empty_bitmap, max_length=46)),
+                ('sick', models.BinaryField(default=attendance.models.empty_bitmap, max_length=46)),
+                ('vacation', models.BinaryField(default=attendance.models.empty_bitmap, max_length=46)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_bitmaps', to='employees.employee')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employee', 'year'), name='attendance_bitmap_unique_employee_year')],
+            },
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:24
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def stamp_existing(apps, schema_editor):
+    """Existing records were last changed when they were last saved."""
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceRecord.objects.update(source_timestamp=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_attendance_bitmaps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancerecord',
+            name='source_timestamp',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(stamp_existing, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,15 @@ Attendance tracking models.
 This keeps track of who's at work, who's absent, etc.
 Each record represents one day for one employee.
 """
+from datetime import date
+
 from django.db import models
+from django.utils import timezone
+
+from core.models import AtomicSaveMixin
 
 
-class AttendanceRecord(models.Model):
+class AttendanceRecord(AtomicSaveMixin, models.Model):
     """
     Represents a single day's attendance detail for an employee.
     
@@ -56,6 +61,11 @@ class AttendanceRecord(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # When the latest change happened where it was made: the kiosk's clock for
+    # synced events, the server's clock otherwise. Kiosk sync compares event
+    # timestamps against it (last writer wins).
+    source_timestamp = models.DateTimeField(blank=True, null=True)
+
     class Meta:
         """
         Meta class defines extra options for the model.
@@ -76,6 +86,39 @@ class AttendanceRecord(models.Model):
             models.Index(fields=["employee", "date"]),  # Fast lookups for specific employee's dates
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the values a record had when it was loaded.
+
+        Signal handlers use this to notice when an update moves a record to
+        another day (or employee) without an extra query.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def _remember_loaded_values(self):
+        day = self.__dict__.get("date")
+        self._loaded_values = {
+            "employee_id": self.__dict__.get("employee_id"),
+            "date": date.fromisoformat(day) if isinstance(day, str) else day,
+            "status": self.__dict__.get("status"),
+        }
+
+    def save(self, *args, source_timestamp=None, **kwargs):
+        """
+        Stamp ``source_timestamp`` (now, unless a synced event supplies its own time).
+
+        ``_loaded_values`` is refreshed only after the ``post_save`` handlers
+        ran, so every handler sees the values the record had before this save.
+        """
+        self.source_timestamp = source_timestamp or timezone.now()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "source_timestamp"}
+        super().save(*args, **kwargs)
+        self._remember_loaded_values()
+
     def __str__(self) -> str:
         """
         String representation of the object.
@@ -84,3 +127,100 @@ class AttendanceRecord(models.Model):
         Example: "John Doe 2025-11-11 present"
         """
         return f"{self.employee} {self.date} {self.status}"
+
+
+class AttendanceWindow(models.Model):
+    """
+    Rolling attendance window used for low-attendance alerting.
+
+    One row per employee. ``slots`` holds one status code per day of the
+    trailing window ending at ``window_end`` (index 0 is ``window_end``,
+    index 1 the day before, and so on), so writes only touch a single slot
+    instead of re-counting the employee's whole history.
+    """
+
+    employee = models.OneToOneField(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        related_name="attendance_window",
+    )
+    window_end = models.DateField()
+    slots = models.CharField(max_length=366)
+    attended_days = models.PositiveIntegerField(default=0)  # Present or remote days in the window
+    recorded_days = models.PositiveIntegerField(default=0)  # Days with any attendance record
+    is_alerting = models.BooleanField(default=False, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def attendance_rate(self) -> float | None:
+        if not self.recorded_days:
+            return None
+        return self.attended_days / self.recorded_days
+
+    def __str__(self) -> str:
+        return f"{self.employee} window ending {self.window_end}"
+
+
+class AttendanceAlertEvent(models.Model):
+    """Records every time an employee enters or leaves the low-attendance alert set."""
+
+    class Kind(models.TextChoices):
+        ENTERED = "entered", "Entered"
+        CLEARED = "cleared", "Cleared"
+
+    employee = models.ForeignKey(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        related_name="attendance_alert_events",
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    attendance_rate = models.FloatField()
+    window_end = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["employee", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.employee} {self.kind} ({self.attendance_rate:.2f})"
+
+
+BITMAP_BYTES = 46  # 368 bits: one per day of a (leap) year
+
+
+def empty_bitmap() -> bytes:
+    return bytes(BITMAP_BYTES)
+
+
+class AttendanceBitmap(models.Model):
+    """
+    One employee's attendance for one calendar year as a bitmap per status.
+
+    Bit ``n`` (little-endian) of a status field is set when the employee has
+    a record with that status on day ``n + 1`` of the year, so counts over any
+    date range and streaks are popcounts and shifts (see ``attendance.bitmaps``)
+    instead of scans over ``AttendanceRecord``. The field names match the
+    ``AttendanceRecord.Status`` values.
+    """
+
+    employee = models.ForeignKey(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        related_name="attendance_bitmaps",
+    )
+    year = models.PositiveSmallIntegerField()
+    present = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+    absent = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+    remote = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+    sick = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+    vacation = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "year"], name="attendance_bitmap_unique_employee_year")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee} {self.year} bitmaps"
@@ -22,3 +22,32 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "employee_name", "created_at", "updated_at"]
+
+
+class KioskEventSerializer(serializers.Serializer):
+    """One queued kiosk event; see ``attendance.sync``."""
+
+    ACTIONS = ("check_in", "check_out", "mark")
+
+    key = serializers.CharField(max_length=64)
+    employee = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=ACTIONS)
+    at = serializers.DateTimeField()
+    status = serializers.ChoiceField(choices=AttendanceRecord.Status.choices, required=False)
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if attrs["action"] == "mark" and "status" not in attrs:
+            raise serializers.ValidationError("mark events need a status.")
+        return attrs
+
+
+class KioskSyncSerializer(serializers.Serializer):
+    """
+    The envelope of a kiosk sync batch. ``events`` stay raw: each one is
+    validated on its own with ``KioskEventSerializer`` so a bad event is
+    rejected without failing the batch.
+    """
+
+    device = serializers.CharField(max_length=100)
+    events = serializers.ListField()
@@ -0,0 +1,32 @@
+"""Signal handlers that keep derived attendance data (alert windows, bitmaps) in step with record writes."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from monitoring import metrics
+
+from . import alerts, bitmaps
+from .models import AttendanceRecord
+
+
+@receiver(post_save, sender=AttendanceRecord)
+def update_attendance_window(sender, instance, created, raw=False, **kwargs):
+    """Update the employee's rolling alert window and yearly bitmap for the day that was written."""
+    if raw:
+        return
+    day = alerts.coerce_date(instance.date)
+    loaded = getattr(instance, "_loaded_values", None)  # Refreshed by AttendanceRecord.save() afterwards
+    if loaded and (loaded["employee_id"], loaded["date"]) != (instance.employee_id, day):
+        # The record was moved to another day or employee; vacate its old slot.
+        alerts.clear_attendance(loaded["employee_id"], loaded["date"])
+        bitmaps.clear_attendance(loaded["employee_id"], loaded["date"])
+    alerts.record_attendance(instance.employee_id, day, instance.status)
+    bitmaps.record_attendance(instance.employee_id, day, instance.status)
+    metrics.ATTENDANCE_WRITES.inc(operation="created" if created else "updated", status=instance.status)
+
+
+@receiver(post_delete, sender=AttendanceRecord)
+def clear_attendance_window(sender, instance, **kwargs):
+    """Vacate the window slot and bitmap bit of a deleted attendance record."""
+    alerts.clear_attendance(instance.employee_id, instance.date)
+    bitmaps.clear_attendance(instance.employee_id, alerts.coerce_date(instance.date))
+    metrics.ATTENDANCE_WRITES.inc(operation="deleted", status=instance.status)
@@ -0,0 +1,177 @@
+"""Batch sync of attendance events queued by offline kiosks.
+
+A kiosk stamps every check-in, check-out or status mark with its own clock
+and a unique key, queues the events while it is offline and posts them in one
+batch when it reconnects. Keys are remembered in ``IdempotencyKey`` (scoped to
+the device), so a replayed batch is acknowledged without being applied twice.
+
+An event only changes a record whose ``source_timestamp`` is not newer than
+the event's own time (last writer wins). Events are applied in timestamp
+order and all events for one employee and day are folded into a single save.
+Dates and times are taken in ``TIME_ZONE``.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+from employees.models import Employee
+from monitoring import metrics
+
+from .models import AttendanceRecord
+from .serializers import KioskEventSerializer
+
+SCOPE_PREFIX = "attendance-sync"
+CHUNK_SIZE = 500  # Keeps ``__in`` lookups under SQLite's bound-parameter limit
+
+
+class SyncConflict(Exception):
+    """A concurrent request wrote some of the same keys or records; the batch should be retried."""
+
+
+def kiosk_sync_config() -> dict[str, Any]:
+    config = getattr(settings, "KIOSK_SYNC_CONFIG", {})
+    return {
+        "MAX_EVENTS": int(config.get("MAX_EVENTS", 5000)),
+        "MAX_CLOCK_SKEW": int(config.get("MAX_CLOCK_SKEW", 300)),
+    }
+
+
+@dataclass
+class SyncResult:
+    """Keys by outcome; ``rejected`` maps each key to its validation errors."""
+
+    applied: list[str] = field(default_factory=list)
+    stale: list[str] = field(default_factory=list)
+    duplicate: list[str] = field(default_factory=list)
+    rejected: dict[str, Any] = field(default_factory=dict)
+
+
+def _chunks(items: list, size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _apply(record: AttendanceRecord, event: dict[str, Any]) -> None:
+    moment = timezone.localtime(event["at"]).time().replace(microsecond=0)
+    if event["action"] == "check_in":
+        record.check_in_time = moment
+        record.status = event.get("status", AttendanceRecord.Status.PRESENT)
+    elif event["action"] == "check_out":
+        record.check_out_time = moment
+        record.status = event.get("status") or record.status or AttendanceRecord.Status.PRESENT
+    else:
+        record.status = event["status"]
+    if "notes" in event:
+        record.notes = event["notes"]
+
+
+def _validate(events: list[dict[str, Any]], config: dict[str, Any], result: SyncResult) -> list[dict[str, Any]]:
+    """Validated events that can be applied; the others are added to ``result.rejected``."""
+    parsed = []
+    for raw in events:
+        serializer = KioskEventSerializer(data=raw)
+        if serializer.is_valid():
+            parsed.append(serializer.validated_data)
+        else:
+            result.rejected[raw["key"]] = {name: [str(error) for error in errors] for name, errors in serializer.errors.items()}
+    known_employees = set()
+    for chunk in _chunks(sorted({event["employee"] for event in parsed})):
+        known_employees.update(Employee.objects.filter(pk__in=chunk).values_list("id", flat=True))
+    latest = timezone.now() + timedelta(seconds=config["MAX_CLOCK_SKEW"])
+    valid = []
+    for event in parsed:
+        if event["employee"] not in known_employees:
+            result.rejected[event["key"]] = {"employee": ["Unknown employee."]}
+        elif event["at"] > latest:
+            result.rejected[event["key"]] = {"at": ["Event is stamped in the future; check the kiosk clock."]}
+        else:
+            valid.append(event)
+    return valid
+
+
+def _load_records(events: list[dict[str, Any]]) -> dict[tuple[int, date], AttendanceRecord]:
+    employee_ids = sorted({event["employee"] for event in events})
+    days = sorted({timezone.localdate(event["at"]) for event in events})
+    records = {}
+    for chunk in _chunks(employee_ids):
+        queryset = AttendanceRecord.objects.select_for_update().filter(
+            employee_id__in=chunk, date__range=(days[0], days[-1])
+        )
+        records.update({(record.employee_id, record.date): record for record in queryset})
+    return records
+
+
+def sync_events(device: str, events: list[Any]) -> SyncResult:
+    """
+    Apply a kiosk's queued ``events`` and report the outcome of every key.
+
+    Raises ``ValueError`` for a malformed batch and ``SyncConflict`` when a
+    concurrent request is applying the same keys.
+    """
+    config = kiosk_sync_config()
+    if len(events) > config["MAX_EVENTS"]:
+        raise ValueError(f"Send at most {config['MAX_EVENTS']} events per request.")
+    for index, raw in enumerate(events):
+        if not isinstance(raw, dict) or not isinstance(raw.get("key"), str) or not 0 < len(raw["key"]) <= 64:
+            raise ValueError(f"Event {index} needs a key of 1 to 64 characters.")
+
+    scope = f"{SCOPE_PREFIX}:{device}"
+    result = SyncResult()
+    fresh, seen = [], set()
+    for raw in events:
+        if raw["key"] in seen:
+            result.duplicate.append(raw["key"])
+        else:
+            seen.add(raw["key"])
+            fresh.append(raw)
+    known_keys = set()
+    for chunk in _chunks([raw["key"] for raw in fresh]):
+        known_keys.update(IdempotencyKey.objects.filter(scope=scope, key__in=chunk).values_list("key", flat=True))
+    result.duplicate.extend(raw["key"] for raw in fresh if raw["key"] in known_keys)
+    fresh = [raw for raw in fresh if raw["key"] not in known_keys]
+
+    valid = _validate(fresh, config, result)
+
+    try:
+        with transaction.atomic():
+            records = _load_records(valid) if valid else {}
+            stamped: dict[tuple[int, date], datetime] = {}
+            for event in sorted(valid, key=lambda event: event["at"]):
+                slot = (event["employee"], timezone.localdate(event["at"]))
+                record = records.get(slot)
+                if record is None:
+                    record = records[slot] = AttendanceRecord(employee_id=slot[0], date=slot[1])
+                version = stamped.get(slot) or record.source_timestamp or record.updated_at
+                if version is not None and event["at"] < version:
+                    result.stale.append(event["key"])
+                    continue
+                _apply(record, event)
+                stamped[slot] = event["at"]
+                result.applied.append(event["key"])
+
+            outcomes = {
+                **dict.fromkeys(result.applied, "applied"),
+                **dict.fromkeys(result.stale, "stale"),
+                **dict.fromkeys(result.rejected, "rejected"),
+            }
+            # Claim the keys before writing, so a concurrent replay of this batch fails here instead.
+            IdempotencyKey.objects.bulk_create(
+                [IdempotencyKey(scope=scope, key=key, outcome=outcome) for key, outcome in outcomes.items()],
+                batch_size=CHUNK_SIZE,
+            )
+            for slot, source_timestamp in stamped.items():
+                records[slot].save(source_timestamp=source_timestamp)
+    except IntegrityError as exc:
+        raise SyncConflict("Another request wrote some of the same events or records; retry the batch.") from exc
+
+    for outcome, keys in asdict(result).items():
+        if keys:
+            metrics.KIOSK_SYNC_EVENTS.inc(len(keys), outcome=outcome)
+    return result
@@ -0,0 +1,124 @@
+"""Tests for incremental low-attendance alerting."""
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance import alerts, jobs
+from attendance.models import AttendanceAlertEvent, AttendanceRecord, AttendanceWindow
+from employees.models import Employee
+
+ALERT_CONFIG = {
+    "RECENT_PERIOD_DAYS": 30,
+    "ATTENDANCE_ALERT_THRESHOLD": 0.75,
+    "ATTENDANCE_ALERT_WINDOW_DAYS": 7,
+    "ATTENDANCE_ALERT_MIN_DAYS": 3,
+}
+
+
+@override_settings(REPORTING_CONFIG=ALERT_CONFIG)
+class AttendanceAlertTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Mary",
+            last_name="Jackson",
+            email="mary@example.com",
+            position="Engineer",
+            department="Aeronautics",
+            date_hired=date(2016, 2, 1),
+        )
+        self.today = timezone.localdate()
+        self.start = self.today - timedelta(days=6)  # The first day of the 7-day window
+
+    def mark(self, offset, status_value):
+        return AttendanceRecord.objects.create(
+            employee=self.employee,
+            date=self.start + timedelta(days=offset),
+            status=status_value,
+        )
+
+    def kinds(self):
+        return list(
+            AttendanceAlertEvent.objects.filter(employee=self.employee).order_by("id").values_list("kind", flat=True)
+        )
+
+    def test_alert_entered_and_cleared_as_records_are_written(self):
+        self.mark(0, AttendanceRecord.Status.PRESENT)
+        absent = self.mark(1, AttendanceRecord.Status.ABSENT)
+        sick = self.mark(2, AttendanceRecord.Status.SICK)
+        window = AttendanceWindow.objects.get(employee=self.employee)
+        self.assertTrue(window.is_alerting)
+        self.assertEqual((window.window_end, window.attended_days, window.recorded_days), (self.today, 1, 3))
+
+        for record in (absent, sick):
+            record.status = AttendanceRecord.Status.REMOTE
+            record.save()
+        window.refresh_from_db()
+        self.assertFalse(window.is_alerting)
+        self.assertEqual((window.attended_days, window.recorded_days), (3, 3))
+        self.assertEqual(self.kinds(), [AttendanceAlertEvent.Kind.ENTERED, AttendanceAlertEvent.Kind.CLEARED])
+
+    def test_alerts_expire_when_no_new_records_arrive(self):
+        for offset in range(3):
+            self.mark(offset, AttendanceRecord.Status.ABSENT)
+        self.assertTrue(AttendanceWindow.objects.get(employee=self.employee).is_alerting)
+
+        a_week_later = self.today + timedelta(days=7)
+        with mock.patch.object(alerts.timezone, "localdate", return_value=a_week_later):
+            jobs.advance_alert_windows()
+        window = AttendanceWindow.objects.get(employee=self.employee)
+        self.assertEqual((window.window_end, window.recorded_days, window.is_alerting), (a_week_later, 0, False))
+        self.assertEqual(self.kinds(), [AttendanceAlertEvent.Kind.ENTERED, AttendanceAlertEvent.Kind.CLEARED])
+
+    def test_future_dated_record_waits_for_its_day(self):
+        vacation = self.mark(30, AttendanceRecord.Status.VACATION)  # Planned leave next month
+        self.assertFalse(AttendanceWindow.objects.filter(employee=self.employee).exists())
+        for offset in range(3):
+            self.mark(offset, AttendanceRecord.Status.ABSENT)
+        window = AttendanceWindow.objects.get(employee=self.employee)
+        self.assertEqual((window.window_end, window.recorded_days, window.is_alerting), (self.today, 3, True))
+
+        with mock.patch.object(alerts.timezone, "localdate", return_value=vacation.date):
+            jobs.advance_alert_windows()
+        window.refresh_from_db()
+        self.assertEqual((window.slots[0], window.recorded_days, window.attended_days), ("v", 1, 0))
+
+    def test_deleting_the_newest_record_keeps_counting_later_writes(self):
+        for offset in range(4):
+            self.mark(offset, AttendanceRecord.Status.PRESENT)
+        self.mark(6, AttendanceRecord.Status.ABSENT).delete()
+        self.mark(5, AttendanceRecord.Status.ABSENT)
+        window = AttendanceWindow.objects.get(employee=self.employee)
+        self.assertEqual((window.window_end, window.attended_days, window.recorded_days), (self.today, 4, 5))
+        self.assertEqual(window.slots, ".a.pppp")  # Index 0 is today
+
+    def test_updates_and_deletes_match_a_rebuild(self):
+        records = [self.mark(offset, AttendanceRecord.Status.PRESENT) for offset in range(5)]
+        moved = AttendanceRecord.objects.get(pk=records[1].pk)
+        moved.date = self.start + timedelta(days=6)
+        moved.status = AttendanceRecord.Status.ABSENT
+        moved.save()
+        records[3].delete()
+        window = AttendanceWindow.objects.get(employee=self.employee)
+        rebuilt = alerts.rebuild_window(self.employee.id)
+        self.assertEqual(
+            (window.window_end, window.slots, window.attended_days, window.recorded_days),
+            (rebuilt.window_end, rebuilt.slots, rebuilt.attended_days, rebuilt.recorded_days),
+        )
+
+    def test_alerts_endpoint_lists_current_alert_set(self):
+        for offset in range(3):
+            self.mark(offset, AttendanceRecord.Status.ABSENT)
+        AttendanceWindow.objects.all().delete()
+        call_command("rebuild_attendance_alerts", stdout=StringIO())
+        response = self.client.get(reverse("attendance-alerts"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["window_days"], 7)
+        self.assertEqual([row["employee_id"] for row in response.data["results"]], [self.employee.id])
+        self.assertEqual(response.data["results"][0]["attendance_rate"], 0.0)
@@ -1,12 +1,19 @@
 """API tests for attendance endpoints."""
-from datetime import date
+from datetime import date, time, timedelta
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
+from attendance import heatmap
+from attendance.api import AttendanceRecordViewSet
 from attendance.models import AttendanceRecord
+from attendance.serializers import AttendanceRecordSerializer
 from employees.models import Employee
 
 
@@ -45,3 +52,154 @@ class AttendanceAPITests(APITestCase):
         response = self.client.get(url, {"date": "2024-02-02"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["summary"][AttendanceRecord.Status.REMOTE], 1)
+
+    def test_fast_read_path_matches_serializer_output(self):
+        other = Employee.objects.create(
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@example.com",
+            position="Engineer",
+            department="R&D",
+            date_hired=date(2020, 1, 1),
+        )
+        AttendanceRecord.objects.create(
+            employee=self.employee,
+            date=date(2024, 2, 1),
+            status=AttendanceRecord.Status.PRESENT,
+            check_in_time=time(8, 45, 30),
+            check_out_time=time(17, 0),
+            notes="On site",
+        )
+        record = AttendanceRecord.objects.create(
+            employee=other,
+            date=date(2024, 2, 1),
+            status=AttendanceRecord.Status.ABSENT,
+        )
+        requests = [
+            (reverse("attendance-list"), {}),
+            (reverse("attendance-list"), {"ordering": "employee__last_name", "status": "absent"}),
+            (reverse("attendance-list"), {"search": "Grace", "page": 1}),
+            (reverse("attendance-detail", kwargs={"pk": record.pk}), {}),
+            (reverse("attendance-detail", kwargs={"pk": 999999}), {}),
+        ]
+        for url, params in requests:
+            fast = self.client.get(url, params)
+            with mock.patch.object(AttendanceRecordViewSet, "fast_read_enabled", False):
+                slow = self.client.get(url, params)
+            self.assertEqual(fast.status_code, slow.status_code)
+            self.assertEqual(fast.content, slow.content)
+
+
+class AttendanceHeatmapTests(APITestCase):
+    def setUp(self):
+        self.grace = Employee.objects.create(
+            first_name="Grace",
+            last_name="Hopper",
+            email="grace@example.com",
+            position="Manager",
+            department="Operations",
+            date_hired=date(2019, 6, 1),
+        )
+        self.ada = Employee.objects.create(
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@example.com",
+            position="Engineer",
+            department="Operations",
+            date_hired=date(2020, 1, 1),
+        )
+        self.outsider = Employee.objects.create(
+            first_name="Alan",
+            last_name="Turing",
+            email="alan@example.com",
+            position="Engineer",
+            department="R&D",
+            date_hired=date(2020, 1, 1),
+        )
+        statuses = AttendanceRecord.Status.values
+        AttendanceRecord.objects.bulk_create(
+            AttendanceRecord(
+                employee=employee,
+                date=date(2024, 1, 1) + timedelta(days=offset),
+                status=statuses[(offset + index) % len(statuses)],
+            )
+            for index, employee in enumerate([self.grace, self.ada, self.outsider])
+            for offset in range(90)
+            if offset % 7 != 6
+        )
+        self.url = reverse("attendance-heatmap")
+
+    def test_status_grid_for_a_department(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                self.url, {"department": "Operations", "start": "2024-01-01", "end": "2024-03-30"}
+            )
+        self.assertEqual(len(captured), 2)  # Employee ids for the header, then the records
+        self.assertIn("IN (SELECT", captured[1]["sql"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        header, grid = heatmap.parse(response.content)
+        self.assertEqual(header["employees"], [self.grace.id, self.ada.id])
+        self.assertEqual((header["origin"], header["days"], header["row_bytes"]), ("2024-01-01", 90, 90))
+        self.assertEqual(len(grid), 2 * 90)
+
+        codes = header["codes"]
+        for row, employee in enumerate([self.grace, self.ada]):
+            expected = [0] * 90
+            for day, value in AttendanceRecord.objects.filter(employee=employee).values_list("date", "status"):
+                expected[(day - date(2024, 1, 1)).days] = codes.index(value) + 1
+            self.assertEqual(list(grid[row * 90 : (row + 1) * 90]), expected)
+
+        records = AttendanceRecord.objects.filter(employee__department__name="Operations").select_related("employee")
+        json_size = len(JSONRenderer().render(AttendanceRecordSerializer(records, many=True).data))
+        self.assertGreater(json_size / len(response.content), 50)
+
+    def test_employees_added_after_the_header_are_skipped(self):
+        employees = Employee.objects.filter(department__name="Operations")
+        read_ids = type(employees).values_list
+        hired = []
+
+        def values_list_then_hire(queryset, *fields, **kwargs):
+            ids = read_ids(queryset, *fields, **kwargs)
+            if queryset.query.where and not hired:  # build()'s header query; hire before its records query
+                hired.append(None)
+                ids = list(ids)
+                newcomer = Employee.objects.create(
+                    first_name="Katherine",
+                    last_name="Johnson",
+                    email="katherine@example.com",
+                    position="Engineer",
+                    department="Operations",
+                    date_hired=date(2024, 1, 1),
+                )
+                AttendanceRecord.objects.create(employee=newcomer, date=date(2024, 1, 2), status="present")
+            return ids
+
+        for encoding in heatmap.ENCODINGS:
+            hired.clear()
+            with mock.patch.object(type(employees), "values_list", values_list_then_hire):
+                payload = heatmap.build(employees.all(), date(2024, 1, 1), date(2024, 1, 10), encoding)
+            self.assertTrue(hired)
+            self.assertEqual(heatmap.parse(payload)[0]["employees"], [self.grace.id, self.ada.id])
+            Employee.objects.filter(email="katherine@example.com").delete()
+
+    def test_presence_bits(self):
+        response = self.client.get(
+            self.url,
+            {"department": "Operations", "start": "2024-01-01", "end": "2024-01-10", "encoding": "presence"},
+        )
+        header, grid = heatmap.parse(response.content)
+        self.assertEqual(header["row_bytes"], 2)
+        attended = {AttendanceRecord.Status.PRESENT, AttendanceRecord.Status.REMOTE}
+        for row, employee in enumerate([self.grace, self.ada]):
+            bits = int.from_bytes(grid[row * 2 : row * 2 + 2], "big")
+            for day, value in AttendanceRecord.objects.filter(employee=employee, date__lte=date(2024, 1, 10)).values_list(
+                "date", "status"
+            ):
+                column = (day - date(2024, 1, 1)).days
+                self.assertEqual(bool(bits & (1 << (15 - column))), value in attended)
+
+    def test_rejects_bad_ranges(self):
+        self.assertEqual(self.client.get(self.url, {"start": "2024-01-01", "end": "2025-06-01"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "nope"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"encoding": "emoji"}).status_code, 400)
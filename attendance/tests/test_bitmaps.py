@@ -0,0 +1,95 @@
+"""Tests for the yearly attendance bitmaps."""
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from attendance import bitmaps
+from attendance.models import AttendanceBitmap, AttendanceRecord
+from employees.models import Employee
+
+
+class AttendanceBitmapTests(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Katherine",
+            last_name="Johnson",
+            email="katherine@example.com",
+            position="Mathematician",
+            department="Flight Research",
+            date_hired=date(2015, 3, 2),
+        )
+
+    def record(self, day, status):
+        return AttendanceRecord.objects.create(employee=self.employee, date=day, status=status)
+
+    def test_writes_flip_single_bits(self):
+        record = self.record(date(2024, 12, 31), "present")  # Day 366 of a leap year
+        self.record(date(2025, 1, 1), "absent")
+        self.assertEqual(bitmaps.count_range(bitmaps.load(self.employee.pk))["present"], 1)
+        self.assertEqual(AttendanceBitmap.objects.count(), 2)
+
+        record.status = "sick"
+        record.save()
+        counts = bitmaps.count_range(bitmaps.load(self.employee.pk))
+        self.assertEqual((counts["present"], counts["sick"], counts["absent"]), (0, 1, 1))
+
+        record.date = date(2024, 6, 1)
+        record.save()
+        record.delete()
+        self.assertEqual(sum(bitmaps.count_range(bitmaps.load(self.employee.pk)).values()), 1)
+        self.assertEqual(bitmaps.check(), [])
+
+    def test_range_counts_and_summary(self):
+        start = date(2023, 12, 20)
+        for offset in range(30):
+            self.record(start + timedelta(days=offset), "remote" if offset % 3 == 0 else "present")
+        bits = bitmaps.load(self.employee.pk)
+        january = bitmaps.count_range(bits, date(2024, 1, 1), date(2024, 1, 31))
+        self.assertEqual(january["present"] + january["remote"], 18)
+        self.assertEqual(
+            january,
+            {
+                status: AttendanceRecord.objects.filter(
+                    date__range=(date(2024, 1, 1), date(2024, 1, 31)), status=status
+                ).count()
+                for status in bitmaps.CATEGORIES
+            },
+        )
+        self.assertEqual(bitmaps.summary(bits), {"total_days": 30, "present_days": 20, "absent_days": 0})
+
+    def test_streaks_skip_unrecorded_days(self):
+        # Present Mon-Fri for two weeks across a year boundary, one sick day in the first week.
+        for day in [date(2024, 12, 23), date(2024, 12, 24), date(2024, 12, 26), date(2024, 12, 27)]:
+            self.record(day, "present")
+        self.record(date(2024, 12, 25), "sick")
+        for day in [date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 2), date(2025, 1, 3)]:
+            self.record(day, "remote")
+        bits = bitmaps.load(self.employee.pk)
+        self.assertEqual(bitmaps.current_streak(bits, date(2025, 1, 5)), 6)
+        self.assertEqual(bitmaps.current_streak(bits, date(2024, 12, 25)), 0)
+        self.assertEqual(bitmaps.current_streak(bits, date(2024, 12, 24)), 2)
+        self.assertEqual(bitmaps.longest_streak(bits), 6)
+        self.assertEqual(bitmaps.longest_streak(bits, ["present"]), 2)
+
+    def test_check_and_rebuild(self):
+        self.record(date(2024, 3, 4), "present")
+        AttendanceRecord.objects.bulk_create(
+            [AttendanceRecord(employee=self.employee, date=date(2024, 3, 5), status="absent")]
+        )
+        AttendanceRecord.objects.filter(date=date(2024, 3, 4)).update(status="vacation")
+
+        mismatches = bitmaps.check()
+        self.assertEqual(
+            mismatches,
+            [{"employee_id": self.employee.pk, "year": 2024, "wrong_days": {"present": 1, "absent": 1, "vacation": 1}}],
+        )
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("rebuild_attendance_bitmaps", "--check", stdout=out)
+
+        call_command("rebuild_attendance_bitmaps", "--employee", str(self.employee.pk), stdout=out)
+        self.assertEqual(bitmaps.check(), [])
+        call_command("rebuild_attendance_bitmaps", "--check", stdout=out)
+        self.assertIn("match", out.getvalue())
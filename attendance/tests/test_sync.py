@@ -0,0 +1,108 @@
+"""Tests for the offline kiosk sync endpoint."""
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from core.jobs import prune_idempotency_keys
+from core.models import IdempotencyKey
+from employees.models import Employee
+
+
+def _at(hour, minute=0, day=date(2024, 3, 4)):
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=dt_timezone.utc).isoformat()
+
+
+class KioskSyncTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Mary",
+            last_name="Jackson",
+            email="mary@example.com",
+            position="Engineer",
+            department="Operations",
+            date_hired=date(2018, 4, 2),
+        )
+        self.client.force_authenticate(get_user_model().objects.create_user(username="kiosk", password="pass1234"))
+        self.url = reverse("attendance-sync")
+
+    def sync(self, *events, device="lobby-1"):
+        return self.client.post(self.url, {"device": device, "events": list(events)}, format="json")
+
+    def event(self, key, action, at, **extra):
+        return {"key": key, "employee": self.employee.pk, "action": action, "at": at, **extra}
+
+    def test_backlog_is_applied_once(self):
+        events = [
+            self.event("k2", "check_out", _at(17, 30)),
+            self.event("k1", "check_in", _at(9, 5)),  # Out of order in the queue
+            self.event("k3", "check_in", _at(9, 0, date(2024, 3, 5)), status="remote"),
+        ]
+        response = self.sync(*events)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data["applied"]), ["k1", "k2", "k3"])
+        record = AttendanceRecord.objects.get(date=date(2024, 3, 4))
+        self.assertEqual((record.status, record.check_in_time, record.check_out_time), ("present", time(9, 5), time(17, 30)))
+        self.assertEqual(record.source_timestamp.isoformat(), _at(17, 30))
+        self.assertEqual(AttendanceRecord.objects.get(date=date(2024, 3, 5)).status, "remote")
+
+        replay = self.sync(*events, self.event("k1", "check_in", _at(9, 5)))
+        self.assertEqual(replay.data["applied"], [])
+        self.assertEqual(sorted(replay.data["duplicate"]), ["k1", "k1", "k2", "k3"])
+        self.assertEqual(IdempotencyKey.objects.count(), 3)
+        # Keys are per device.
+        other_kiosk = self.sync(self.event("k1", "check_in", _at(9, 0, date(2024, 3, 6))), device="lobby-2")
+        self.assertEqual(other_kiosk.data["applied"], ["k1"])
+
+    def test_last_writer_wins(self):
+        self.sync(self.event("in", "check_in", _at(9)))
+        record = AttendanceRecord.objects.get()
+        record.status = "remote"
+        record.save(source_timestamp=datetime.fromisoformat(_at(12)))  # A correction made at noon
+
+        response = self.sync(
+            self.event("old", "mark", _at(11), status="sick", notes="Flu"),
+            self.event("new", "check_out", _at(18)),
+        )
+        self.assertEqual((response.data["stale"], response.data["applied"]), (["old"], ["new"]))
+        record.refresh_from_db()
+        self.assertEqual((record.status, record.notes, record.check_out_time), ("remote", "", time(18)))
+
+    def test_server_writes_stamp_source_time(self):
+        before = timezone.now()
+        record = AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 3, 4), status="present")
+        self.assertGreaterEqual(record.source_timestamp, before)
+        AttendanceRecord.objects.update_or_create(employee=self.employee, date=date(2024, 3, 4), defaults={"status": "sick"})
+        record.refresh_from_db()
+        self.assertGreater(record.source_timestamp, before)
+        self.assertEqual(self.sync(self.event("late", "check_in", _at(9))).data["stale"], ["late"])
+
+    def test_invalid_events_are_rejected_individually(self):
+        future = (timezone.now() + timedelta(hours=1)).isoformat()
+        response = self.sync(
+            self.event("bad-action", "lunch", _at(12)),
+            self.event("no-status", "mark", _at(12)),
+            self.event("future", "check_in", future),
+            {"key": "nobody", "employee": 999999, "action": "check_in", "at": _at(9)},
+            self.event("ok", "check_in", _at(9)),
+        )
+        self.assertEqual(response.data["applied"], ["ok"])
+        self.assertEqual(set(response.data["rejected"]), {"bad-action", "no-status", "future", "nobody"})
+        self.assertEqual(IdempotencyKey.objects.get(key="future").outcome, "rejected")
+
+        self.assertEqual(self.sync({"employee": self.employee.pk}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"events": []}, format="json").status_code, 400)
+        for body in ([{"device": "lobby-1", "events": []}], "lobby-1", 42, {"device": "  ", "events": []}):
+            self.assertEqual(self.client.post(self.url, body, format="json").status_code, 400)
+        with self.settings(KIOSK_SYNC_CONFIG={"MAX_EVENTS": 1}):
+            response = self.sync(self.event("a", "check_in", _at(9)), self.event("b", "check_in", _at(9)))
+            self.assertEqual(response.status_code, 400)
+
+    def test_old_keys_are_pruned(self):
+        self.sync(self.event("k1", "check_in", _at(9)))
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=31))
+        prune_idempotency_keys()
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -17,18 +17,22 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "django_filters",
+    "core",
     "employees",
     "attendance",
     "performance",
     "reports",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -58,9 +62,35 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Keep connections (and the pragmas applied to them) across requests
+        "CONN_MAX_AGE": 300,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Pragma set applied to every new SQLite connection (see core/sqlite.py)
+SQLITE_CONNECTION_PROFILE = "balanced"
+SQLITE_PROFILES = {
+    # SQLite's built-in defaults: rollback journal, small page cache
+    "default": {},
+    "balanced": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,  # Negative values are KiB, so roughly 64 MB
+        "temp_store": "memory",
+        "busy_timeout": 5000,
+    },
+    "durable": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "memory",
+        "busy_timeout": 5000,
+    },
+}
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
 USE_I18N = True
@@ -69,14 +99,26 @@ USE_TZ = True
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+CACHES = {
+    # Per-process cache; point this at Redis/Memcached when running several workers
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 # Login settings
 LOGIN_URL = "employee_login"
 LOGIN_REDIRECT_URL = "employee_dashboard"
 
+# Portal request path: sessions are read from the cache and fall back to the
+# database on a miss, and the user is loaded together with their employee profile.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+AUTHENTICATION_BACKENDS = ["employees.backends.EmployeeProfileBackend"]
+
 AUTH_PASSWORD_VALIDATORS: list[dict[str, str]] = []
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.CachedCountPagination",
     "PAGE_SIZE": 25,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -85,6 +127,7 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
+        "core.authentication.APITokenAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -92,6 +135,102 @@ REST_FRAMEWORK = {
     ],
 }
 
+API_TOKEN_CONFIG = {
+    # Seconds a validated token is trusted from the in-process cache
+    "CACHE_TTL": 60,
+    # Maximum number of validated tokens kept per process
+    "CACHE_SIZE": 1024,
+}
+
+# Models whose writes are logged for the /changes/ feed endpoints
+CHANGE_FEED_MODELS = [
+    "employees.Employee",
+    "attendance.AttendanceRecord",
+    "performance.PerformanceReview",
+]
+
+OUTBOX_CONFIG = {
+    # Models whose saves/deletes are recorded as outbox events
+    "MODELS": CHANGE_FEED_MODELS,
+    # Endpoints that receive {"events": [...]} POSTs from `manage.py dispatch_outbox`
+    "WEBHOOK_URLS": [],
+    "BATCH_SIZE": 100,
+    # Seconds to wait for a webhook response
+    "TIMEOUT": 5,
+    # Retry delays grow as BACKOFF_BASE * 2**(attempt - 1) seconds, capped at BACKOFF_MAX
+    "BACKOFF_BASE": 2,
+    "BACKOFF_MAX": 3600,
+    # Attempts before an event is marked failed
+    "MAX_ATTEMPTS": 8,
+    # Seconds between polls for `dispatch_outbox --loop`
+    "POLL_INTERVAL": 5,
+    # Seconds a crashed dispatcher's lease blocks the others (renewed before every batch)
+    "LEASE_TTL": 300,
+}
+
+SCHEDULER_CONFIG = {
+    # Jobs running at once in one run_scheduler process
+    "MAX_WORKERS": 4,
+    # Seconds before a crashed instance's job lock may be taken over (jobs can override)
+    "LOCK_TTL": 3600,
+    # Longest sleep between checks for due jobs
+    "POLL_INTERVAL": 30,
+    # JobRun rows older than this are pruned nightly
+    "HISTORY_DAYS": 30,
+    # Job names (e.g. "core.dispatch_outbox") that this deployment should not run
+    "DISABLED_JOBS": [],
+}
+
+IDEMPOTENCY_CONFIG = {
+    # Days a processed idempotency key is remembered; replays after that are applied again
+    "TTL_DAYS": 30,
+}
+
+KIOSK_SYNC_CONFIG = {
+    # Most events accepted in one POST /api/attendance/sync/ request
+    "MAX_EVENTS": 5000,
+    # Events stamped further than this many seconds in the future are rejected
+    "MAX_CLOCK_SKEW": 300,
+}
+
+METRICS_CONFIG = {
+    "ENABLED": True,
+    # SQLite file shared by every worker process; scrape /admin/metrics/ on any of them
+    "PATH": BASE_DIR / "var" / "metrics.sqlite3",
+    # Seconds between writes of a process's buffered increments to PATH (by a background thread)
+    "FLUSH_INTERVAL": 1.0,
+}
+
+SLOW_QUERY_CONFIG = {
+    "ENABLED": True,
+    # Statements slower than this are logged with their EXPLAIN QUERY PLAN
+    "THRESHOLD_MS": 100,
+    "PATH": BASE_DIR / "var" / "slow_queries.jsonl",
+    # The log rotates to PATH.1 ... PATH.<BACKUP_COUNT> at this size
+    "MAX_BYTES": 20 * 1024 * 1024,
+    "BACKUP_COUNT": 3,
+    "EXPLAIN": True,
+}
+
+PROFILING_CONFIG = {
+    # Staff users can profile any request by sending this header
+    "HEADER": "X-Profile",
+    # Regexes matched against resolved view names (e.g. "performance-top-performers")
+    # whose requests are sampled at SAMPLE_RATE (0.0 - 1.0)
+    "URL_PATTERNS": [],
+    "SAMPLE_RATE": 0.0,
+    "DIRECTORY": BASE_DIR / "var" / "profiles",
+    # Oldest captures are deleted once the directory grows past this size
+    "MAX_BYTES": 200 * 1024 * 1024,
+}
+
+PAGINATION_CONFIG = {
+    # Seconds a cached list count stays valid even without an invalidating write
+    "COUNT_CACHE_TTL": 30,
+    # Seconds the last known count may be served for ?count=estimate
+    "COUNT_ESTIMATE_TTL": 900,
+}
+
 REPORTING_CONFIG = {
     "RECENT_PERIOD_DAYS": 30,
     "PERFORMANCE_RATING_THRESHOLDS": {
@@ -99,4 +238,13 @@ REPORTING_CONFIG = {
         "satisfactory": 3.0,
     },
     "ATTENDANCE_ALERT_THRESHOLD": 0.9,
+    "ATTENDANCE_ALERT_WINDOW_DAYS": 30,
+    "ATTENDANCE_ALERT_MIN_DAYS": 5,
+    "TIMESHEET": {
+        # Hours per day beyond which worked time counts as overtime
+        "STANDARD_DAY_HOURS": 8,
+        # Check-ins after WORKDAY_START plus LATE_GRACE_MINUTES count as late arrivals
+        "WORKDAY_START": "09:00",
+        "LATE_GRACE_MINUTES": 5,
+    },
 }
@@ -15,6 +15,8 @@ from employees.api import EmployeeViewSet
 from employees.views import employee_login, employee_logout, employee_dashboard, mark_attendance
 from attendance.api import AttendanceRecordViewSet
 from performance.api import PerformanceReviewViewSet
+from core.api import APITokenViewSet
+from monitoring.views import metrics_view
 
 # Router automatically creates URLs for our API viewsets
 # It creates URLs like /employees/, /employees/1/, etc.
@@ -22,6 +24,7 @@ router = routers.DefaultRouter()
 router.register(r"employees", EmployeeViewSet, basename="employee")
 router.register(r"attendance", AttendanceRecordViewSet, basename="attendance")
 router.register(r"performance", PerformanceReviewViewSet, basename="performance")
+router.register(r"tokens", APITokenViewSet, basename="api-token")
 
 # URL patterns - order matters! Django checks from top to bottom
 urlpatterns = [
@@ -32,6 +35,7 @@ urlpatterns = [
     path("mark-attendance/", mark_attendance, name="mark_attendance"),  # Form submission
     
     # Admin and API - these are for admins/developers
+    path("admin/metrics/", metrics_view, name="metrics"),  # Prometheus metrics (staff only)
     path("admin/", admin.site.urls),  # Django admin panel
     path("api/", include(router.urls)),  # REST API endpoints (auto-generated by router)
     path("api/reports/", include("reports.urls")),  # Custom reports URLs
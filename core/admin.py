@@ -0,0 +1,38 @@
+from django.contrib import admin
+
+from .models import APIToken, IdempotencyKey, JobLock, JobRun, OutboxEvent
+
+
+@admin.register(APIToken)
+class APITokenAdmin(admin.ModelAdmin):
+    list_display = ("id", "prefix", "name", "user", "created_at", "expires_at", "revoked_at")
+    list_select_related = ("user",)
+    search_fields = ("=prefix", "user__username", "name")
+    readonly_fields = ("prefix", "key_hash", "created_at")
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "object_id", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "topic")
+    readonly_fields = ("topic", "resource", "object_id", "payload", "created_at", "delivered_at")
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ("id", "job", "scheduled_for", "status", "duration_ms", "owner", "started_at")
+    list_filter = ("status", "job")
+    readonly_fields = ("job", "scheduled_for", "owner", "status", "started_at", "finished_at", "duration_ms", "error")
+
+
+@admin.register(JobLock)
+class JobLockAdmin(admin.ModelAdmin):
+    list_display = ("name", "owner", "acquired_at", "expires_at")
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("scope", "key", "outcome", "created_at")
+    list_filter = ("outcome",)
+    search_fields = ("=key", "scope")
+    readonly_fields = ("scope", "key", "outcome", "created_at")
@@ -0,0 +1,33 @@
+"""API endpoints for managing integration tokens."""
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.response import Response
+
+from . import tokens
+from .models import APIToken
+from .serializers import APITokenSerializer
+
+
+class APITokenViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Issue, list and revoke the requesting user's API tokens."""
+
+    serializer_class = APITokenSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return APIToken.objects.filter(user_id=self.request.user.pk)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token, key = tokens.issue_token(request.user, **serializer.validated_data)
+        # The plaintext key is only ever returned here.
+        return Response({**self.get_serializer(token).data, "token": key}, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        tokens.revoke_token(instance)
@@ -0,0 +1,34 @@
+"""DRF authentication backed by hashed API tokens."""
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from . import tokens
+
+
+class APITokenAuthentication(BaseAuthentication):
+    """
+    Authenticate ``Authorization: Token <prefix>.<secret>`` headers.
+
+    Validation is a SHA-256 hash plus an in-process LRU hit, instead of the
+    PBKDF2 run that ``BasicAuthentication`` performs on every request.
+    """
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+        try:
+            key = auth[1].decode()
+        except UnicodeError as exc:
+            raise exceptions.AuthenticationFailed("Invalid token header.") from exc
+        result = tokens.verify_key(key)
+        if result is None:
+            raise exceptions.AuthenticationFailed("Invalid or revoked token.")
+        return result
+
+    def authenticate_header(self, request):
+        return self.keyword
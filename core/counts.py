@@ -0,0 +1,104 @@
+"""Cached ``COUNT(*)`` results for filtered querysets.
+
+Counts are cached under a key built from the count SQL itself, so two requests
+that filter, search and order the same way (in any parameter order) share an
+entry. Every table taking part in the query has a generation token that is
+replaced on each write; a write therefore moves all affected counts to fresh
+keys. Bulk ``update()``/``delete()`` calls bypass model signals, which is what
+the short TTL is for.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATE = "estimate"
+NONE = "none"
+COUNT_MODES = (EXACT, CACHED, ESTIMATE, NONE)
+
+
+def _pagination_config() -> dict[str, Any]:
+    return getattr(settings, "PAGINATION_CONFIG", {})
+
+
+def _generation_key(table: str) -> str:
+    return f"count-generation:{table}"
+
+
+def bump_generation(table: str) -> None:
+    """Invalidate every cached count whose query touches ``table``."""
+    cache.set(_generation_key(table), time.time_ns(), None)
+
+
+def _query_tables(queryset) -> list[str]:
+    return sorted({join.table_name for join in queryset.query.alias_map.values()})
+
+
+def _count_key(queryset) -> tuple[str, str]:
+    """Return (exact key, generation-free key) for ``queryset``'s count."""
+    unordered = queryset.order_by()
+    sql, params = unordered.query.sql_with_params()
+    tables = _query_tables(unordered)
+    digest = hashlib.sha1(f"{queryset.db}|{sql}|{params!r}".encode()).hexdigest()
+    generations = cache.get_many([_generation_key(table) for table in tables])
+    stamp = ",".join(str(generations.get(_generation_key(table), 0)) for table in tables)
+    return f"count:{digest}:{stamp}", f"count-latest:{digest}"
+
+
+def cached_count(queryset, mode: str = CACHED) -> int:
+    """
+    Count ``queryset`` using the requested strategy.
+
+    ``exact`` always runs COUNT(*) (refreshing the cache), ``cached`` reuses a count
+    computed since the last write to any involved table, and ``estimate`` also
+    accepts the last count seen for this filter even if writes happened since.
+    """
+    config = _pagination_config()
+    key, latest_key = _count_key(queryset)
+    if mode != EXACT:
+        count = cache.get(key)
+        if count is None and mode == ESTIMATE:
+            count = cache.get(latest_key)
+        if count is not None:
+            return count
+    count = queryset.count()
+    cache.set(key, count, config.get("COUNT_CACHE_TTL", 30))
+    cache.set(latest_key, count, config.get("COUNT_ESTIMATE_TTL", 900))
+    return count
+
+
+def peek_count(queryset) -> int | None:
+    """Return the last cached count for ``queryset`` (possibly stale) without counting."""
+    key, latest_key = _count_key(queryset)
+    count = cache.get(key)
+    return count if count is not None else cache.get(latest_key)
+
+
+def estimated_row_count(model, using: str = "default") -> int | None:
+    """
+    Return the database's own row estimate for ``model``'s table, if it keeps one.
+
+    SQLite only has one after ``ANALYZE`` (or ``PRAGMA optimize``) has run.
+    """
+    table = model._meta.db_table
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            estimates = [int(stat.split()[0]) for (stat,) in cursor.fetchall() if stat]
+            return max(estimates) if estimates else None
+    return None
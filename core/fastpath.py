@@ -0,0 +1,133 @@
+"""Read-only fast path for high-volume list and retrieve endpoints.
+
+``ModelSerializer`` builds a model instance per row and walks every field through
+``get_attribute``/``to_representation``. For read-only endpoints we can skip all of
+that: rows come straight from ``values_list()`` and each column goes through a
+converter compiled once per serializer class, producing the exact same output.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields, relations
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+Converter = Callable[[Any], Any] | None
+
+_renderers: dict[tuple[type, type], "RowRenderer"] = {}
+
+
+def _iso_converter(field: fields.Field, setting: str) -> Converter:
+    output_format = getattr(field, "format", getattr(api_settings, setting))
+    if output_format is None:
+        return None
+    if output_format.lower() == fields.ISO_8601:
+        return lambda value: value.isoformat()
+    return field.to_representation
+
+
+# Fields whose ``to_representation`` returns database values unchanged.
+_IDENTITY_REPRESENTATIONS = {
+    fields.BooleanField.to_representation,
+    fields.CharField.to_representation,
+    fields.ChoiceField.to_representation,
+    fields.IntegerField.to_representation,
+}
+
+
+def _field_converter(field: fields.Field) -> Converter:
+    """Return a callable equivalent to ``field.to_representation`` (``None`` means identity)."""
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None  # values_list() already yields the primary key.
+    if type(field).to_representation in _IDENTITY_REPRESENTATIONS:
+        return None
+    if type(field) is fields.DateField:
+        return _iso_converter(field, "DATE_FORMAT")
+    if type(field) is fields.TimeField:
+        return _iso_converter(field, "TIME_FORMAT")
+    # DateTimeField (timezone aware), DecimalField (quantizing) and anything unknown
+    # keep their own implementation; the per-row instance machinery is what we skip.
+    return field.to_representation
+
+
+class RowRenderer:
+    """Compiled plan turning ``values_list`` tuples into serializer-shaped dicts."""
+
+    def __init__(self, serializer, annotations: dict[str, Any]):
+        self.names: list[str] = []
+        self.columns: list[str] = []
+        self.converters: list[Converter] = []
+        self.annotations = annotations
+        for field in serializer._readable_fields:
+            if field.field_name in annotations:
+                column, converter = field.field_name, None
+            elif field.source != "*" and "." not in field.source:
+                column, converter = field.source, _field_converter(field)
+            else:
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{field.field_name} needs an entry in fast_read_annotations."
+                )
+            self.names.append(field.field_name)
+            self.columns.append(column)
+            self.converters.append(converter)
+
+    def rows(self, queryset):
+        """Return a ``values_list`` queryset yielding exactly the columns this plan needs."""
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset.values_list(*self.columns)
+
+    def render(self, rows: Iterable[tuple]) -> list[dict[str, Any]]:
+        plan = tuple(zip(self.names, self.converters))
+        return [
+            {
+                name: value if value is None or convert is None else convert(value)
+                for (name, convert), value in zip(plan, row)
+            }
+            for row in rows
+        ]
+
+
+class FastReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` from ``values_list()`` instead of model instances.
+
+    Serializer fields backed by a dotted source (for example ``employee.__str__``)
+    must be supplied as SQL expressions through ``fast_read_annotations``. Object
+    level permissions receive the row mapping rather than a model instance.
+    """
+
+    fast_read_enabled = True
+    fast_read_annotations: dict[str, Any] = {}
+
+    def get_row_renderer(self) -> RowRenderer:
+        key = (type(self), self.get_serializer_class())
+        renderer = _renderers.get(key)
+        if renderer is None:
+            renderer = _renderers[key] = RowRenderer(key[1](), self.fast_read_annotations)
+        return renderer
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_read_enabled:
+            return super().list(request, *args, **kwargs)
+        renderer = self.get_row_renderer()
+        rows = renderer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(renderer.render(page))
+        return Response(renderer.render(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.fast_read_enabled:
+            return super().retrieve(request, *args, **kwargs)
+        renderer = self.get_row_renderer()
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(renderer.rows(queryset), **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        data = renderer.render([row])[0]
+        self.check_object_permissions(request, data)
+        return Response(data)
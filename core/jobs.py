@@ -0,0 +1,29 @@
+"""Scheduled jobs for shared API infrastructure."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import IdempotencyKey
+from .outbox import dispatch, outbox_config
+from .scheduler import job, prune_history
+
+
+@job("* * * * *", lock_ttl=600)
+def dispatch_outbox():
+    """Deliver pending outbox events when webhooks are configured."""
+    if outbox_config().get("WEBHOOK_URLS"):
+        dispatch()
+
+
+@job("15 3 * * *")
+def prune_job_runs():
+    """Drop scheduler history older than SCHEDULER_CONFIG["HISTORY_DAYS"]."""
+    prune_history()
+
+
+@job("30 3 * * *")
+def prune_idempotency_keys():
+    """Forget idempotency keys older than IDEMPOTENCY_CONFIG["TTL_DAYS"]."""
+    days = getattr(settings, "IDEMPOTENCY_CONFIG", {}).get("TTL_DAYS", 30)
+    IdempotencyKey.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()
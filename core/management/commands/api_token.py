@@ -0,0 +1,56 @@
+"""Management command to issue, list and revoke API tokens."""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import tokens
+from core.models import APIToken
+
+
+class Command(BaseCommand):
+    help = 'Issue, list or revoke API tokens for integrations'
+
+    def add_arguments(self, parser):
+        subcommands = parser.add_subparsers(dest='action', required=True)
+        issue = subcommands.add_parser('issue', help='Issue a new token for a user')
+        issue.add_argument('username')
+        issue.add_argument('--name', default='', help='Label to identify the integration')
+        issue.add_argument('--expires-days', type=int, help='Expire the token after this many days')
+        revoke = subcommands.add_parser('revoke', help='Revoke a token by its prefix')
+        revoke.add_argument('prefix')
+        listing = subcommands.add_parser('list', help='List tokens')
+        listing.add_argument('--user', help='Only show tokens for this username')
+
+    def handle(self, *args, **options):
+        getattr(self, f"handle_{options['action']}")(options)
+
+    def handle_issue(self, options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(username=options['username'])
+        except user_model.DoesNotExist as exc:
+            raise CommandError(f"No user named {options['username']!r}.") from exc
+        expires_at = None
+        if options['expires_days']:
+            expires_at = timezone.now() + timedelta(days=options['expires_days'])
+        token, key = tokens.issue_token(user, name=options['name'], expires_at=expires_at)
+        self.stdout.write(self.style.SUCCESS(f'Issued token {token.prefix} for {user.username}:'))
+        self.stdout.write(key)
+        self.stdout.write(self.style.WARNING('Store this key now; it cannot be shown again.'))
+
+    def handle_revoke(self, options):
+        token = APIToken.objects.filter(prefix=options['prefix']).first()
+        if token is None:
+            raise CommandError(f"No token with prefix {options['prefix']!r}.")
+        tokens.revoke_token(token)
+        self.stdout.write(self.style.SUCCESS(f'Revoked token {token.prefix}.'))
+
+    def handle_list(self, options):
+        queryset = APIToken.objects.select_related('user')
+        if options['user']:
+            queryset = queryset.filter(user__username=options['user'])
+        for token in queryset:
+            state = 'active' if token.is_valid else 'revoked/expired'
+            self.stdout.write(f'{token.prefix}  {token.user.username:<20} {token.name:<20} {state}')
@@ -0,0 +1,216 @@
+"""Management command that runs EXPLAIN QUERY PLAN over every API filter combination."""
+import json
+from datetime import date
+from decimal import Decimal
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from employees.models import Employee
+from reports import services
+
+SEARCH_TERM = 'audit'
+
+
+def _model_field(model, path):
+    """Resolve ``employee__last_name`` style paths to the final model field."""
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return field
+
+
+def _sample_value(model, filter_):
+    """Pick a syntactically valid value for a filter without touching the data."""
+    field = _model_field(model, filter_.field_name)
+    if field.choices:
+        return field.choices[0][0]
+    if field.is_relation:
+        return 1
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateField':
+        return date(2024, 1, 1)
+    if internal_type == 'BooleanField':
+        return True
+    if internal_type == 'DecimalField':
+        return Decimal('1')
+    if internal_type in {'IntegerField', 'BigIntegerField', 'PositiveIntegerField', 'FloatField', 'BigAutoField'}:
+        return 1
+    return 'a'
+
+
+def _plan_for(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _table_columns(table):
+    """Return existing index column lists for ``table``."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return [info['columns'] for info in constraints.values() if info.get('index') or info.get('unique')]
+
+
+def _analyse(plan):
+    full_scans = sorted(
+        {detail.split()[1] for detail in plan if detail.startswith('SCAN ') and ' USING ' not in detail}
+    )
+    temp_btrees = sorted({detail for detail in plan if 'USE TEMP B-TREE' in detail})
+    return full_scans, temp_btrees
+
+
+def _suggest_index(model, equality, ranges, ordering):
+    """Suggest a composite index (equality columns, then range, then sort) on ``model``'s table."""
+    columns = []
+    cross_table = []
+    for path in [*equality, *ranges, *ordering]:
+        field_path = path.lstrip('-')
+        if '__' in field_path:
+            cross_table.append(field_path)
+            continue
+        column = model._meta.get_field(field_path).column
+        if column not in columns:
+            columns.append(column)
+    if not columns:
+        return None
+    table = model._meta.db_table
+    for existing in _table_columns(table):
+        if existing[: len(columns)] == columns:
+            return None
+    suggestion = {'table': table, 'columns': columns}
+    if cross_table:
+        suggestion['not_indexable'] = cross_table
+    return suggestion
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN QUERY PLAN for API filter/search/ordering combinations and report services'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-filters',
+            type=int,
+            default=2,
+            help='Largest number of filters combined in one query (default: 2)',
+        )
+        parser.add_argument(
+            '--issues-only',
+            action='store_true',
+            help='Only output queries with full scans or temporary B-tree sorts',
+        )
+        parser.add_argument(
+            '--fail-on-issues',
+            action='store_true',
+            help='Exit with an error if any query has a full scan or temporary sort',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('audit_query_plans understands SQLite query plans only.')
+        entries = [*self.viewset_entries(options['max_filters']), *self.service_entries()]
+        if options['issues_only']:
+            entries = [entry for entry in entries if entry['full_scans'] or entry['temp_btrees']]
+        suggestions = {}
+        for entry in entries:
+            index = entry['suggested_index']
+            if index:
+                key = (index['table'], tuple(index['columns']))
+                suggestions.setdefault(key, {**index, 'queries': 0})['queries'] += 1
+        report = {
+            'queries': entries,
+            'suggested_indexes': sorted(suggestions.values(), key=lambda item: (-item['queries'], item['table'])),
+        }
+        self.stdout.write(json.dumps(report, indent=2, sort_keys=True, default=str))
+        if options['fail_on_issues'] and any(entry['full_scans'] or entry['temp_btrees'] for entry in entries):
+            raise CommandError('Query plan issues found.')
+
+    def viewset_entries(self, max_filters):
+        from config.urls import router
+
+        factory = APIRequestFactory()
+        for prefix, viewset, basename in router.registry:
+            view = viewset()
+            view.action = 'list'
+            view.request = Request(factory.get(f'/api/{prefix}/'))
+            view.args, view.kwargs, view.format_kwarg = (), {}, None
+            base_queryset = view.get_queryset()
+            model = base_queryset.model
+            filterset_class = DjangoFilterBackend().get_filterset_class(view, base_queryset)
+            filters = dict(filterset_class.base_filters) if filterset_class else {}
+            orderings = [None, *getattr(view, 'ordering_fields', [])]
+            filter_sets = [()]
+            for size in range(1, max_filters + 1):
+                filter_sets.extend(combinations(sorted(filters), size))
+            searches = [None, SEARCH_TERM] if getattr(view, 'search_fields', None) else [None]
+
+            for names in filter_sets:
+                for ordering in orderings:
+                    for search in searches:
+                        if search and names:
+                            continue  # Search is audited on its own and with each ordering.
+                        params = {}
+                        if ordering:
+                            params['ordering'] = ordering
+                        if search:
+                            params['search'] = search
+                        view.request = Request(factory.get(f'/api/{prefix}/', params))
+                        queryset = base_queryset
+                        equality, ranges = [], []
+                        for name in names:
+                            filter_ = filters[name]
+                            value = _sample_value(model, filter_)
+                            params[name] = value
+                            queryset = filter_.filter(queryset, value)
+                            (equality if filter_.lookup_expr == 'exact' else ranges).append(filter_.field_name)
+                        queryset = SearchFilter().filter_queryset(view.request, queryset, view)
+                        queryset = OrderingFilter().filter_queryset(view.request, queryset, view)
+                        sql, sql_params = queryset.query.sql_with_params()
+                        plan = _plan_for(sql, sql_params)
+                        full_scans, temp_btrees = _analyse(plan)
+                        suggestion = None
+                        if full_scans or temp_btrees:
+                            order_by = [field for field in queryset.query.order_by] or list(model._meta.ordering)
+                            suggestion = _suggest_index(model, equality, ranges, order_by)
+                        yield {
+                            'source': f'viewset:{basename}',
+                            'params': params,
+                            'sql': sql,
+                            'plan': plan,
+                            'full_scans': full_scans,
+                            'temp_btrees': temp_btrees,
+                            'suggested_index': suggestion,
+                        }
+
+    def service_entries(self):
+        employee_id = Employee.objects.values_list('id', flat=True).first()
+        calls = [
+            ('headcount_summary', services.headcount_summary, ()),
+            ('attendance_summary', services.attendance_summary, ()),
+            ('performance_summary', services.performance_summary, ()),
+        ]
+        if employee_id is not None:
+            calls.append(('employee_snapshot', services.employee_snapshot, (employee_id,)))
+        for name, function, arguments in calls:
+            with CaptureQueriesContext(connection) as captured:
+                function(*arguments)
+            for index, query in enumerate(captured.captured_queries):
+                plan = _plan_for(query['sql'])
+                full_scans, temp_btrees = _analyse(plan)
+                yield {
+                    'source': f'service:{name}',
+                    'params': {'query': index},
+                    'sql': query['sql'],
+                    'plan': plan,
+                    'full_scans': full_scans,
+                    'temp_btrees': temp_btrees,
+                    'suggested_index': None,
+                }
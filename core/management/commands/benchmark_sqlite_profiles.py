@@ -0,0 +1,80 @@
+"""Management command comparing SQLite read/write throughput across connection profiles."""
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import sqlite
+
+
+def _run_profile(path, profile, rows, reads):
+    connection = sqlite3.connect(path, isolation_level=None)
+    cursor = connection.cursor()
+    sqlite.apply_profile(cursor, profile)
+    cursor.execute(
+        'CREATE TABLE record (id INTEGER PRIMARY KEY, employee_id INTEGER, day TEXT, status TEXT, notes TEXT)'
+    )
+    cursor.execute('CREATE INDEX record_employee_day ON record (employee_id, day)')
+
+    # Writes: one transaction per row, like individual API/portal writes.
+    started = time.perf_counter()
+    for index in range(rows):
+        cursor.execute('BEGIN')
+        cursor.execute(
+            'INSERT INTO record (employee_id, day, status, notes) VALUES (?, ?, ?, ?)',
+            (index % 500, f'2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}', 'present', 'x' * 40),
+        )
+        cursor.execute('COMMIT')
+    write_seconds = time.perf_counter() - started
+
+    # Reads: indexed lookups of one employee's records.
+    randomizer = random.Random(0)
+    started = time.perf_counter()
+    for _ in range(reads):
+        cursor.execute(
+            'SELECT status, COUNT(*) FROM record WHERE employee_id = ? GROUP BY status',
+            (randomizer.randrange(500),),
+        )
+        cursor.fetchall()
+    read_seconds = time.perf_counter() - started
+    effective = sqlite.read_pragmas(cursor)
+    connection.close()
+    return {
+        'writes_per_second': round(rows / write_seconds, 1) if write_seconds else None,
+        'reads_per_second': round(reads / read_seconds, 1) if read_seconds else None,
+        'journal_mode': effective['journal_mode'],
+        'synchronous': effective['synchronous'],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark read and write throughput of each SQLITE_PROFILES entry on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Rows written, one transaction each')
+        parser.add_argument('--reads', type=int, default=5000, help='Indexed read queries executed')
+        parser.add_argument('--profile', action='append', dest='profiles', help='Only benchmark these profiles')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        names = options['profiles'] or list(getattr(settings, 'SQLITE_PROFILES', {}))
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name in names:
+                profile = sqlite.get_profile(name)
+                path = Path(directory) / f'{name}.sqlite3'
+                results[name] = _run_profile(path, profile, options['rows'], options['reads'])
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+            return
+        self.stdout.write(f"{'profile':<12} {'writes/s':>12} {'reads/s':>12}  journal")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['writes_per_second']:>12} {result['reads_per_second']:>12}  "
+                f"{result['journal_mode']}"
+            )
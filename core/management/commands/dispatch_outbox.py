@@ -0,0 +1,44 @@
+"""Management command that delivers pending outbox events to the configured webhooks."""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox events to OUTBOX_CONFIG["WEBHOOK_URLS"] in coalesced batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            dest='urls',
+            help='Webhook URL to deliver to instead of the configured ones (can be repeated)',
+        )
+        parser.add_argument('--batch-size', type=int, help='Events per request (default: OUTBOX_CONFIG["BATCH_SIZE"])')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting once drained')
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Seconds between polls with --loop (default: OUTBOX_CONFIG["POLL_INTERVAL"])',
+        )
+
+    def handle(self, *args, **options):
+        config = outbox.outbox_config()
+        urls = options['urls'] or config.get('WEBHOOK_URLS', [])
+        if not urls:
+            raise CommandError('No webhook URLs configured; set OUTBOX_CONFIG["WEBHOOK_URLS"] or pass --url.')
+        interval = options['interval'] if options['interval'] is not None else float(config.get('POLL_INTERVAL', 5))
+        session = outbox.WebhookSession(timeout=float(config.get('TIMEOUT', 5)))
+        try:
+            while True:
+                stats = outbox.dispatch(urls, options['batch_size'], session=session)
+                if stats.batches or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(json.dumps(stats.as_dict(), sort_keys=True)))
+                if not options['loop']:
+                    break
+                time.sleep(interval)
+        finally:
+            session.close()
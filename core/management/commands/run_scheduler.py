@@ -0,0 +1,45 @@
+"""Management command that runs scheduled jobs declared in the apps' jobs.py modules."""
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import scheduler
+
+
+class Command(BaseCommand):
+    help = 'Run cron-scheduled jobs (report snapshots, outbox delivery, maintenance) in a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Thread pool size (default: SCHEDULER_CONFIG["MAX_WORKERS"])')
+        parser.add_argument('--list', action='store_true', help='List registered jobs and their next run, then exit')
+        parser.add_argument('--run', metavar='JOB', action='append', help='Run the named job(s) once now and exit')
+
+    def handle(self, *args, **options):
+        config = scheduler.scheduler_config()
+        jobs = scheduler.discover()
+        now = timezone.localtime()
+
+        if options['list']:
+            for name, job in jobs.items():
+                self.stdout.write(f'{name:<40} {job.schedule.expression:<15} next {job.schedule.next_after(now):%Y-%m-%d %H:%M}')
+            return
+
+        if options['run']:
+            unknown = sorted(set(options['run']) - set(jobs))
+            if unknown:
+                raise CommandError(f"Unknown job(s): {', '.join(unknown)}")
+            for name in options['run']:
+                run = scheduler.run_job(jobs[name], now)
+                if run is None:
+                    self.stdout.write(f'{name}: already claimed by another scheduler')
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'{name}: {run.status} in {run.duration_ms or 0:.0f} ms'))
+            return
+
+        runner = scheduler.Scheduler(jobs, max_workers=options['workers'] or config['MAX_WORKERS'])
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: runner.stop())
+        self.stdout.write(self.style.SUCCESS(f'Scheduler {runner.owner} running {len(jobs)} jobs.'))
+        runner.run_forever(config['POLL_INTERVAL'])
+        self.stdout.write('Scheduler stopped.')
@@ -0,0 +1,36 @@
+"""Management command reporting the pragmas in effect on the SQLite connection."""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core import sqlite
+
+
+class Command(BaseCommand):
+    help = 'Show the effective SQLite pragmas and connection persistence settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias (default: default)')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database {options['database']!r} is not SQLite.")
+        with connection.cursor() as cursor:
+            pragmas = sqlite.read_pragmas(cursor)
+        report = {
+            'profile': getattr(settings, 'SQLITE_CONNECTION_PROFILE', None),
+            'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+            'conn_health_checks': connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+            'pragmas': pragmas,
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, sort_keys=True))
+            return
+        self.stdout.write(f"Profile: {report['profile']}")
+        self.stdout.write(f"CONN_MAX_AGE: {report['conn_max_age']}  CONN_HEALTH_CHECKS: {report['conn_health_checks']}")
+        for pragma, value in pragmas.items():
+            self.stdout.write(f'  {pragma:<14} {value}')
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+SEEDED_MODELS = [
+    ('employees', 'Employee'),
+    ('attendance', 'AttendanceRecord'),
+    ('performance', 'PerformanceReview'),
+]
+
+
+def seed_existing_rows(apps, schema_editor):
+    """Log every existing row once so a consumer starting at cursor 0 sees the full state."""
+    ChangeLogEntry = apps.get_model('core', 'ChangeLogEntry')
+    for app_label, model_name in SEEDED_MODELS:
+        model = apps.get_model(app_label, model_name)
+        resource = model._meta.label_lower
+        ids = model.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=2000)
+        batch = []
+        for object_id in ids:
+            batch.append(ChangeLogEntry(resource=resource, object_id=object_id, operation='upsert'))
+            if len(batch) >= 2000:
+                ChangeLogEntry.objects.bulk_create(batch)
+                batch = []
+        ChangeLogEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('employees', '0002_employee_user'),
+        ('attendance', '0002_attendance_alerts'),
+        ('performance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('resource', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['resource', 'seq'], name='core_change_resourc_7fde72_idx')],
+            },
+        ),
+        migrations.RunPython(seed_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_scheduler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=120)),
+                ('key', models.CharField(max_length=64)),
+                ('outcome', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='core_idempo_created_bb3e28_idx')],
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='core_idempotencykey_unique_scope_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,178 @@
+"""Models for shared API infrastructure."""
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
+from django.utils import timezone
+
+
+class AtomicSaveMixin:
+    """
+    Run ``save()`` (and therefore its ``post_save`` handlers) in one transaction.
+
+    Outbox events written by signal handlers then commit or roll back together
+    with the row that produced them. Deletes are already atomic in Django.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class APIToken(models.Model):
+    """
+    API key for integrations.
+
+    Only a SHA-256 hash of the key is stored. Keys look like ``<prefix>.<secret>``;
+    the indexed ``prefix`` finds the row in one lookup and the hash is compared
+    in constant time, so no password hasher runs on the request path.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_tokens")
+    name = models.CharField(max_length=100, blank=True)
+    prefix = models.CharField(max_length=16, unique=True)
+    key_hash = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+    revoked_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def is_valid(self) -> bool:
+        now = timezone.now()
+        return self.revoked_at is None and (self.expires_at is None or self.expires_at > now)
+
+    def __str__(self) -> str:
+        return f"{self.prefix} ({self.name or 'unnamed'}) for {self.user}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only log of writes to API resources, used by the change feed.
+
+    ``seq`` is the feed cursor: it only ever grows, so a consumer can ask for
+    everything after the last value it saw. Deletes are logged too and become
+    tombstones in the feed.
+    """
+
+    class Operation(models.TextChoices):
+        UPSERT = "upsert", "Upsert"
+        DELETE = "delete", "Delete"
+
+    seq = models.BigAutoField(primary_key=True)
+    resource = models.CharField(max_length=100)  # Model label, e.g. "attendance.attendancerecord"
+    object_id = models.BigIntegerField()
+    operation = models.CharField(max_length=10, choices=Operation.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["seq"]
+        indexes = [models.Index(fields=["resource", "seq"])]
+
+    def __str__(self) -> str:
+        return f"#{self.seq} {self.operation} {self.resource}:{self.object_id}"
+
+
+class OutboxEvent(models.Model):
+    """
+    Domain event waiting to be delivered to the configured webhooks.
+
+    Rows are inserted in the same transaction as the change they describe and
+    drained later by the ``dispatch_outbox`` command, so requests never wait on
+    delivery.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DELIVERED = "delivered", "Delivered"
+        FAILED = "failed", "Failed"  # Gave up after OUTBOX_CONFIG["MAX_ATTEMPTS"]
+
+    topic = models.CharField(max_length=100)  # e.g. "employee.created"
+    resource = models.CharField(max_length=100)  # Model label, e.g. "employees.employee"
+    object_id = models.BigIntegerField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "id"])]
+
+    def __str__(self) -> str:
+        return f"#{self.pk} {self.topic} {self.resource}:{self.object_id} ({self.status})"
+
+
+class JobLock(models.Model):
+    """
+    Lease held by the scheduler instance currently running a job.
+
+    A lease that outlives ``expires_at`` (its holder crashed) may be taken over.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    owner = models.CharField(max_length=100)
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
+
+
+class JobRun(models.Model):
+    """
+    One scheduled run of a job.
+
+    The unique (job, scheduled_for) pair is how scheduler instances claim a
+    slot: whoever inserts the row runs it, everyone else skips it.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+        SKIPPED = "skipped", "Skipped"  # The previous run still held the job's lock
+
+    job = models.CharField(max_length=100)
+    scheduled_for = models.DateTimeField()
+    owner = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RUNNING)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.FloatField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        constraints = [models.UniqueConstraint(fields=["job", "scheduled_for"], name="core_jobrun_unique_slot")]
+        indexes = [models.Index(fields=["job", "-started_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.job} @ {self.scheduled_for:%Y-%m-%d %H:%M} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Client-generated key of a request (or event) that has already been applied.
+
+    Replays with a known ``(scope, key)`` are acknowledged without being
+    applied again. Rows are pruned after ``IDEMPOTENCY_CONFIG["TTL_DAYS"]``,
+    so clients must retry within that window.
+    """
+
+    scope = models.CharField(max_length=120)
+    key = models.CharField(max_length=64)
+    outcome = models.CharField(max_length=20)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["scope", "key"], name="core_idempotencykey_unique_scope_key")]
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.scope}:{self.key} ({self.outcome})"
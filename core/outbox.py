@@ -0,0 +1,237 @@
+"""Transactional outbox: record domain events with the write, deliver them later.
+
+Signal handlers insert an ``OutboxEvent`` inside the transaction that saves or
+deletes a tracked model (see ``AtomicSaveMixin``), so an event exists if and
+only if its change committed. ``dispatch`` drains pending events in id order,
+coalesces several events for the same row into the newest one, and POSTs each
+batch to every configured webhook over kept-alive connections. A failed batch
+is retried with exponential backoff; later events wait behind it so receivers
+see changes in order. Only one dispatcher drains the outbox at a time (it holds
+a ``JobLock`` lease, renewed before every batch), so the command and the
+scheduled job never send the same batch twice. Delivery is still at-least-once
+(a dispatcher may die after sending but before marking): receivers should
+ignore event ids they have already processed.
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import OutboxEvent
+from .scheduler import acquire_lock, default_owner, release_lock, renew_lock
+
+LEASE_NAME = "outbox.dispatch"
+
+
+def outbox_config() -> dict[str, Any]:
+    return getattr(settings, "OUTBOX_CONFIG", {})
+
+
+def _payload(instance) -> dict[str, Any]:
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def _enqueue(sender, instance, action: str) -> None:
+    OutboxEvent.objects.create(
+        topic=f"{sender._meta.model_name}.{action}",
+        resource=sender._meta.label_lower,
+        object_id=instance.pk,
+        payload=_payload(instance),
+    )
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return  # Fixture loads are not domain events.
+    _enqueue(sender, instance, "created" if created else "updated")
+
+
+def _on_delete(sender, instance, **kwargs):
+    _enqueue(sender, instance, "deleted")
+
+
+def track_configured_models() -> None:
+    """Connect outbox writes for every model listed in ``OUTBOX_CONFIG["MODELS"]``."""
+    for label in outbox_config().get("MODELS", []):
+        model = apps.get_model(label)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"outbox.save.{label}")
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f"outbox.delete.{label}")
+
+
+@dataclass
+class DeliveryStats:
+    """Counters for one dispatcher run."""
+
+    batches: int = 0
+    requests: int = 0
+    delivered: int = 0  # Events marked delivered, including coalesced ones
+    coalesced: int = 0  # Events folded into a newer event for the same row
+    failed_batches: int = 0
+    dead: int = 0  # Events that ran out of attempts
+    busy: bool = False  # Another dispatcher held the lease, so nothing was sent
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class WebhookSession:
+    """Reuses one keep-alive HTTP(S) connection per host across requests."""
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self._connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(netloc, timeout=self.timeout)
+        self._connections[(scheme, netloc)] = connection
+        return connection
+
+    def post(self, url: str, body: bytes, headers: dict[str, str]) -> int:
+        """POST ``body`` to ``url`` and return the response status code."""
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        key = (parts.scheme, parts.netloc)
+        connection = self._connections.get(key)
+        reused = connection is not None
+        if connection is None:
+            connection = self._connect(*key)
+        while True:
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                del self._connections[key]
+                if not reused:
+                    raise
+                # The server may have closed an idle keep-alive connection; retry once on a fresh one.
+                reused = False
+                connection = self._connect(*key)
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds to wait before retry number ``attempts`` (exponential, capped, jittered)."""
+    config = outbox_config()
+    delay = min(float(config.get("BACKOFF_BASE", 2)) * 2 ** (attempts - 1), float(config.get("BACKOFF_MAX", 3600)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _event_body(event: OutboxEvent) -> dict[str, Any]:
+    return {
+        "id": event.pk,
+        "topic": event.topic,
+        "resource": event.resource,
+        "object_id": event.object_id,
+        "occurred_at": event.created_at,
+        "payload": event.payload,
+    }
+
+
+def _deliver(session: WebhookSession, urls: list[str], body: bytes, stats: DeliveryStats) -> str:
+    """POST ``body`` to every URL; return an error message, or "" on success."""
+    headers = {"Content-Type": "application/json"}
+    for url in urls:
+        stats.requests += 1
+        try:
+            status = session.post(url, body, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            return f"{url}: {exc!r}"
+        if not 200 <= status < 300:
+            return f"{url}: HTTP {status}"
+    return ""
+
+
+def dispatch_batch(session: WebhookSession, urls: list[str], batch_size: int, stats: DeliveryStats) -> bool:
+    """
+    Deliver the oldest pending batch.
+
+    Returns ``False`` when there is nothing to send yet (empty outbox, or the
+    head of the queue is backing off).
+    """
+    events = list(OutboxEvent.objects.filter(status=OutboxEvent.Status.PENDING).order_by("id")[:batch_size])
+    now = timezone.now()
+    if not events or events[0].next_attempt_at > now:
+        return False
+
+    latest: dict[tuple[str, int], OutboxEvent] = {}
+    for event in events:
+        latest[(event.resource, event.object_id)] = event
+    outgoing = sorted(latest.values(), key=lambda event: event.pk)
+    body = json.dumps({"events": [_event_body(event) for event in outgoing]}, cls=DjangoJSONEncoder).encode()
+
+    stats.batches += 1
+    error = _deliver(session, urls, body, stats)
+    for event in events:
+        event.attempts += 1
+    if not error:
+        for event in events:
+            event.status = OutboxEvent.Status.DELIVERED
+            event.delivered_at = now
+            event.last_error = ""
+        stats.delivered += len(events)
+        stats.coalesced += len(events) - len(outgoing)
+    else:
+        stats.failed_batches += 1
+        max_attempts = int(outbox_config().get("MAX_ATTEMPTS", 8))
+        for event in events:
+            event.last_error = error
+            if event.attempts >= max_attempts:
+                event.status = OutboxEvent.Status.FAILED
+                stats.dead += 1
+            else:
+                event.next_attempt_at = now + timedelta(seconds=backoff_delay(event.attempts))
+    OutboxEvent.objects.bulk_update(
+        events, ["status", "attempts", "next_attempt_at", "last_error", "delivered_at"]
+    )
+    return not error
+
+
+def dispatch(urls: list[str] | None = None, batch_size: int | None = None, session: WebhookSession | None = None) -> DeliveryStats:
+    """
+    Drain the outbox until it is empty, blocked behind a backoff, or a batch fails.
+
+    Returns at once with ``busy`` set when another dispatcher holds the lease.
+    """
+    config = outbox_config()
+    urls = list(urls if urls is not None else config.get("WEBHOOK_URLS", []))
+    batch_size = batch_size or int(config.get("BATCH_SIZE", 100))
+    lease_ttl = int(config.get("LEASE_TTL", 300))
+    stats = DeliveryStats()
+    owner = f"{default_owner()}:{uuid.uuid4().hex[:8]}"  # Unique per call, also across threads
+    if not acquire_lock(LEASE_NAME, owner, lease_ttl):
+        stats.busy = True
+        return stats
+    owns_session = session is None
+    session = session or WebhookSession(timeout=float(config.get("TIMEOUT", 5)))
+    started = time.perf_counter()
+    try:
+        while renew_lock(LEASE_NAME, owner, lease_ttl) and dispatch_batch(session, urls, batch_size, stats):
+            pass
+    finally:
+        release_lock(LEASE_NAME, owner)
+        if owns_session:
+            session.close()
+        stats.seconds = round(time.perf_counter() - started, 3)
+    return stats
@@ -0,0 +1,107 @@
+"""Pagination classes shared by the API viewsets."""
+from functools import cached_property, partial
+
+from django.core.paginator import InvalidPage, Page, Paginator
+from rest_framework.pagination import PageNumberPagination
+
+from . import counts
+
+
+class CachedCountPaginator(Paginator):
+    """Django paginator that obtains its total through ``core.counts``."""
+
+    def __init__(self, object_list, per_page, *args, count_mode=counts.CACHED, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.count_mode = count_mode
+
+    @cached_property
+    def count(self):
+        return counts.cached_count(self.object_list, self.count_mode)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists on very large tables.
+
+    Counts at most ``count_limit + 1`` rows (a bounded ``COUNT`` over a
+    ``LIMIT`` subquery). Beyond that it reports the last cached count, the
+    database's table estimate for unfiltered lists, or ``count_limit``, so a
+    changelist never runs an unbounded ``COUNT(*)``.
+    """
+
+    count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        bounded = queryset[: self.count_limit + 1].count()
+        if bounded <= self.count_limit:
+            return bounded
+        estimate = counts.peek_count(queryset)
+        if estimate is None and not queryset.query.where:
+            estimate = counts.estimated_row_count(queryset.model, queryset.db)
+        return max(estimate or 0, self.count_limit)
+
+
+class UncountedPage(Page):
+    """Page that knows whether a next page exists without knowing the total."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class UncountedPaginator(Paginator):
+    """Paginator for ``?count=none``: fetches one extra row instead of counting."""
+
+    count = None
+    num_pages = 0  # Unknown; keeps DRF from rendering numbered page controls.
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return UncountedPage(rows[: self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError) as exc:
+            raise InvalidPage(self.error_messages["invalid_page"]) from exc
+        if number < 1:
+            raise InvalidPage(self.error_messages["min_page"])
+        return number
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination whose ``count`` is cached per filtered queryset.
+
+    Clients may pass ``?count=exact`` to force a fresh count, ``?count=estimate``
+    to accept a possibly stale one, or ``?count=none`` to skip counting entirely
+    (``count`` is then ``null`` and only the ``next``/``previous`` links are given).
+    """
+
+    count_query_param = "count"
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, counts.CACHED)
+        return mode if mode in counts.COUNT_MODES else counts.CACHED
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = self.get_count_mode(request)
+        if mode == counts.NONE:
+            self.django_paginator_class = UncountedPaginator
+            self.last_page_strings = ()  # "last" cannot be resolved without a total.
+        else:
+            self.django_paginator_class = partial(CachedCountPaginator, count_mode=mode)
+        return super().paginate_queryset(queryset, request, view)
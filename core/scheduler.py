@@ -0,0 +1,285 @@
+"""In-process job scheduler for precomputation and maintenance work.
+
+Apps declare jobs in a ``jobs.py`` module with the ``@job`` decorator and a
+five-field cron expression (minute hour day-of-month month day-of-week,
+evaluated in ``TIME_ZONE``). ``run_scheduler`` imports those modules, wakes
+when the next job is due and runs it in a bounded thread pool.
+
+Several scheduler instances may run at once. Each slot is claimed by inserting
+its ``JobRun`` row (unique per job and scheduled time), so a slot runs once;
+a ``JobLock`` lease stops a slow run from overlapping the next one.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import JobLock, JobRun
+
+logger = logging.getLogger(__name__)
+
+FIELD_RANGES = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),  # 0 = Sunday, as in cron
+)
+
+
+def scheduler_config() -> dict[str, Any]:
+    config = getattr(settings, "SCHEDULER_CONFIG", {})
+    return {
+        "MAX_WORKERS": int(config.get("MAX_WORKERS", 4)),
+        "LOCK_TTL": int(config.get("LOCK_TTL", 3600)),
+        "POLL_INTERVAL": float(config.get("POLL_INTERVAL", 30)),
+        "HISTORY_DAYS": int(config.get("HISTORY_DAYS", 30)),
+        "DISABLED_JOBS": set(config.get("DISABLED_JOBS", [])),
+    }
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> frozenset[int]:
+    top = 7 if name == "weekday" else high  # Day-of-week 7 is Sunday too
+    values = set()
+    for part in text.split(","):
+        expression, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if expression == "*":
+            start, end = low, high
+        elif "-" in expression:
+            start, end = (int(bound) for bound in expression.split("-", 1))
+        else:
+            start = int(expression)
+            end = high if step_text else start
+        if step < 1 or start > end or start < low or end > top:
+            raise ValueError(f"{name} field {part!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    if name == "weekday":
+        values = {value % 7 for value in values}
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A parsed five-field cron expression."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expressions have five fields, got {expression!r}")
+        self.expression = expression
+        parsed = {name: _parse_field(text, name, low, high) for text, (name, low, high) in zip(fields, FIELD_RANGES)}
+        self.minutes, self.hours = parsed["minute"], parsed["hour"]
+        self.days, self.months, self.weekdays = parsed["day"], parsed["month"], parsed["weekday"]
+        # Like cron: when both day fields are restricted, either one matching is enough.
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment`` (same tzinfo as ``moment``)."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"{self.expression!r} never matches")
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    schedule: CronSchedule
+    func: Callable[[], Any]
+    lock_ttl: int | None = None  # Seconds; defaults to SCHEDULER_CONFIG["LOCK_TTL"]
+
+
+registry: dict[str, Job] = {}
+
+
+def job(schedule: str, name: str | None = None, lock_ttl: int | None = None):
+    """Register the decorated function as a scheduled job (``name`` defaults to ``module.function``)."""
+
+    def decorator(func):
+        job_name = name or f"{func.__module__.rsplit('.', 1)[0]}.{func.__name__}"
+        registry[job_name] = Job(job_name, CronSchedule(schedule), func, lock_ttl)
+        return func
+
+    return decorator
+
+
+def discover() -> dict[str, Job]:
+    """Import every installed app's ``jobs`` module and return the enabled jobs."""
+    autodiscover_modules("jobs")
+    disabled = scheduler_config()["DISABLED_JOBS"]
+    return {name: registered for name, registered in sorted(registry.items()) if name not in disabled}
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lock(name: str, owner: str, ttl: int) -> bool:
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=ttl)
+    try:
+        with transaction.atomic():
+            JobLock.objects.create(name=name, owner=owner, acquired_at=now, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        # Take over a lease whose holder died without releasing it.
+        return bool(
+            JobLock.objects.filter(name=name, expires_at__lte=now).update(
+                owner=owner, acquired_at=now, expires_at=expires_at
+            )
+        )
+
+
+def renew_lock(name: str, owner: str, ttl: int) -> bool:
+    """Extend a lease ``owner`` still holds; ``False`` means it expired and was taken over."""
+    return bool(
+        JobLock.objects.filter(name=name, owner=owner).update(expires_at=timezone.now() + timedelta(seconds=ttl))
+    )
+
+
+def release_lock(name: str, owner: str) -> None:
+    JobLock.objects.filter(name=name, owner=owner).delete()
+
+
+def run_job(registered: Job, scheduled_for: datetime, owner: str | None = None) -> JobRun | None:
+    """
+    Claim ``scheduled_for``'s slot, run the job and record its outcome.
+
+    Returns ``None`` when another instance already claimed the slot.
+    """
+    owner = owner or default_owner()
+    try:
+        with transaction.atomic():
+            run = JobRun.objects.create(job=registered.name, scheduled_for=scheduled_for, owner=owner)
+    except IntegrityError:
+        return None
+    if not acquire_lock(registered.name, owner, registered.lock_ttl or scheduler_config()["LOCK_TTL"]):
+        run.status = JobRun.Status.SKIPPED
+        run.finished_at = timezone.now()
+        run.save(update_fields=["status", "finished_at"])
+        return run
+
+    started = time.perf_counter()
+    try:
+        registered.func()
+        run.status = JobRun.Status.SUCCEEDED
+    except Exception:
+        logger.exception("Scheduled job %s failed", registered.name)
+        run.status = JobRun.Status.FAILED
+        run.error = traceback.format_exc()
+    finally:
+        release_lock(registered.name, owner)
+    run.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "error", "duration_ms", "finished_at"])
+    return run
+
+
+def _run_in_worker(registered: Job, scheduled_for: datetime, owner: str) -> JobRun | None:
+    close_old_connections()
+    try:
+        return run_job(registered, scheduled_for, owner)
+    finally:
+        connections.close_all()  # Worker threads must not leak their connections.
+
+
+class Scheduler:
+    """Runs due jobs on a thread pool; one instance per ``run_scheduler`` process."""
+
+    def __init__(self, jobs: dict[str, Job], max_workers: int, owner: str | None = None):
+        self.jobs = jobs
+        self.owner = owner or default_owner()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler")
+        self.stopping = threading.Event()
+        self.next_runs: dict[str, datetime] = {}
+        self.in_flight: dict[str, Future] = {}
+
+    def _now(self) -> datetime:
+        return timezone.localtime().replace(second=0, microsecond=0)
+
+    def start(self) -> None:
+        now = self._now()
+        for name, registered in self.jobs.items():
+            self.next_runs[name] = registered.schedule.next_after(now - timedelta(minutes=1))
+
+    def tick(self, now: datetime | None = None) -> list[str]:
+        """Submit every job that is due at ``now``; return their names."""
+        now = now or timezone.localtime()
+        submitted = []
+        for name, due in self.next_runs.items():
+            if due > now:
+                continue
+            registered = self.jobs[name]
+            self.next_runs[name] = registered.schedule.next_after(now)
+            running = self.in_flight.get(name)
+            if running is not None and not running.done():
+                continue  # Still busy from an earlier slot in this process.
+            self.in_flight[name] = self.executor.submit(_run_in_worker, registered, due, self.owner)
+            submitted.append(name)
+        return submitted
+
+    def seconds_until_next(self, poll_interval: float) -> float:
+        if not self.next_runs:
+            return poll_interval
+        delay = (min(self.next_runs.values()) - timezone.localtime()).total_seconds()
+        return min(max(delay, 0.0), poll_interval)
+
+    def run_forever(self, poll_interval: float) -> None:
+        self.start()
+        try:
+            while not self.stopping.is_set():
+                self.tick()
+                self.stopping.wait(self.seconds_until_next(poll_interval))
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def stop(self) -> None:
+        self.stopping.set()
+
+
+def prune_history(days: int | None = None) -> int:
+    """Delete finished ``JobRun`` rows older than ``days`` (default ``HISTORY_DAYS``)."""
+    days = scheduler_config()["HISTORY_DAYS"] if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = JobRun.objects.filter(started_at__lt=cutoff).exclude(status=JobRun.Status.RUNNING).delete()
+    return deleted
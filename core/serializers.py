@@ -0,0 +1,11 @@
+"""Serializers for shared API resources."""
+from rest_framework import serializers
+
+from .models import APIToken
+
+
+class APITokenSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = APIToken
+        fields = ["id", "name", "prefix", "created_at", "expires_at", "revoked_at"]
+        read_only_fields = ["id", "prefix", "created_at", "revoked_at"]
@@ -0,0 +1,17 @@
+"""Signal handlers for cross-cutting API infrastructure."""
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import changefeed, counts, outbox, sqlite
+
+connection_created.connect(sqlite.configure_connection, dispatch_uid="core.configure_sqlite_connection")
+changefeed.track_configured_models()
+outbox.track_configured_models()
+
+
+@receiver(post_save, dispatch_uid="core.bump_count_generation_on_save")
+@receiver(post_delete, dispatch_uid="core.bump_count_generation_on_delete")
+def bump_count_generation(sender, **kwargs):
+    """Invalidate cached pagination counts for the table that was written."""
+    counts.bump_generation(sender._meta.db_table)
@@ -0,0 +1,67 @@
+"""SQLite connection tuning applied through the ``connection_created`` signal.
+
+``SQLITE_CONNECTION_PROFILE`` names one of the pragma sets in ``SQLITE_PROFILES``.
+Combined with ``CONN_MAX_AGE`` the pragmas are paid for once per persistent
+connection rather than once per request.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Pragmas a profile may set, mapped to a validator for their value.
+TUNABLE_PRAGMAS = {
+    "journal_mode": {"delete", "truncate", "persist", "memory", "wal", "off"}.__contains__,
+    "synchronous": {"off", "normal", "full", "extra"}.__contains__,
+    "temp_store": {"default", "file", "memory"}.__contains__,
+    "mmap_size": lambda value: isinstance(value, int) and value >= 0,
+    "cache_size": lambda value: isinstance(value, int),
+    "busy_timeout": lambda value: isinstance(value, int) and value >= 0,
+}
+REPORTED_PRAGMAS = (*TUNABLE_PRAGMAS, "page_size", "foreign_keys")
+
+
+def get_profile(name: str | None = None) -> dict[str, Any]:
+    """Return the pragma mapping for ``name`` (defaults to ``SQLITE_CONNECTION_PROFILE``)."""
+    name = name or getattr(settings, "SQLITE_CONNECTION_PROFILE", None)
+    if not name:
+        return {}
+    profiles = getattr(settings, "SQLITE_PROFILES", {})
+    try:
+        profile = profiles[name]
+    except KeyError as exc:
+        raise ImproperlyConfigured(f"Unknown SQLite connection profile {name!r}.") from exc
+    for pragma, value in profile.items():
+        validator = TUNABLE_PRAGMAS.get(pragma)
+        if validator is None or not validator(value.lower() if isinstance(value, str) else value):
+            raise ImproperlyConfigured(f"Invalid SQLite pragma in profile {name!r}: {pragma}={value!r}")
+    return profile
+
+
+def apply_profile(cursor, profile: dict[str, Any]) -> None:
+    """Execute the profile's pragmas on a DB-API cursor (Django or plain ``sqlite3``)."""
+    for pragma, value in profile.items():
+        # Names and values were validated against TUNABLE_PRAGMAS in get_profile().
+        cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+def read_pragmas(cursor) -> dict[str, Any]:
+    """Return the effective value of every reported pragma on this connection."""
+    values = {}
+    for pragma in REPORTED_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+        row = cursor.fetchone()
+        values[pragma] = row[0] if row else None
+    return values
+
+
+def configure_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver applying the configured profile to SQLite connections."""
+    if connection.vendor != "sqlite":
+        return
+    profile = get_profile()
+    if profile:
+        with connection.cursor() as cursor:
+            apply_profile(cursor, profile)
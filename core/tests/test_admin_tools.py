@@ -0,0 +1,117 @@
+"""Tests for the large-table admin helpers."""
+from datetime import date
+
+from django.contrib.admin import ModelAdmin, site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from attendance.models import AttendanceRecord
+from core.admin_tools import IndexSeekDatesQuerySet, ScalableAdminMixin
+from core.pagination import EstimatedCountPaginator
+from employees.models import Employee, EmployeeQuerySet
+from performance.models import PerformanceReview
+
+
+class ScalableAdminTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser("root", "root@example.com", "pass1234")
+        self.client.force_login(self.admin)
+        self.ada = self._employee("Ada", "Lovelace")
+        self.alan = self._employee("Alan", "Turing")
+        days = [date(2023, 11, 30), date(2024, 1, 2), date(2024, 1, 3), date(2024, 3, 5)]
+        for day in days:
+            for employee in (self.ada, self.alan):
+                AttendanceRecord.objects.create(employee=employee, date=day, status=AttendanceRecord.Status.PRESENT)
+
+    def _employee(self, first_name, last_name):
+        return Employee.objects.create(
+            first_name=first_name,
+            last_name=last_name,
+            email=f"{first_name.lower()}@example.com",
+            position="Engineer",
+            department="R&D",
+            date_hired=date(2020, 1, 1),
+        )
+
+    def _changelist_queries(self, name, params=None):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse(f"admin:{name}_changelist"), params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, captured
+
+    def test_changelists_have_constant_query_counts(self):
+        _, before = self._changelist_queries("employees_employee")
+        _, attendance_before = self._changelist_queries("attendance_attendancerecord")
+        self._employee("Grace", "Hopper")
+        AttendanceRecord.objects.create(employee=self.ada, date=date(2024, 3, 6), status="remote")
+        _, after = self._changelist_queries("employees_employee")
+        _, attendance_after = self._changelist_queries("attendance_attendancerecord")
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(len(attendance_before), len(attendance_after))
+        self.assertFalse(
+            [query for query in attendance_after if "COUNT(*)" in query["sql"] and "LIMIT" not in query["sql"]]
+        )
+
+    def test_prefix_search_is_case_insensitive(self):
+        response, _ = self._changelist_queries("attendance_attendancerecord", {"q": "lOV"})
+        self.assertEqual({record.employee_id for record in response.context["cl"].result_list}, {self.ada.pk})
+        response, _ = self._changelist_queries("employees_employee", {"q": "ALAN@"})
+        self.assertEqual([employee.pk for employee in response.context["cl"].result_list], [self.alan.pk])
+        response, _ = self._changelist_queries("employees_employee", {"q": "r&d eng"})  # Department and position
+        self.assertEqual(len(response.context["cl"].result_list), 2)
+
+    def test_prefix_search_seeks_lower_indexes(self):
+        request = self.client.get(reverse("admin:employees_employee_changelist")).wsgi_request
+        for model in (Employee, AttendanceRecord, PerformanceReview):
+            model_admin = site._registry[model]
+            queryset, _ = model_admin.get_search_results(request, model_admin.get_queryset(request), "lov")
+            plan = queryset.explain()
+            with self.subTest(model=model.__name__):
+                self.assertIn("USING INDEX employee_last_name_lower_idx (<expr>>? AND <expr><?)", plan)
+                self.assertNotIn("SCAN", plan)
+
+    def test_index_seek_dates_match_distinct_dates(self):
+        queryset = IndexSeekDatesQuerySet(model=AttendanceRecord)
+        for kind in ("year", "month", "day"):
+            self.assertEqual(list(queryset.dates("date", kind)), list(AttendanceRecord.objects.dates("date", kind)))
+        self.assertEqual(
+            queryset.filter(date__year=2024).dates("date", "month", order="DESC"),
+            [date(2024, 3, 1), date(2024, 1, 1)],
+        )
+
+    def test_date_hierarchy_keeps_the_admin_queryset(self):
+        class HiredAdmin(ScalableAdminMixin, ModelAdmin):
+            date_hierarchy = "date_hired"
+            ordering = ("-date_hired",)
+
+            def get_queryset(self, request):
+                return super().get_queryset(request).filter(status=Employee.EmploymentStatus.ACTIVE)
+
+        request = self.client.get(reverse("admin:employees_employee_changelist")).wsgi_request
+        queryset = HiredAdmin(Employee, site).get_queryset(request)
+        self.assertIsInstance(queryset, EmployeeQuerySet)
+        self.assertIsInstance(queryset, IndexSeekDatesQuerySet)
+        self.assertEqual(queryset.query.order_by, ("-date_hired",))
+        self.assertEqual(list(queryset.dates("date_hired", "year")), [date(2020, 1, 1)])
+
+    def test_rating_filter_uses_fixed_bands(self):
+        for rating in ("1.50", "3.20", "4.00"):
+            PerformanceReview.objects.create(
+                employee=self.ada,
+                review_period_start=date(2024, 1, 1),
+                review_period_end=date(2024, 3, 31),
+                reviewer_name="Babbage",
+                rating=rating,
+            )
+        response, captured = self._changelist_queries("performance_performancereview", {"rating_band": "4-plus"})
+        self.assertEqual([str(review.rating) for review in response.context["cl"].result_list], ["4.00"])
+        self.assertFalse([query for query in captured if "DISTINCT" in query["sql"] and "rating" in query["sql"]])
+
+    def test_paginator_count_is_bounded(self):
+        paginator = EstimatedCountPaginator(AttendanceRecord.objects.all(), 2)
+        paginator.count_limit = 5
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(EstimatedCountPaginator(AttendanceRecord.objects.filter(employee=self.ada), 2).count, 4)
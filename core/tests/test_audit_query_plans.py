@@ -0,0 +1,32 @@
+"""Tests for the query plan audit command."""
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class AuditQueryPlansTests(TestCase):
+    def run_audit(self, *args):
+        stdout = StringIO()
+        call_command("audit_query_plans", *args, stdout=stdout)
+        return json.loads(stdout.getvalue())
+
+    def test_flags_cross_table_sort_on_attendance(self):
+        report = self.run_audit("--max-filters", "1")
+        entry = next(
+            item
+            for item in report["queries"]
+            if item["source"] == "viewset:attendance"
+            and item["params"] == {"status": "present", "ordering": "employee__last_name"}
+        )
+        self.assertTrue(entry["temp_btrees"])
+        self.assertEqual(entry["suggested_index"]["not_indexable"], ["employee__last_name"])
+        sources = {item["source"] for item in report["queries"]}
+        self.assertTrue({"viewset:employee", "viewset:performance", "service:headcount_summary"} <= sources)
+
+    def test_issues_only_output_is_stable(self):
+        first = self.run_audit("--issues-only")
+        second = self.run_audit("--issues-only")
+        self.assertEqual(first, second)
+        self.assertTrue(all(item["full_scans"] or item["temp_btrees"] for item in first["queries"]))
@@ -0,0 +1,77 @@
+"""Tests for the incremental change feed."""
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from core.models import ChangeLogEntry
+from employees.models import Employee
+
+
+class ChangeFeedTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Mary",
+            last_name="Jackson",
+            email="mary@example.com",
+            position="Engineer",
+            department="Engineering",
+            date_hired=date(2015, 6, 1),
+        )
+        self.url = reverse("attendance-changes")
+
+    def _record(self, day, status_value=AttendanceRecord.Status.PRESENT):
+        return AttendanceRecord.objects.create(employee=self.employee, date=day, status=status_value)
+
+    def test_feed_returns_latest_state_and_tombstones(self):
+        kept = self._record(date(2024, 3, 1))
+        removed = self._record(date(2024, 3, 2))
+        kept.status = AttendanceRecord.Status.REMOTE
+        kept.save()
+        removed_id = removed.pk
+        removed.delete()
+
+        response = self.client.get(self.url, {"cursor": 0})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item["id"]: item for item in response.data["results"]}
+        self.assertEqual(set(results), {kept.pk, removed_id})
+        self.assertEqual(results[kept.pk]["op"], "upsert")
+        self.assertEqual(results[kept.pk]["data"]["status"], "remote")
+        self.assertEqual(results[removed_id], {"seq": results[removed_id]["seq"], "op": "delete", "id": removed_id})
+        self.assertFalse(response.data["has_more"])
+
+        response = self.client.get(self.url, {"cursor": response.data["cursor"]})
+        self.assertEqual(response.data["results"], [])
+
+    def test_only_deltas_after_cursor_are_returned(self):
+        self._record(date(2024, 3, 1))
+        cursor = self.client.get(self.url).data["cursor"]
+        later = self._record(date(2024, 3, 4))
+
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual([item["id"] for item in response.data["results"]], [later.pk])
+
+    def test_batches_follow_the_limit(self):
+        for day in range(1, 4):
+            self._record(date(2024, 3, day))
+
+        first = self.client.get(self.url, {"cursor": 0, "limit": 2}).data
+        self.assertEqual(len(first["results"]), 2)
+        self.assertTrue(first["has_more"])
+        second = self.client.get(self.url, {"cursor": first["cursor"], "limit": 2}).data
+        self.assertEqual(len(second["results"]), 1)
+        self.assertFalse(second["has_more"])
+
+    def test_feeds_are_per_resource(self):
+        self._record(date(2024, 3, 1))
+        response = self.client.get(reverse("employee-changes"))
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.employee.pk])
+        self.assertTrue(
+            ChangeLogEntry.objects.filter(resource="attendance.attendancerecord").exists()
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"cursor": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
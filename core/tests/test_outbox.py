@@ -0,0 +1,141 @@
+"""Tests for the transactional outbox and its webhook dispatcher."""
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from core import outbox
+from core.models import JobLock, OutboxEvent
+from core.scheduler import acquire_lock
+from employees.models import Employee
+
+
+class StubWebhook:
+    """Local HTTP server that records POSTed JSON and answers with ``status``."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.bodies = []
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                stub.bodies.append(json.loads(self.rfile.read(length)))
+                stub.connections.add(self.client_address)
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hooks/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Dorothy",
+            last_name="Vaughan",
+            email="dorothy@example.com",
+            position="Supervisor",
+            department="Computing",
+            date_hired=date(2010, 2, 1),
+        )
+
+    def test_writes_enqueue_events_in_the_same_transaction(self):
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("topic", flat=True)), ["employee.created"]
+        )
+        try:
+            with transaction.atomic():
+                AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 5, 1), status="present")
+                raise RuntimeError("roll back")
+        except RuntimeError:
+            pass
+        self.assertFalse(OutboxEvent.objects.filter(resource="attendance.attendancerecord").exists())
+
+    def test_new_hire_event_carries_the_provisioned_user(self):
+        event = OutboxEvent.objects.get()
+        self.assertIsNotNone(self.employee.user_id)
+        self.assertEqual(event.payload["user_id"], self.employee.user_id)
+
+    def test_dispatch_coalesces_and_reuses_the_connection(self):
+        record = AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 5, 1), status="present")
+        record.status = "remote"
+        record.save()
+
+        session = outbox.WebhookSession()
+        with StubWebhook() as stub:
+            stats = outbox.dispatch([stub.url], session=session)
+            AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 5, 2), status="present")
+            outbox.dispatch([stub.url], session=session)
+        session.close()
+
+        self.assertEqual(stats.batches, 1)
+        self.assertEqual(stats.delivered, 3)
+        self.assertEqual(stats.coalesced, 1)
+        self.assertEqual(len(stub.bodies), 2)
+        self.assertEqual(len(stub.connections), 1)
+        delivered = stub.bodies[0]["events"]
+        self.assertEqual([event["topic"] for event in delivered], ["employee.created", "attendancerecord.updated"])
+        self.assertEqual(delivered[1]["payload"]["status"], "remote")
+        self.assertFalse(OutboxEvent.objects.exclude(status=OutboxEvent.Status.DELIVERED).exists())
+
+    @override_settings(OUTBOX_CONFIG={"MAX_ATTEMPTS": 2, "BACKOFF_BASE": 60})
+    def test_failed_batches_back_off_and_eventually_fail(self):
+        with StubWebhook(status=500) as stub:
+            stats = outbox.dispatch([stub.url])
+            event = OutboxEvent.objects.get()
+            self.assertEqual(stats.failed_batches, 1)
+            self.assertEqual(event.attempts, 1)
+            self.assertGreater(event.next_attempt_at, timezone.now())
+            self.assertIn("HTTP 500", event.last_error)
+
+            # Still backing off: nothing is sent.
+            self.assertEqual(outbox.dispatch([stub.url]).requests, 0)
+
+            OutboxEvent.objects.update(next_attempt_at=timezone.now())
+            stats = outbox.dispatch([stub.url])
+        self.assertEqual(stats.dead, 1)
+        self.assertEqual(OutboxEvent.objects.get().status, OutboxEvent.Status.FAILED)
+
+    def test_only_one_dispatcher_drains_at_a_time(self):
+        self.assertTrue(acquire_lock(outbox.LEASE_NAME, "other-host:1", ttl=60))
+        with StubWebhook() as stub:
+            stats = outbox.dispatch([stub.url])
+            self.assertEqual((stats.busy, stats.requests, len(stub.bodies)), (True, 0, 0))
+
+            # A lease left behind by a crashed dispatcher is taken over once it expires.
+            JobLock.objects.filter(name=outbox.LEASE_NAME).update(expires_at=timezone.now())
+            stats = outbox.dispatch([stub.url])
+        self.assertEqual((stats.busy, stats.delivered), (False, 1))
+        self.assertFalse(JobLock.objects.filter(name=outbox.LEASE_NAME).exists())
+
+    def test_command_reports_delivery_metrics(self):
+        out = StringIO()
+        with StubWebhook() as stub:
+            call_command("dispatch_outbox", "--url", stub.url, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())["delivered"], 1)
+        self.assertEqual(len(stub.bodies), 1)
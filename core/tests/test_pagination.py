@@ -0,0 +1,57 @@
+"""Tests for cached pagination counts."""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+
+
+class CachedCountPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employee = Employee.objects.create(
+            first_name="Annie",
+            last_name="Easley",
+            email="annie@example.com",
+            position="Programmer",
+            department="Computing",
+            date_hired=date(2015, 3, 1),
+        )
+        for offset in range(3):
+            AttendanceRecord.objects.create(
+                employee=self.employee,
+                date=date(2024, 5, 1) + timedelta(days=offset),
+                status=AttendanceRecord.Status.ABSENT,
+            )
+        self.url = reverse("attendance-list")
+
+    def test_count_is_reused_until_a_write(self):
+        params = {"status": "absent", "date_after": "2024-05-01"}
+        self.assertEqual(self.client.get(self.url, params).data["count"], 3)
+        with self.assertNumQueries(1):
+            # Same filter in a different parameter order: only the page query runs.
+            response = self.client.get(self.url, {"date_after": "2024-05-01", "status": "absent"})
+        self.assertEqual(response.data["count"], 3)
+
+        AttendanceRecord.objects.create(
+            employee=self.employee, date=date(2024, 5, 9), status=AttendanceRecord.Status.ABSENT
+        )
+        self.assertEqual(self.client.get(self.url, params).data["count"], 4)
+
+    def test_count_modes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url, {"count": "exact"}).data["count"], 3)
+
+        AttendanceRecord.objects.filter(pk=AttendanceRecord.objects.first().pk).delete()
+        self.assertEqual(self.client.get(self.url, {"count": "estimate"}).data["count"], 3)
+
+        response = self.client.get(self.url, {"count": "none"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["count"])
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
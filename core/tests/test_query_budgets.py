@@ -0,0 +1,257 @@
+"""
+Query budgets for every API route, report view, portal view and admin changelist.
+
+Each route is requested against seeded data, then again after the data has
+grown several times over. The query count must fit the route's budget and
+must not change with the result size, so an N+1 (a serializer field or admin
+column touching a relation per row) fails here with the captured SQL.
+"""
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Any, Callable
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+from performance.models import PerformanceReview
+
+DEPARTMENTS = ["Engineering", "Finance", "Operations"]
+STATUSES = ["present", "remote", "absent", "present", "sick"]
+
+
+@dataclass(frozen=True)
+class Route:
+    """One request and the most queries it may run."""
+
+    name: str
+    budget: int
+    url: Callable[["QueryBudgetTests"], str]
+    method: str = "get"  # "get" or "post"
+    data: Callable[["QueryBudgetTests"], dict[str, Any]] | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+    as_user: str = "staff"  # "staff", "employee" or "anonymous"
+    status: int = 200
+    form: bool = False  # POST as an HTML form instead of JSON
+
+
+def _url(name: str, *args: Callable[["QueryBudgetTests"], Any]):
+    return lambda case: reverse(name, args=[arg(case) for arg in args])
+
+
+def _employee_id(case):
+    return case.employee.pk
+
+
+def _this_month():
+    return f"{timezone.localdate():%Y-%m}"
+
+
+ROUTES = [
+    # Employees
+    Route("employee-list", 3, _url("employee-list")),
+    Route("employee-list filtered", 3, _url("employee-list"), params={"department": "Engineering", "ordering": "-date_hired"}),
+    Route("employee-detail", 2, _url("employee-detail", _employee_id)),
+    Route("employee-search", 2, _url("employee-search"), params={"q": "e"}),
+    Route("employee-insights", 4, _url("employee-insights", _employee_id)),
+    Route("employee-changes", 3, _url("employee-changes")),
+    Route(
+        "employee-create",
+        14,
+        _url("employee-list"),
+        method="post",
+        data=lambda case: {
+            "first_name": "New",
+            "last_name": "Hire",
+            "email": f"new.hire.{case.created}@example.com",
+            "position": "Analyst",
+            "department": "Finance",
+            "manager": case.employee.pk,
+            "date_hired": "2024-01-08",
+        },
+        status=201,
+    ),
+    # Attendance
+    Route("attendance-list", 3, _url("attendance-list")),
+    Route("attendance-list filtered", 3, _url("attendance-list"), params={"status": "present", "ordering": "employee__last_name"}),
+    Route("attendance-detail", 2, lambda case: reverse("attendance-detail", args=[case.record.pk])),
+    Route("attendance-daily-summary", 2, _url("attendance-daily-summary")),
+    Route("attendance-alerts", 2, _url("attendance-alerts")),
+    Route("attendance-heatmap", 3, _url("attendance-heatmap"), params={"department": "Engineering"}),
+    Route("attendance-changes", 3, _url("attendance-changes")),
+    Route(
+        "attendance-create",
+        15,
+        _url("attendance-list"),
+        method="post",
+        data=lambda case: {"employee": case.employee.pk, "date": "2030-01-02", "status": "present"},
+        status=201,
+    ),
+    Route(
+        "attendance-sync",
+        40,  # 4 for the batch, then 12 per record written (the same signal work as any attendance save)
+        _url("attendance-sync"),
+        method="post",
+        data=lambda case: {
+            "device": "budget-kiosk",
+            "events": [
+                {"key": f"{case.created}-{index}", "employee": employee_id, "action": "check_in", "at": "2024-01-02T09:00:00Z"}
+                for index, employee_id in enumerate(case.employee_ids)
+            ],
+        },
+    ),
+    # Performance
+    Route("performance-list", 3, _url("performance-list")),
+    Route("performance-detail", 2, lambda case: reverse("performance-detail", args=[case.review.pk])),
+    Route("performance-top-performers", 2, _url("performance-top-performers"), params={"limit": 50}),
+    Route("performance-changes", 3, _url("performance-changes")),
+    Route(
+        "performance-create",
+        10,
+        _url("performance-list"),
+        method="post",
+        data=lambda case: {
+            "employee": case.employee.pk,
+            "review_period_start": "2030-01-01",
+            "review_period_end": "2030-03-31",
+            "reviewer_name": "Budget",
+            "rating": 4,
+        },
+        status=201,
+    ),
+    Route("api-token-list", 2, _url("api-token-list")),
+    # Reports
+    Route("reports:headcount", 4, _url("reports:headcount")),
+    Route("reports:headcount org", 4, lambda case: f"{reverse('reports:headcount')}?org={case.employee.pk}"),
+    Route("reports:attendance", 2, _url("reports:attendance")),
+    Route("reports:performance", 3, _url("reports:performance")),
+    Route("reports:performance-distribution", 2, _url("reports:performance-distribution"), params={"interval": "month"}),
+    Route("reports:attendance-period", 2, lambda case: reverse("reports:attendance-period", args=[_this_month()])),
+    Route("reports:performance-period", 3, lambda case: reverse("reports:performance-period", args=[_this_month()])),
+    Route("reports:employee-snapshot", 4, _url("reports:employee-snapshot", _employee_id)),
+    Route(
+        "reports:timesheet",
+        3,
+        lambda case: f"{reverse('reports:timesheet')}?month={_this_month()}&group_by=department&period=week",
+    ),
+    Route("reports:async-headcount", 3, _url("reports:async-headcount")),
+    Route("reports:async-attendance", 1, _url("reports:async-attendance")),
+    Route("reports:async-performance", 2, _url("reports:async-performance")),
+    Route("reports:async-employee-snapshot", 3, _url("reports:async-employee-snapshot", _employee_id)),
+    Route("reports:dashboard", 7, lambda case: f"{reverse('reports:dashboard')}?org={case.employee.pk}"),
+    # Portal
+    Route("employee_login", 0, _url("employee_login"), as_user="anonymous"),
+    Route("employee_dashboard", 3, _url("employee_dashboard"), as_user="employee"),
+    Route(
+        "mark_attendance",
+        19,
+        _url("mark_attendance"),
+        method="post",
+        data=lambda case: {"status": "present", "check_in_time": "09:00"},
+        as_user="employee",
+        status=302,
+        form=True,
+    ),
+    # Admin changelists
+    Route("admin employee changelist", 4, lambda case: reverse("admin:employees_employee_changelist")),
+    Route("admin attendance changelist", 9, lambda case: reverse("admin:attendance_attendancerecord_changelist")),
+    Route("admin performance changelist", 8, lambda case: reverse("admin:performance_performancereview_changelist")),
+]
+
+
+def seed(holder, per_department: int) -> None:
+    """Add employees (reporting to the first one) with attendance and reviews in every department."""
+    today = timezone.localdate()
+    for department in DEPARTMENTS:
+        for _ in range(per_department):
+            holder.size += 1
+            employee = Employee.objects.create(
+                first_name=f"Person{holder.size}",
+                last_name=f"Budget{holder.size:03d}",
+                email=f"person{holder.size}@example.com",
+                position="Engineer",
+                department=department,
+                manager=holder.employee,
+                date_hired=date(2020, 1, 1) + timedelta(days=holder.size),
+            )
+            holder.employee = holder.employee or employee
+            for offset in range(4):
+                AttendanceRecord.objects.create(
+                    employee=employee,
+                    date=today - timedelta(days=offset + 1),
+                    status=STATUSES[(holder.size + offset) % len(STATUSES)],
+                    check_in_time=time(9, offset * 5),
+                    check_out_time=time(17, 30),
+                    notes="Reason",
+                )
+            for quarter in range(2):
+                start = today.replace(day=1) - timedelta(days=120 * (quarter + 1))
+                PerformanceReview.objects.create(
+                    employee=employee,
+                    review_period_start=start,
+                    review_period_end=start + timedelta(days=89),
+                    reviewer_name="Manager",
+                    rating=(holder.size + quarter) % 5 + 1,
+                )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_superuser(username="budget-admin", password="pass1234")
+        cls.employee = None
+        cls.size = 0
+        seed(cls, per_department=3)
+        cls.record = AttendanceRecord.objects.filter(employee=cls.employee).first()
+        cls.review = PerformanceReview.objects.filter(employee=cls.employee).first()
+        cls.employee_ids = list(Employee.objects.order_by("id").values_list("id", flat=True)[:3])
+
+    def setUp(self):
+        self.created = 0
+
+    def measure(self, route: Route) -> tuple[int, list[str]]:
+        """Run ``route`` once (rolling back any write) and return its query count and SQL."""
+        cache.clear()  # Cached counts, sessions and tokens would hide queries.
+        self.client.logout()
+        if route.as_user == "staff":
+            self.client.force_login(self.staff)
+        elif route.as_user == "employee":
+            self.client.force_login(self.employee.user)
+        self.created += 1
+        url = route.url(self)
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                if route.method == "get":
+                    response = self.client.get(url, route.params)
+                elif route.form:
+                    response = self.client.post(url, route.data(self))
+                else:
+                    response = self.client.post(url, route.data(self), content_type="application/json")
+            transaction.set_rollback(True)
+        self.assertEqual(response.status_code, route.status, f"{route.name}: {getattr(response, 'data', '')}")
+        return len(captured), [query["sql"] for query in captured.captured_queries]
+
+    def test_routes_stay_within_budget_and_flat(self):
+        small = {route.name: self.measure(route) for route in ROUTES}
+        seed(self, per_department=5)
+        for route in ROUTES:
+            with self.subTest(route=route.name):
+                count, queries = small[route.name]
+                grown_count, grown_queries = self.measure(route)
+                listing = "\n".join(f"  {index}. {sql}" for index, sql in enumerate(grown_queries, 1))
+                self.assertLessEqual(
+                    grown_count, route.budget, f"{route.name} ran {grown_count} queries (budget {route.budget}):\n{listing}"
+                )
+                self.assertEqual(
+                    grown_count,
+                    count,
+                    f"{route.name} ran {count} queries on {len(DEPARTMENTS) * 3} employees but {grown_count} "
+                    f"on {self.size}; the count grows with the data:\n{listing}",
+                )
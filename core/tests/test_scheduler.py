@@ -0,0 +1,107 @@
+"""Tests for the cron scheduler, its slot claiming and job locks."""
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from core import scheduler
+from core.models import JobLock, JobRun
+
+
+def at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CronScheduleTests(TestCase):
+    def test_next_after(self):
+        business_hours = scheduler.CronSchedule("*/15 9-17 * * 1-5")
+        # 2024-03-08 is a Friday.
+        self.assertEqual(business_hours.next_after(at(2024, 3, 8, 10, 7)), at(2024, 3, 8, 10, 15))
+        self.assertEqual(business_hours.next_after(at(2024, 3, 8, 17, 45)), at(2024, 3, 11, 9, 0))
+        self.assertEqual(scheduler.CronSchedule("30 0 1 * *").next_after(at(2024, 12, 5)), at(2025, 1, 1, 0, 30))
+        self.assertEqual(scheduler.CronSchedule("0 0 29 2 *").next_after(at(2024, 3, 1)), at(2028, 2, 29))
+
+    def test_day_fields_combine_like_cron(self):
+        # Restricted day-of-month *and* day-of-week: either one matching is enough.
+        schedule = scheduler.CronSchedule("0 12 13 * 5")
+        self.assertTrue(schedule.matches(at(2024, 3, 13, 12)))  # The 13th, a Wednesday
+        self.assertTrue(schedule.matches(at(2024, 3, 15, 12)))  # A Friday
+        self.assertFalse(schedule.matches(at(2024, 3, 14, 12)))
+        self.assertTrue(scheduler.CronSchedule("0 0 * * 7").matches(at(2024, 3, 10)))  # Sunday as 7
+
+    def test_invalid_expressions(self):
+        for expression in ("* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                scheduler.CronSchedule(expression)
+
+
+class RunJobTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.job = scheduler.Job("tests.sample", scheduler.CronSchedule("* * * * *"), lambda: self.calls.append(1))
+        self.slot = at(2024, 3, 8, 10, 0)
+
+    def test_records_outcome_and_runs_each_slot_once(self):
+        run = scheduler.run_job(self.job, self.slot, owner="a")
+        self.assertEqual(run.status, JobRun.Status.SUCCEEDED)
+        self.assertIsNotNone(run.duration_ms)
+        self.assertIsNone(scheduler.run_job(self.job, self.slot, owner="b"))
+        self.assertEqual(self.calls, [1])
+        self.assertFalse(JobLock.objects.exists())
+
+    def test_failures_are_recorded(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        run = scheduler.run_job(scheduler.Job("tests.broken", self.job.schedule, broken), self.slot)
+        self.assertEqual(run.status, JobRun.Status.FAILED)
+        self.assertIn("RuntimeError: boom", run.error)
+        self.assertFalse(JobLock.objects.exists())
+
+    def test_locked_jobs_are_skipped_until_the_lease_expires(self):
+        now = timezone.now()
+        JobLock.objects.create(name="tests.sample", owner="other", acquired_at=now, expires_at=now + timedelta(hours=1))
+        self.assertEqual(scheduler.run_job(self.job, self.slot).status, JobRun.Status.SKIPPED)
+        self.assertEqual(self.calls, [])
+
+        JobLock.objects.update(expires_at=now - timedelta(seconds=1))
+        self.assertEqual(scheduler.run_job(self.job, self.slot + timedelta(minutes=1)).status, JobRun.Status.SUCCEEDED)
+        self.assertEqual(self.calls, [1])
+
+    def test_prune_history(self):
+        old = scheduler.run_job(self.job, self.slot)
+        JobRun.objects.filter(pk=old.pk).update(started_at=timezone.now() - timedelta(days=40))
+        scheduler.run_job(self.job, self.slot + timedelta(minutes=1))
+        self.assertEqual(scheduler.prune_history(days=30), 1)
+        self.assertEqual(JobRun.objects.count(), 1)
+
+    def test_command_lists_and_runs_app_jobs(self):
+        out = StringIO()
+        call_command("run_scheduler", "--list", stdout=out)
+        self.assertIn("reports.refresh_period_reports", out.getvalue())
+        self.assertIn("core.dispatch_outbox", out.getvalue())
+
+        call_command("run_scheduler", "--run", "reports.refresh_period_reports", stdout=out)
+        self.assertEqual(JobRun.objects.get().status, JobRun.Status.SUCCEEDED)
+
+
+class SchedulerTickTests(TransactionTestCase):
+    def test_due_jobs_run_on_the_pool(self):
+        calls = []
+        jobs = {
+            "tests.every_minute": scheduler.Job(
+                "tests.every_minute", scheduler.CronSchedule("* * * * *"), lambda: calls.append("minute")
+            ),
+            "tests.hourly": scheduler.Job("tests.hourly", scheduler.CronSchedule("0 * * * *"), lambda: calls.append("hour")),
+        }
+        runner = scheduler.Scheduler(jobs, max_workers=2, owner="test")
+        runner.next_runs = {"tests.every_minute": at(2024, 3, 8, 10, 30), "tests.hourly": at(2024, 3, 8, 11, 0)}
+        self.assertEqual(runner.tick(at(2024, 3, 8, 10, 30, 5)), ["tests.every_minute"])
+        runner.executor.shutdown(wait=True)
+
+        self.assertEqual(calls, ["minute"])
+        self.assertEqual(runner.next_runs["tests.every_minute"], at(2024, 3, 8, 10, 31))
+        run = JobRun.objects.get()
+        self.assertEqual((run.job, run.scheduled_for, run.status), ("tests.every_minute", at(2024, 3, 8, 10, 30), "succeeded"))
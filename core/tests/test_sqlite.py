@@ -0,0 +1,48 @@
+"""Tests for the SQLite connection profile."""
+import json
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import sqlite
+
+
+class SQLiteProfileTests(TestCase):
+    def test_profile_applied_to_connection(self):
+        stdout = StringIO()
+        call_command("sqlite_pragmas", "--json", stdout=stdout)
+        report = json.loads(stdout.getvalue())
+        profile = sqlite.get_profile()
+        self.assertEqual(report["pragmas"]["cache_size"], profile["cache_size"])
+        self.assertEqual(report["pragmas"]["busy_timeout"], profile["busy_timeout"])
+        self.assertEqual(report["conn_health_checks"], True)
+
+    @override_settings(SQLITE_PROFILES={"small": {"cache_size": -1000}}, SQLITE_CONNECTION_PROFILE="small")
+    def test_configure_connection_uses_selected_profile(self):
+        with connection.cursor() as cursor:
+            original = sqlite.read_pragmas(cursor)["cache_size"]
+        try:
+            sqlite.configure_connection(sender=None, connection=connection)
+            with connection.cursor() as cursor:
+                self.assertEqual(sqlite.read_pragmas(cursor)["cache_size"], -1000)
+        finally:
+            with connection.cursor() as cursor:
+                sqlite.apply_profile(cursor, {"cache_size": original})
+
+
+class SQLiteProfileValidationTests(SimpleTestCase):
+    @override_settings(SQLITE_PROFILES={"bad": {"journal_mode": "wal; DROP TABLE x"}})
+    def test_invalid_pragma_value_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            sqlite.get_profile("bad")
+
+    def test_benchmark_reports_each_profile(self):
+        stdout = StringIO()
+        call_command("benchmark_sqlite_profiles", "--rows", "20", "--reads", "20", "--json", stdout=stdout)
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(set(results), {"default", "balanced", "durable"})
+        self.assertEqual(results["balanced"]["journal_mode"], "wal")
+        self.assertEqual(results["default"]["journal_mode"], "delete")
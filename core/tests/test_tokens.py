@@ -0,0 +1,71 @@
+"""Tests for API token authentication."""
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from attendance.models import AttendanceRecord
+from core import tokens
+from core.authentication import APITokenAuthentication
+from core.models import APIToken
+from employees.models import Employee
+
+
+class APITokenTests(APITestCase):
+    def setUp(self):
+        tokens.validated_tokens.clear()
+        self.user = get_user_model().objects.create_user(username="payroll", password="pass1234")
+        self.employee = Employee.objects.create(
+            first_name="Evelyn",
+            last_name="Boyd",
+            email="evelyn@example.com",
+            position="Mathematician",
+            department="Analytics",
+            date_hired=date(2014, 9, 1),
+        )
+
+    def test_issue_use_and_revoke_token(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse("api-token-list"), {"name": "payroll-sync"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        key = response.data["token"]
+        self.assertNotIn(key, APIToken.objects.values_list("key_hash", flat=True))
+        self.client.force_authenticate(None)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        created = self.client.post(
+            reverse("attendance-list"),
+            {"employee": self.employee.id, "date": "2024-04-02", "status": AttendanceRecord.Status.PRESENT},
+            format="json",
+        )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+
+        revoked = self.client.delete(reverse("api-token-detail", kwargs={"pk": response.data["id"]}))
+        self.assertEqual(revoked.status_code, status.HTTP_204_NO_CONTENT)
+        denied = self.client.get(reverse("api-token-list"))
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(str(denied.data["detail"]), "Invalid or revoked token.")
+
+    def test_validated_tokens_skip_the_database(self):
+        _, key = tokens.issue_token(self.user)
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {key}")
+        backend = APITokenAuthentication()
+        with self.assertNumQueries(1):
+            user, _ = backend.authenticate(request)
+        with self.assertNumQueries(0):
+            cached_user, _ = backend.authenticate(request)
+        self.assertEqual(user, cached_user)
+        self.assertIsNone(tokens.verify_key(key[:-1] + ("A" if key[-1] != "A" else "B")))
+
+    def test_management_command_issue_and_revoke(self):
+        stdout = StringIO()
+        call_command("api_token", "issue", "payroll", "--name", "bi", stdout=stdout)
+        token = APIToken.objects.get(user=self.user)
+        self.assertIn(f"{token.prefix}.", stdout.getvalue())
+        call_command("api_token", "revoke", token.prefix, stdout=StringIO())
+        token.refresh_from_db()
+        self.assertFalse(token.is_valid)
@@ -0,0 +1,111 @@
+"""Issuing, revoking and verifying API tokens."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import APIToken
+
+
+def _token_config() -> dict[str, Any]:
+    return getattr(settings, "API_TOKEN_CONFIG", {})
+
+
+def hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issue_token(user, name: str = "", expires_at: datetime | None = None) -> tuple[APIToken, str]:
+    """Create a token for ``user`` and return it with the plaintext key (shown only once)."""
+    prefix = secrets.token_hex(6)
+    key = f"{prefix}.{secrets.token_urlsafe(32)}"
+    token = APIToken.objects.create(
+        user=user,
+        name=name,
+        prefix=prefix,
+        key_hash=hash_key(key),
+        expires_at=expires_at,
+    )
+    return token, key
+
+
+def revoke_token(token: APIToken) -> None:
+    if token.revoked_at is None:
+        token.revoked_at = timezone.now()
+        token.save(update_fields=["revoked_at"])
+    validated_tokens.discard_token(token.pk)
+
+
+class ValidatedTokenCache:
+    """
+    Small in-process LRU of recently validated keys.
+
+    Entries expire after ``CACHE_TTL`` seconds (or at the token's own expiry,
+    whichever is sooner), which bounds how long another process may keep
+    accepting a revoked key.
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, Any, APIToken]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return entry[1], entry[2]
+
+    def put(self, digest: str, user, token: APIToken) -> None:
+        config = _token_config()
+        lifetime = config.get("CACHE_TTL", 60)
+        if token.expires_at is not None:
+            lifetime = min(lifetime, (token.expires_at - timezone.now()).total_seconds())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + lifetime, user, token)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > config.get("CACHE_SIZE", 1024):
+                self._entries.popitem(last=False)
+
+    def discard_token(self, token_id: int) -> None:
+        with self._lock:
+            for digest in [digest for digest, entry in self._entries.items() if entry[2].pk == token_id]:
+                del self._entries[digest]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+validated_tokens = ValidatedTokenCache()
+
+
+def verify_key(key: str):
+    """Return ``(user, token)`` for a valid key, or ``None``."""
+    digest = hash_key(key)
+    cached = validated_tokens.get(digest)
+    if cached is not None:
+        return cached
+    prefix, _, _ = key.partition(".")
+    token = APIToken.objects.select_related("user").filter(prefix=prefix).first()
+    if token is None or not hmac.compare_digest(token.key_hash, digest):
+        return None
+    if not token.is_valid or not token.user.is_active:
+        return None
+    validated_tokens.put(digest, token.user, token)
+    return token.user, token
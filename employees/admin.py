@@ -1,11 +1,19 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Employee
+from core.admin_tools import ScalableAdminMixin
+
+from .models import Department, Employee
+
+
+@admin.register(Department)
+class DepartmentAdmin(admin.ModelAdmin):
+    list_display = ("id", "name")
+    search_fields = ("name",)
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "first_name",
@@ -17,16 +25,20 @@ class EmployeeAdmin(admin.ModelAdmin):
         "has_user_account",
         "date_hired",
     )
-    search_fields = ("first_name", "last_name", "email", "department", "position")
+    # Matched as case-insensitive prefixes (see ScalableAdminMixin)
+    search_fields = ("last_name", "first_name", "email", "department__name", "position")
+    list_select_related = ("department",)
     list_filter = ("department", "status", "is_active")
     readonly_fields = ("created_at", "updated_at", "user_account_info")
+    autocomplete_fields = ("department", "manager")
+    raw_id_fields = ("user",)
     
     fieldsets = (
         ("Personal Information", {
             'fields': ('first_name', 'last_name', 'email')
         }),
         ("Employment Details", {
-            'fields': ('position', 'department', 'date_hired', 'status', 'is_active')
+            'fields': ('position', 'department', 'manager', 'date_hired', 'status', 'is_active')
         }),
         ("User Account", {
             'fields': ('user', 'user_account_info'),
@@ -40,9 +52,10 @@ class EmployeeAdmin(admin.ModelAdmin):
     
     def has_user_account(self, obj):
         """Display if employee has a user account."""
-        if obj.user:
-            return format_html('<span style="color: green;">✓ Yes</span>')
-        return format_html('<span style="color: red;">✗ No</span>')
+        # user_id is on the row already; obj.user would query once per employee
+        if obj.user_id:
+            return format_html('<span style="color: green;">{}</span>', "✓ Yes")
+        return format_html('<span style="color: red;">{}</span>', "✗ No")
     has_user_account.short_description = "Has Login"
     
     def user_account_info(self, obj):
@@ -1,29 +1,42 @@
 """API endpoints for employee resources."""
+import django_filters
 from django.db.models import Avg, Count, Q
+from django.utils import timezone
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from attendance.models import AttendanceRecord
+from attendance import bitmaps
+from core.changefeed import ChangeFeedMixin
 from performance.models import PerformanceReview
 
 from .models import Employee
 from .serializers import EmployeeSerializer
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.all()
+class EmployeeFilter(django_filters.FilterSet):
+    # Departments are filtered by name (as before they had their own table) or by id
+    department = django_filters.CharFilter(field_name="department__name")
+    department_id = django_filters.NumberFilter(field_name="department_id")
+
+    class Meta:
+        model = Employee
+        fields = {
+            "manager": ["exact"],
+            "status": ["exact"],
+            "is_active": ["exact"],
+            "date_hired": ["gte", "lte"],
+        }
+
+
+class EmployeeViewSet(ChangeFeedMixin, viewsets.ModelViewSet):
+    queryset = Employee.objects.select_related("department")
     serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    search_fields = ["first_name", "last_name", "email", "department", "position"]
+    search_fields = ["first_name", "last_name", "email", "department__name", "position"]
     ordering_fields = ["first_name", "last_name", "date_hired", "department"]
     ordering = ["last_name", "first_name"]
-    filterset_fields = {
-        "department": ["exact"],
-        "status": ["exact"],
-        "is_active": ["exact"],
-        "date_hired": ["gte", "lte"],
-    }
+    filterset_class = EmployeeFilter
 
     @action(detail=False, methods=["get"], url_path="search")
     def search(self, request):
@@ -35,7 +48,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             Q(first_name__icontains=term)
             | Q(last_name__icontains=term)
             | Q(email__icontains=term)
-            | Q(department__icontains=term)
+            | Q(department__name__icontains=term)
         )[:25]
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -44,11 +57,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def insights(self, request, pk=None):
         """Return key HR signals for the specified employee."""
         employee = self.get_object()
-        attendance_stats = employee.attendance_records.aggregate(
-            total_days=Count("id"),
-            present_days=Count("id", filter=Q(status=AttendanceRecord.Status.PRESENT)),
-            absent_days=Count("id", filter=Q(status=AttendanceRecord.Status.ABSENT)),
-        )
+        attendance_bits = bitmaps.load(employee.pk)
+        attendance_stats = {
+            **bitmaps.summary(attendance_bits),
+            "current_streak": bitmaps.current_streak(attendance_bits, timezone.localdate()),
+        }
         reviews = employee.performance_reviews.aggregate(
             average_rating=Avg("rating"),
             review_count=Count("id"),
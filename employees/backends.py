@@ -0,0 +1,48 @@
+"""
+Authentication backend for the employee portal.
+
+Every portal page needs both the logged-in User and their Employee profile.
+Django's ModelBackend loads the User on its own, and the first access to
+``request.user.employee_profile`` then runs a second query. This backend joins
+the profile in the same query so each request pays for one lookup, not two.
+The profile's attendance bitmaps (``user.attendance_bitmaps``, see
+``attendance.bitmaps.rows_subquery``) come along for the dashboard's stats.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import OuterRef
+
+from attendance import bitmaps
+
+UserModel = get_user_model()
+
+
+class EmployeeProfileBackend(ModelBackend):
+    """ModelBackend that always loads ``user.employee_profile`` with the user."""
+
+    def _users(self):
+        return UserModel._default_manager.select_related("employee_profile__department").annotate(
+            attendance_bitmaps=bitmaps.rows_subquery(OuterRef("employee_profile"))
+        )
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = self._users().get(**{UserModel.USERNAME_FIELD: username})
+        except UserModel.DoesNotExist:
+            # Run the password hasher anyway so missing users aren't revealed by timing.
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        try:
+            user = self._users().get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,82 @@
+"""Maintenance of the ``OrgClosure`` table behind the reporting hierarchy.
+
+Creating an employee adds one row per ancestor. Re-parenting detaches the
+employee's whole subtree from its old ancestors and links it under the new
+manager's ancestors with set-based deletes and bulk inserts, so moving a
+subtree costs (subtree size x depth) rows and never walks the tree.
+"""
+from __future__ import annotations
+
+from django.core.exceptions import ValidationError
+
+from .models import Employee, OrgClosure
+
+BATCH_SIZE = 1000
+
+
+def would_create_cycle(employee: Employee, manager_id: int | None) -> bool:
+    """True when ``manager_id`` is ``employee`` itself or somewhere in their org."""
+    if manager_id is None or employee.pk is None:
+        return False
+    if manager_id == employee.pk:
+        return True
+    return OrgClosure.objects.filter(ancestor_id=employee.pk, descendant_id=manager_id).exists()
+
+
+def _ancestors(employee_id: int) -> list[tuple[int, int]]:
+    """``(ancestor_id, depth)`` pairs for ``employee_id``, including itself at depth 0."""
+    return list(OrgClosure.objects.filter(descendant_id=employee_id).values_list("ancestor_id", "depth"))
+
+
+def attach_new(employee: Employee) -> None:
+    """Add closure rows for a newly created employee."""
+    links = [OrgClosure(ancestor_id=employee.pk, descendant_id=employee.pk, depth=0)]
+    if employee.manager_id:
+        links.extend(
+            OrgClosure(ancestor_id=ancestor_id, descendant_id=employee.pk, depth=depth + 1)
+            for ancestor_id, depth in _ancestors(employee.manager_id)
+        )
+    OrgClosure.objects.bulk_create(links)
+
+
+def detach(employee: Employee) -> None:
+    """Cut ``employee``'s subtree loose from everyone above ``employee``."""
+    subtree_ids = OrgClosure.objects.filter(ancestor_id=employee.pk).values("descendant_id")
+    OrgClosure.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+
+
+def move(employee: Employee, new_manager_id: int | None) -> None:
+    """Re-parent ``employee`` (and everyone below them) under ``new_manager_id``."""
+    if would_create_cycle(employee, new_manager_id):
+        raise ValidationError({"manager": "An employee cannot report to themselves or to someone in their org."})
+    subtree = list(OrgClosure.objects.filter(ancestor_id=employee.pk).values_list("descendant_id", "depth"))
+    if not subtree:
+        # Rows created before the hierarchy existed (or loaded as fixtures) have no self link yet.
+        OrgClosure.objects.create(ancestor_id=employee.pk, descendant_id=employee.pk, depth=0)
+        subtree = [(employee.pk, 0)]
+    detach(employee)
+    if new_manager_id is None:
+        return
+    OrgClosure.objects.bulk_create(
+        (
+            OrgClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=above + below + 1)
+            for ancestor_id, above in _ancestors(new_manager_id)
+            for descendant_id, below in subtree
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def rebuild() -> int:
+    """Recompute the whole closure table from ``Employee.manager`` (for backfills and repairs)."""
+    parents = dict(Employee.objects.values_list("id", "manager_id"))
+    links = []
+    for employee_id in parents:
+        ancestor_id, depth, seen = employee_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(OrgClosure(ancestor_id=ancestor_id, descendant_id=employee_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+    OrgClosure.objects.all().delete()
+    OrgClosure.objects.bulk_create(links, batch_size=BATCH_SIZE)
+    return len(links)
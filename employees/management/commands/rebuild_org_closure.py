@@ -0,0 +1,14 @@
+"""Management command to rebuild the org chart closure table from Employee.manager."""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employees import hierarchy
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the OrgClosure table from Employee.manager (after fixture loads or bulk updates)'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            links = hierarchy.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt org closure table with {links} links.'))
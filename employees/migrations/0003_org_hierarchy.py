@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_self_links(apps, schema_editor):
+    """Existing employees have no manager yet, so each is only its own org."""
+    Employee = apps.get_model('employees', 'Employee')
+    OrgClosure = apps.get_model('employees', 'OrgClosure')
+    OrgClosure.objects.bulk_create(
+        (OrgClosure(ancestor_id=pk, descendant_id=pk, depth=0) for pk in Employee.objects.values_list('pk', flat=True)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_employee_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='manager',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='direct_reports', to='employees.employee'),
+        ),
+        migrations.CreateModel(
+            name='OrgClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='employees.employee')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='employees.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='employees_o_descend_a682ef_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_org_closure_pair')],
+            },
+        ),
+        migrations.RunPython(seed_self_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def intern_departments(apps, schema_editor):
+    """Create one Department per distinct name and point employees at it."""
+    Department = apps.get_model('employees', 'Department')
+    Employee = apps.get_model('employees', 'Employee')
+    names = list(Employee.objects.values_list('department', flat=True).distinct())
+    Department.objects.bulk_create(Department(name=name) for name in sorted({name.strip() for name in names}))
+    ids = dict(Department.objects.values_list('name', 'pk'))
+    for name in names:
+        Employee.objects.filter(department=name).update(department_ref_id=ids[name.strip()])
+
+
+def restore_department_names(apps, schema_editor):
+    Department = apps.get_model('employees', 'Department')
+    Employee = apps.get_model('employees', 'Employee')
+    for department in Department.objects.all():
+        Employee.objects.filter(department_ref_id=department.pk).update(department=department.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_org_hierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='department_ref',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='+',
+                to='employees.department',
+            ),
+        ),
+        migrations.RunPython(intern_departments, restore_department_names),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employees_e_departm_3bc28e_idx',
+        ),
+        # A default lets the name column be re-added when this migration is reversed.
+        migrations.AlterField(
+            model_name='employee',
+            name='department',
+            field=models.CharField(default='', max_length=120),
+        ),
+        migrations.RemoveField(
+            model_name='employee',
+            name='department',
+        ),
+        migrations.RenameField(
+            model_name='employee',
+            old_name='department_ref',
+            new_name='department',
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='department',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='employees',
+                to='employees.department',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'status'], name='employees_e_departm_5a5710_idx'),
+        ),
+    ]
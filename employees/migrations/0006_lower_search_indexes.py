@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:17
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_name_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='department_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('last_name'), name='employee_last_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('first_name'), name='employee_first_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='employee_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('position'), name='employee_position_lower_idx'),
+        ),
+    ]
@@ -5,10 +5,52 @@ Models in Django are like blueprints for database tables.
 Each class becomes a table, each attribute becomes a column!
 """
 from django.db import models
+from django.db.models.functions import Concat, Lower
 from django.contrib.auth.models import User  # Django's built-in user model for login/auth
 
+from core.models import AtomicSaveMixin
 
-class Employee(models.Model):
+
+class DepartmentManager(models.Manager):
+    def intern(self, name: str) -> "Department":
+        """Return the department called ``name``, creating it the first time it's used."""
+        department, _ = self.get_or_create(name=name.strip())
+        return department
+
+
+class Department(models.Model):
+    """
+    A department employees belong to.
+
+    Employees point at this table with an integer key, so grouping and
+    filtering by department compares small integers instead of repeating the
+    name on every employee row.
+    """
+
+    name = models.CharField(max_length=120, unique=True)
+
+    objects = DepartmentManager()
+
+    class Meta:
+        ordering = ["name"]
+        indexes = [models.Index(Lower("name"), name="department_name_lower_idx")]  # Admin prefix search
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class EmployeeQuerySet(models.QuerySet):
+    def create(self, **kwargs):
+        """
+        Also accept ``department="Name"`` (how employees were created before
+        departments got their own table); the name is interned to a Department.
+        """
+        if isinstance(kwargs.get("department"), str):
+            kwargs["department"] = Department.objects.intern(kwargs["department"])
+        return super().create(**kwargs)
+
+
+class Employee(AtomicSaveMixin, models.Model):
     """
     Stores core employee profile information.
     
@@ -46,7 +88,19 @@ class Employee(models.Model):
     last_name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)  # EmailField validates it's a real email format
     position = models.CharField(max_length=120)  # Job title
-    department = models.CharField(max_length=120)  # Which department they work in
+    # Which department they work in
+    # PROTECT means a department can't be deleted while employees are still in it
+    department = models.ForeignKey(Department, on_delete=models.PROTECT, related_name="employees")
+
+    # Who this employee reports to (empty for the top of the org chart)
+    # SET_NULL means deleting a manager leaves their reports without one instead of deleting them
+    manager = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="direct_reports",
+    )
     date_hired = models.DateField()  # When they joined (DateField = date only, no time)
     
     # Status field using our choices from above
@@ -63,9 +117,74 @@ class Employee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # Set once when created
     updated_at = models.DateTimeField(auto_now=True)  # Updated every time we save
 
+    objects = EmployeeQuerySet.as_manager()
+
     class Meta:
         ordering = ["last_name", "first_name"]
-        indexes = [models.Index(fields=["department", "status"])]
+        indexes = [
+            models.Index(fields=["department", "status"]),
+            models.Index(fields=["last_name", "first_name"]),  # Default ordering
+            # Case-insensitive prefix search in the admin (core.admin_tools.IPrefix)
+            models.Index(Lower("last_name"), name="employee_last_name_lower_idx"),
+            models.Index(Lower("first_name"), name="employee_first_name_lower_idx"),
+            models.Index(Lower("email"), name="employee_email_lower_idx"),
+            models.Index(Lower("position"), name="employee_position_lower_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded manager and department so moves can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_manager_id = instance.__dict__.get("manager_id")
+        instance._loaded_department_id = instance.__dict__.get("department_id")
+        return instance
+
+    def clean(self):
+        """Refuse to make someone report to themselves or to one of their own reports."""
+        from django.core.exceptions import ValidationError
+
+        from .hierarchy import would_create_cycle
+
+        if self.manager_id and would_create_cycle(self, self.manager_id):
+            raise ValidationError({"manager": "An employee cannot report to themselves or to someone in their org."})
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
+
+
+class OrgClosure(models.Model):
+    """
+    Closure table of the reporting hierarchy.
+
+    One row for every (manager, employee somewhere below them) pair, plus a
+    depth-0 row for each employee with itself, so "everyone in X's org" is a
+    single indexed join instead of a recursive walk. Maintained by
+    ``employees.hierarchy`` whenever an employee is created or re-parented.
+    """
+
+    ancestor = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="descendant_links")
+    descendant = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="ancestor_links")
+    depth = models.PositiveIntegerField()  # 0 = self, 1 = direct report, ...
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["ancestor", "descendant"], name="unique_org_closure_pair"),
+        ]
+        indexes = [models.Index(fields=["descendant", "depth"])]
+
+    def __str__(self) -> str:
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
+def full_name_expression(prefix: str = "") -> Concat:
+    """
+    SQL version of ``str(employee)`` for ``values()`` queries.
+
+    Pass ``prefix="employee__"`` when querying a model that points at Employee.
+    """
+    return Concat(
+        f"{prefix}first_name",
+        models.Value(" "),
+        f"{prefix}last_name",
+        output_field=models.CharField(),
+    )
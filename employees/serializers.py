@@ -1,10 +1,33 @@
 """Serializers for employee resources."""
 from rest_framework import serializers
 
-from .models import Employee
+from .hierarchy import would_create_cycle
+from .models import Department, Employee
+
+
+class DepartmentNameField(serializers.Field):
+    """
+    Reads and writes a department as its name, as the API did before
+    departments had their own table. Validation only checks the name; the
+    serializer interns it when saving, so unknown names create the department
+    only for valid payloads.
+    """
+
+    default_error_messages = {"invalid": "Enter a department name of at most {max_length} characters."}
+    max_length = Department._meta.get_field("name").max_length
+
+    def to_representation(self, value):
+        return value.name
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str) or not data.strip() or len(data.strip()) > self.max_length:
+            self.fail("invalid", max_length=self.max_length)
+        return data.strip()
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
+    department = DepartmentNameField()
+
     class Meta:
         model = Employee
         fields = [
@@ -14,6 +37,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "email",
             "position",
             "department",
+            "manager",
             "date_hired",
             "status",
             "is_active",
@@ -21,3 +45,20 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+    def create(self, validated_data):
+        return super().create(self._intern_department(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._intern_department(validated_data))
+
+    @staticmethod
+    def _intern_department(validated_data):
+        if "department" in validated_data:
+            validated_data["department"] = Department.objects.intern(validated_data["department"])
+        return validated_data
+
+    def validate_manager(self, manager):
+        if manager is not None and self.instance is not None and would_create_cycle(self.instance, manager.pk):
+            raise serializers.ValidationError("An employee cannot report to themselves or to someone in their org.")
+        return manager
@@ -4,10 +4,12 @@ Signal handlers for employee model.
 Signals are like event listeners - they automatically run code when something happens.
 In this case, we want to create a user account every time a new employee is added!
 """
-from django.db.models.signals import post_save  # This fires AFTER a model is saved
+from django.db.models.signals import post_save, pre_delete, pre_save  # These fire around a save / BEFORE a delete
 from django.dispatch import receiver  # Decorator to connect our function to the signal
 from django.contrib.auth.models import User  # Django's built-in User model for authentication
-from .models import Employee
+from monitoring import metrics
+from . import hierarchy
+from .models import Employee, OrgClosure
 import secrets  # For generating secure random strings
 import string
 
@@ -23,20 +25,25 @@ def generate_temp_password(length=12):
     return ''.join(secrets.choice(alphabet) for _ in range(length))
 
 
-@receiver(post_save, sender=Employee)  # This decorator means "run this function after an Employee is saved"
-def create_employee_user(sender, instance, created, **kwargs):
+@receiver(pre_save, sender=Employee)  # This decorator means "run this function just before an Employee is saved"
+def create_employee_user(sender, instance, **kwargs):
     """
     Automatically create a User account when a new Employee is created.
     
     This is the magic that makes it so admins don't have to manually create
     login accounts for every employee - it just happens automatically!
     
+    It runs before the employee row is inserted, so the row (and the
+    "employee.created" outbox event and change feed entry written after it)
+    already carries the new user. ``Employee.save()`` is atomic, so the user
+    is rolled back too if the insert fails.
+    
     Args:
         sender: The model class (Employee)
-        instance: The actual employee object that was just saved
-        created: Boolean - True if this is a new employee, False if updating existing
+        instance: The employee object that is about to be saved
         **kwargs: Other stuff Django passes in (we don't need it)
     """
+    created = instance._state.adding  # True for a NEW employee, False when updating an existing one
     # Only create a user if this is a NEW employee (not an update) and they don't already have a user
     if created and instance.user is None:
         # Generate username from email (everything before the @ symbol)
@@ -66,8 +73,9 @@ def create_employee_user(sender, instance, created, **kwargs):
         )
         
         # Link the user to the employee (this creates the one-to-one relationship)
+        # The insert that follows saves the link, so no second save is needed
         instance.user = user
-        instance.save(update_fields=['user'])  # Only update the 'user' field to avoid infinite loop
+        metrics.USER_PROVISIONING.inc(outcome="created")
         
         # Print info to console so admin knows the credentials
         # In production, you'd send an email instead
@@ -75,3 +83,37 @@ def create_employee_user(sender, instance, created, **kwargs):
         print(f"  Username: {username}")
         print(f"  Temporary Password: {temp_password}")
         print(f"  Employee should change password after first login!")
+    elif created:
+        metrics.USER_PROVISIONING.inc(outcome="existing_user")
+
+
+_UNKNOWN = object()
+
+
+@receiver(post_save, sender=Employee)
+def update_org_closure(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the org chart closure table in step with ``Employee.manager``.
+
+    Raising here (e.g. for a reporting cycle) rolls the save back, because
+    ``Employee.save()`` runs in a transaction.
+    """
+    if raw:
+        return  # Fixture loads: run `manage.py rebuild_org_closure` afterwards.
+    if created:
+        hierarchy.attach_new(instance)
+    else:
+        previous = getattr(instance, "_loaded_manager_id", _UNKNOWN)
+        if previous is _UNKNOWN:
+            previous = (
+                OrgClosure.objects.filter(descendant_id=instance.pk, depth=1).values_list("ancestor_id", flat=True).first()
+            )
+        if previous != instance.manager_id:
+            hierarchy.move(instance, instance.manager_id)
+    instance._loaded_manager_id = instance.manager_id
+
+
+@receiver(pre_delete, sender=Employee)
+def detach_org_subtree(sender, instance, **kwargs):
+    """Direct reports lose their manager (SET_NULL), so detach them from the managers above too."""
+    hierarchy.detach(instance)
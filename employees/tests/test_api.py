@@ -1,12 +1,13 @@
 """API tests for employee endpoints."""
 from datetime import date
 
+from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from attendance.models import AttendanceRecord
-from employees.models import Employee
+from employees.models import Department, Employee
 from performance.models import PerformanceReview
 
 
@@ -47,3 +48,41 @@ class EmployeeAPITests(APITestCase):
         self.assertIn("attendance", response.data)
         self.assertIn("performance", response.data)
         self.assertEqual(response.data["performance"]["review_count"], 1)
+
+    def test_department_reads_and_writes_as_a_name(self):
+        self.client.force_authenticate(get_user_model().objects.create_user(username="hr", password="pass1234"))
+        response = self.client.post(
+            reverse("employee-list"),
+            {
+                "first_name": "Grace",
+                "last_name": "Hopper",
+                "email": "grace@example.com",
+                "position": "Admiral",
+                "department": "R&D",
+                "date_hired": "2021-05-01",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["department"], "R&D")
+        self.assertEqual(Department.objects.count(), 1)
+
+        response = self.client.get(reverse("employee-list"), {"department": "R&D"})
+        self.assertEqual(len(response.data["results"]), 2)
+        department_id = Department.objects.get().pk
+        response = self.client.get(reverse("employee-list"), {"department_id": department_id})
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(reverse("reports:headcount"))
+        self.assertEqual(
+            response.data["by_department"],
+            [{"department_id": department_id, "department": "R&D", "total": 2, "active": 2}],
+        )
+
+        response = self.client.post(
+            reverse("employee-list"),
+            {"first_name": "Katherine", "email": "not-an-email", "department": "Flight Research"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Department.objects.filter(name="Flight Research").exists())
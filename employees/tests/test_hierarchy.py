@@ -0,0 +1,85 @@
+"""Tests for the reporting hierarchy and its closure table."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from employees import hierarchy
+from employees.models import Employee, OrgClosure
+from reports import services
+
+
+def org_of(employee):
+    return set(
+        OrgClosure.objects.filter(ancestor=employee).values_list("descendant__first_name", flat=True)
+    )
+
+
+class OrgHierarchyTests(APITestCase):
+    def setUp(self):
+        self.vp = self._employee("Vera")
+        self.director_a = self._employee("Ann", manager=self.vp)
+        self.director_b = self._employee("Bob", manager=self.vp)
+        self.lead = self._employee("Lea", manager=self.director_a)
+
+    def _employee(self, first_name, manager=None):
+        return Employee.objects.create(
+            first_name=first_name,
+            last_name="Org",
+            email=f"{first_name.lower()}@example.com",
+            position="Staff",
+            department="Operations",
+            date_hired=date(2020, 1, 1),
+            manager=manager,
+        )
+
+    def test_closure_rows_on_create(self):
+        self.assertEqual(org_of(self.vp), {"Vera", "Ann", "Bob", "Lea"})
+        self.assertEqual(org_of(self.director_a), {"Ann", "Lea"})
+        self.assertEqual(OrgClosure.objects.get(ancestor=self.vp, descendant=self.lead).depth, 2)
+
+    def test_reparenting_moves_the_whole_subtree(self):
+        self.director_a.manager = self.director_b
+        self.director_a.save()
+
+        self.assertEqual(org_of(self.director_b), {"Bob", "Ann", "Lea"})
+        self.assertEqual(OrgClosure.objects.get(ancestor=self.vp, descendant=self.lead).depth, 3)
+        incremental = set(OrgClosure.objects.values_list("ancestor_id", "descendant_id", "depth"))
+        hierarchy.rebuild()
+        self.assertEqual(set(OrgClosure.objects.values_list("ancestor_id", "descendant_id", "depth")), incremental)
+
+    def test_cycles_are_rejected_and_rolled_back(self):
+        self.vp.manager = self.lead
+        with self.assertRaises(ValidationError):
+            self.vp.save()
+        self.assertIsNone(Employee.objects.get(pk=self.vp.pk).manager_id)
+
+        self.client.force_authenticate(get_user_model().objects.create_user(username="hr", password="pass1234"))
+        response = self.client.patch(
+            reverse("employee-detail", args=[self.director_a.pk]), {"manager": self.lead.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deleting_a_manager_detaches_their_reports(self):
+        self.director_a.delete()
+        self.lead.refresh_from_db()
+        self.assertIsNone(self.lead.manager_id)
+        self.assertEqual(org_of(self.vp), {"Vera", "Bob"})
+        self.assertEqual(org_of(self.lead), {"Lea"})
+
+    def test_org_scoped_reports(self):
+        for employee in (self.vp, self.lead):
+            AttendanceRecord.objects.create(
+                employee=employee, date=date.today(), status=AttendanceRecord.Status.PRESENT
+            )
+        self.assertEqual(services.headcount_summary(org=self.director_a.pk)["totals"]["total"], 2)
+        self.assertEqual(services.headcount_summary(org=self.vp.pk)["totals"]["total"], 4)
+        self.assertEqual(services.attendance_summary(org=self.director_b.pk).totals, {})
+        self.assertEqual(services.attendance_summary(org=self.director_a.pk).totals, {"present": 1})
+
+        response = self.client.get(reverse("reports:headcount"), {"org": self.director_b.pk})
+        self.assertEqual(response.data["totals"]["total"], 1)
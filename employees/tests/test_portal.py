@@ -0,0 +1,61 @@
+"""Tests for the employee portal request path."""
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+
+
+class EmployeeDashboardTests(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Christine",
+            last_name="Darden",
+            email="christine@example.com",
+            position="Engineer",
+            department="Aeronautics",
+            date_hired=date(2013, 1, 7),
+        )
+        today = timezone.now().date()
+        statuses = ["present", "remote", "absent", "present"]
+        for offset in range(40):
+            AttendanceRecord.objects.create(
+                employee=self.employee,
+                date=today - timedelta(days=offset),
+                status=statuses[offset % len(statuses)],
+                notes="Reason" if statuses[offset % len(statuses)] == "absent" else "",
+            )
+        self.client.force_login(self.employee.user)
+
+    def test_dashboard_query_count(self):
+        # Session comes from the cache; one joined query loads user + employee
+        # profile + the attendance bitmaps the stats are counted from; one
+        # query returns the recent records.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("employee_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["stats"],
+            {"total_days": 40, "present_days": 30, "absent_days": 10, "attendance_rate": 75.0},
+        )
+        self.assertEqual(len(response.context["recent_records"]), 15)
+
+    def test_dashboard_without_records(self):
+        AttendanceRecord.objects.all().delete()
+        response = self.client.get(reverse("employee_dashboard"))
+        self.assertEqual(response.context["stats"]["total_days"], 0)
+        self.assertEqual(response.context["recent_records"], [])
+
+    def test_login_and_mark_attendance(self):
+        self.client.logout()
+        response = self.client.post(
+            reverse("employee_login"), {"username": "christine", "password": "employee123"}
+        )
+        self.assertRedirects(response, reverse("employee_dashboard"))
+        response = self.client.post(reverse("mark_attendance"), {"status": "remote"})
+        self.assertRedirects(response, reverse("employee_dashboard"))
+        today = AttendanceRecord.objects.get(employee=self.employee, date=timezone.now().date())
+        self.assertEqual(today.status, "remote")
@@ -9,10 +9,10 @@ from django.contrib.auth.decorators import login_required  # Decorator to protec
 from django.contrib import messages  # For showing success/error messages to users
 from django.shortcuts import render, redirect  # render = show template, redirect = go to different URL
 from django.utils import timezone  # For getting current date/time
-from django.db.models import Count, Q  # Q lets us do complex database queries (like OR conditions)
 from datetime import datetime, timedelta
 
 from employees.models import Employee
+from attendance import bitmaps
 from attendance.models import AttendanceRecord
 from .forms import EmployeeLoginForm, AttendanceMarkForm
 
@@ -98,22 +98,26 @@ def employee_dashboard(request):
         messages.error(request, 'No employee profile found for your account.')
         return redirect('employee_login')
     
-    # Get recent attendance records (last 30 days, limited to 15 most recent)
+    # The 15 most recent records come from an index range scan, and the all-time
+    # stats from the employee's yearly attendance bitmaps (a few tiny rows,
+    # loaded with the user by EmployeeProfileBackend) instead of counting their
+    # whole history.
     thirty_days_ago = timezone.now().date() - timedelta(days=30)
-    recent_records = AttendanceRecord.objects.filter(
-        employee=employee,
-        date__gte=thirty_days_ago  # gte = greater than or equal to
-    ).order_by('-date')[:15]  # Order by date descending, take first 15
-    
-    # Calculate statistics for the employee
-    total_records = AttendanceRecord.objects.filter(employee=employee)
+    records = list(AttendanceRecord.objects.filter(employee=employee).order_by('-date')[:15])
+    # Only show the last 30 days. The newest 15 records overall contain the
+    # newest 15 from the last 30 days, so filtering here gives the same list.
+    recent_records = [record for record in records if record.date >= thirty_days_ago]
+
+    # Statistics for the employee: present and remote both count as working days
+    if hasattr(request.user, 'attendance_bitmaps'):
+        year_bits = bitmaps.from_json(request.user.attendance_bitmaps)
+    else:  # User loaded by another backend
+        year_bits = bitmaps.load(employee.pk)
+    counts = bitmaps.count_range(year_bits)
     stats = {
-        'total_days': total_records.count(),
-        # Count days where status is 'present' OR 'remote' (both count as working)
-        'present_days': total_records.filter(
-            Q(status='present') | Q(status='remote')  # | means OR in Django queries
-        ).count(),
-        'absent_days': total_records.filter(status='absent').count(),
+        'total_days': sum(counts.values()),
+        'present_days': counts['present'] + counts['remote'],
+        'absent_days': counts['absent'],
         'attendance_rate': 0  # We'll calculate this next
     }
     
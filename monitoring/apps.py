@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+
+    def ready(self):
+        import monitoring.signals  # noqa: F401  Installs the slow query log on new connections.
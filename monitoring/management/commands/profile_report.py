@@ -0,0 +1,74 @@
+"""Management command that summarises captured request profiles per endpoint."""
+import json
+import pstats
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring import profiling
+
+SORT_KEYS = {'tottime': 'tottime', 'cumtime': 'cumulative'}
+
+
+class Command(BaseCommand):
+    help = 'Aggregate captured .pstats profiles into a top-N hot-function report per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Functions listed per endpoint (default: 15)')
+        parser.add_argument('--view', help='Only report endpoints whose view name contains this text')
+        parser.add_argument(
+            '--sort',
+            choices=sorted(SORT_KEYS),
+            default='tottime',
+            help='Rank by own time (tottime) or including callees (cumtime)',
+        )
+        parser.add_argument('--json', action='store_true', help='Output JSON instead of text')
+
+    def handle(self, *args, **options):
+        directory = profiling.profiling_config()['DIRECTORY']
+        captures = profiling.load_captures(directory) if directory.exists() else []
+        by_view = defaultdict(list)
+        for path, metadata in captures:
+            view_name = metadata.get('view_name', 'unresolved')
+            if options['view'] and options['view'] not in view_name:
+                continue
+            by_view[view_name].append((path, metadata))
+        if not by_view:
+            raise CommandError(f'No profiles found in {directory}.')
+
+        report = []
+        for view_name in sorted(by_view):
+            entries = by_view[view_name]
+            stats = pstats.Stats(*(str(path) for path, _ in entries))
+            stats.sort_stats(SORT_KEYS[options['sort']])
+            functions = []
+            for function in stats.fcn_list[: options['top']]:
+                calls, primitive_calls, own_time, cumulative_time, _ = stats.stats[function]
+                filename, line, name = function
+                functions.append({
+                    'function': f'{filename}:{line}({name})',
+                    'calls': calls,
+                    'tottime': round(own_time, 6),
+                    'cumtime': round(cumulative_time, 6),
+                })
+            durations = [metadata.get('duration_ms', 0) for _, metadata in entries]
+            report.append({
+                'view_name': view_name,
+                'profiles': len(entries),
+                'mean_duration_ms': round(sum(durations) / len(durations), 3),
+                'functions': functions,
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for item in report:
+            self.stdout.write(self.style.SUCCESS(
+                f"{item['view_name']}: {item['profiles']} profiles, mean {item['mean_duration_ms']} ms"
+            ))
+            self.stdout.write(f"  {'calls':>8} {'tottime':>10} {'cumtime':>10}  function")
+            for function in item['functions']:
+                self.stdout.write(
+                    f"  {function['calls']:>8} {function['tottime']:>10.4f} {function['cumtime']:>10.4f}  "
+                    f"{function['function']}"
+                )
@@ -0,0 +1,45 @@
+"""Management command that lists the slowest query fingerprints from the slow query log."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring import slowlog
+
+
+class Command(BaseCommand):
+    help = 'List slow query fingerprints ordered by total time, with callers and query plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Fingerprints listed (default: 10)')
+        parser.add_argument('--view', help='Only count entries whose view name contains this text')
+        parser.add_argument('--full-scans', action='store_true', help='Only list fingerprints whose plan scans a table')
+        parser.add_argument('--json', action='store_true', help='Output JSON instead of text')
+
+    def handle(self, *args, **options):
+        config = slowlog.slow_query_config()
+        entries = slowlog.read_entries(config)
+        if options['view']:
+            entries = [entry for entry in entries if options['view'] in (entry.get('view') or '')]
+        if not entries:
+            raise CommandError(f"No slow queries logged in {config['PATH']}.")
+        groups = slowlog.summarize(entries)
+        if options['full_scans']:
+            groups = [group for group in groups if group['full_scan']]
+        groups = groups[: options['top']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(groups, indent=2))
+            return
+        for group in groups:
+            self.stdout.write(self.style.SUCCESS(
+                f"{group['fingerprint']}  total {group['total_ms']:.1f} ms  count {group['count']}  "
+                f"mean {group['mean_ms']:.1f} ms  max {group['max_ms']:.1f} ms"
+                + ('  FULL SCAN' if group['full_scan'] else '')
+            ))
+            self.stdout.write(f"  {group['sql']}")
+            for view, count in sorted(group['views'].items(), key=lambda item: -item[1]):
+                self.stdout.write(f'  view   {view} ({count})')
+            for caller, count in sorted(group['callers'].items(), key=lambda item: -item[1]):
+                self.stdout.write(f'  caller {caller} ({count})')
+            for line in group['plan']:
+                self.stdout.write(f'  plan   {line}')
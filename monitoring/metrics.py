@@ -0,0 +1,257 @@
+"""Process-shared request metrics with Prometheus text exposition.
+
+Counters and histograms are buffered in memory and flushed (at most every
+``METRICS_CONFIG["FLUSH_INTERVAL"]`` seconds) into a small SQLite file that
+every worker process adds to with UPSERTs, so one scrape of any worker sees
+the totals of all of them. Histograms are stored as per-bucket counts plus
+``_sum``/``_count`` and made cumulative when rendered.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+MIN_FLUSH_INTERVAL = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    sample TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels, sample)
+)
+"""
+UPSERT = """
+INSERT INTO samples (name, labels, sample, value) VALUES (?, ?, ?, ?)
+ON CONFLICT (name, labels, sample) DO UPDATE SET value = value + excluded.value
+"""
+
+
+def metrics_config() -> dict[str, Any]:
+    config = getattr(settings, "METRICS_CONFIG", {})
+    return {
+        "ENABLED": bool(config.get("ENABLED", True)),
+        "PATH": Path(config.get("PATH", settings.BASE_DIR / "var" / "metrics.sqlite3")),
+        "FLUSH_INTERVAL": float(config.get("FLUSH_INTERVAL", 1.0)),
+    }
+
+
+class SharedStore:
+    """
+    Per-process buffer in front of the shared SQLite file.
+
+    Recording a metric only updates the in-memory buffer; a daemon thread
+    writes it to ``PATH`` every ``FLUSH_INTERVAL`` seconds, so requests and
+    the write transactions whose signals record metrics never wait on the
+    file. A flush that fails (the file is locked or ``PATH`` is unwritable)
+    is logged and its increments stay buffered for the next attempt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: dict[tuple[str, str, str], float] = {}
+        self._connection: sqlite3.Connection | None = None
+        self._connection_key: tuple[int, Path] | None = None
+        self._flusher_pid: int | None = None
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        # A connection must not cross fork(), and tests may point PATH elsewhere.
+        key = (os.getpid(), path)
+        if self._connection is None or self._connection_key != key:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            self._connection, self._connection_key = connection, key
+        return self._connection
+
+    def add(self, name: str, labels: dict[str, Any], sample: str, amount: float) -> None:
+        if not metrics_config()["ENABLED"]:
+            return
+        key = (name, json.dumps(sorted((k, str(v)) for k, v in labels.items())), sample)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0.0) + amount
+            start_flusher = self._flusher_pid != os.getpid()  # Threads do not survive fork()
+            if start_flusher:
+                self._flusher_pid = os.getpid()
+        if start_flusher:
+            threading.Thread(target=self._run_flusher, name="metrics-flusher", daemon=True).start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            try:
+                time.sleep(max(metrics_config()["FLUSH_INTERVAL"], MIN_FLUSH_INTERVAL))
+                if self._pending:
+                    self.flush()
+            except Exception:  # Keep flushing whatever goes wrong (e.g. settings torn down).
+                logger.exception("Metrics flusher failed")
+
+    def _take_pending(self) -> dict[tuple[str, str, str], float]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore_pending(self, pending: dict[tuple[str, str, str], float]) -> None:
+        with self._lock:
+            for key, value in pending.items():
+                self._pending[key] = self._pending.get(key, 0.0) + value
+
+    def _flush_io(self, path: Path) -> bool:
+        """Write the buffer to ``path`` (caller holds ``_io_lock``); return whether it succeeded."""
+        pending = self._take_pending()
+        if not pending:
+            return True
+        try:
+            connection = self._connect(path)
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(UPSERT, [(*key, value) for key, value in pending.items()])
+        except (sqlite3.Error, OSError):
+            # Keep the increments for the next attempt rather than losing them.
+            logger.warning("Could not write metrics to %s", path, exc_info=True)
+            self._restore_pending(pending)
+            return False
+        return True
+
+    def flush(self) -> bool:
+        with self._io_lock:
+            return self._flush_io(metrics_config()["PATH"])
+
+    def collect(self) -> list[tuple[str, str, str, float]]:
+        """Flush this process's buffer and return every stored sample."""
+        with self._io_lock:
+            path = metrics_config()["PATH"]
+            self._flush_io(path)
+            return self._connect(path).execute(
+                "SELECT name, labels, sample, value FROM samples ORDER BY name, labels, sample"
+            ).fetchall()
+
+    def reset(self) -> None:
+        """Drop every sample (used by tests)."""
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()
+            self._connect(metrics_config()["PATH"]).execute("DELETE FROM samples")
+
+
+store = SharedStore()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    try:
+        store.flush()
+    except Exception:  # Settings may be gone during shutdown.
+        pass
+
+
+@dataclass(frozen=True)
+class Counter:
+    name: str
+    documentation: str
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        store.add(self.name, labels, "", amount)
+
+
+@dataclass(frozen=True)
+class Histogram:
+    name: str
+    documentation: str
+    buckets: tuple[float, ...]
+    kind = "histogram"
+
+    def observe(self, value: float, **labels) -> None:
+        index = bisect_left(self.buckets, value)
+        bound = _format_bound(self.buckets[index]) if index < len(self.buckets) else "+Inf"
+        store.add(self.name, labels, f"bucket:{bound}", 1)
+        store.add(self.name, labels, "sum", value)
+        store.add(self.name, labels, "count", 1)
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency by view.", LATENCY_BUCKETS)
+REQUEST_DB_QUERIES = Histogram("http_request_db_queries", "Database queries per request by view.", QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = Histogram("http_request_db_duration_seconds", "Time spent in database queries per request by view.", LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size by view.", SIZE_BUCKETS)
+ATTENDANCE_WRITES = Counter("attendance_writes_total", "Attendance records created, updated or deleted.")
+USER_PROVISIONING = Counter("user_provisioning_total", "Login accounts provisioned for new employees.")
+KIOSK_SYNC_EVENTS = Counter("attendance_sync_events_total", "Kiosk sync events by outcome.")
+
+REGISTRY = {
+    metric.name: metric
+    for metric in (
+        REQUEST_LATENCY,
+        REQUEST_DB_QUERIES,
+        REQUEST_DB_TIME,
+        RESPONSE_SIZE,
+        ATTENDANCE_WRITES,
+        USER_PROVISIONING,
+        KIOSK_SYNC_EVENTS,
+    )
+}
+
+
+def _format_bound(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: list[list[str]], extra: tuple[str, str] | None = None) -> str:
+    items = [*pairs, *([extra] if extra else [])]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    grouped: dict[str, dict[str, dict[str, float]]] = {}
+    for name, labels, sample, value in store.collect():
+        grouped.setdefault(name, {}).setdefault(labels, {})[sample] = value
+
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, samples in sorted(grouped.get(name, {}).items()):
+            pairs = json.loads(labels)
+            if metric.kind == "counter":
+                lines.append(f"{name}{_labels(pairs)} {_number(samples.get('', 0))}")
+                continue
+            cumulative = 0.0
+            for bound in [*map(_format_bound, metric.buckets), "+Inf"]:
+                cumulative += samples.get(f"bucket:{bound}", 0)
+                lines.append(f"{name}_bucket{_labels(pairs, ('le', bound))} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(pairs)} {_number(samples.get('sum', 0))}")
+            lines.append(f"{name}_count{_labels(pairs)} {_number(samples.get('count', 0))}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,183 @@
+"""Request instrumentation middleware.
+
+Both middlewares run natively in sync and async stacks, so async views are
+not pushed onto the single thread ``sync_to_async`` uses for sync middleware.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.urls import Resolver404, resolve
+
+from . import metrics, profiling, slowlog
+
+
+def view_name_for(request) -> str:
+    """Resolved URL name (``namespace:name``) of the request, or its view's dotted path."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return "unresolved"
+    return match.view_name or match._func_path
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests with cProfile (see ``monitoring.profiling``).
+
+    Must come after ``AuthenticationMiddleware`` so the staff-only header can be checked.
+    For async views cProfile sees the event loop thread, so a capture may also
+    include other requests served concurrently by that loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = profiling.profiling_config()
+        if not profiling.should_profile(request, config, lambda: view_name_for(request)):
+            return self.get_response(request)
+        profiler = profiling.start()
+        if profiler is None:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        response["X-Profile-Id"] = profiling.save(profiler, self.metadata(request, response, started), config)
+        return response
+
+    async def __acall__(self, request):
+        config = profiling.profiling_config()
+        user = None
+        if request.headers.get(config["HEADER"]) and hasattr(request, "auser"):
+            user = await request.auser()
+        if not profiling.should_profile(request, config, lambda: view_name_for(request), user):
+            return await self.get_response(request)
+        profiler = profiling.start()
+        if profiler is None:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        metadata = self.metadata(request, response, started)
+        response["X-Profile-Id"] = await sync_to_async(profiling.save)(profiler, metadata, config)
+        return response
+
+    @staticmethod
+    def metadata(request, response, started: float) -> dict:
+        return {
+            "view_name": view_name_for(request),  # Resolved by now, so this does not resolve again
+            "method": request.method,
+            "path": request.path,
+            "params": {key: request.GET.getlist(key) for key in request.GET},
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "pid": os.getpid(),
+            "captured_at": time.time(),
+        }
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts queries and sums their wall time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+# The current request's timer. Context variables follow a request into the
+# ``sync_to_async`` threads that run its ORM calls, which a per-request
+# ``connection.execute_wrapper()`` on the event loop thread would not see.
+current_timer: ContextVar = ContextVar("monitoring_query_timer", default=None)
+
+
+def query_timer_wrapper(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs) -> None:
+    """``connection_created`` receiver adding the wrapper once per connection."""
+    if query_timer_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer_wrapper)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, DB query count, DB time and response size per resolved view.
+
+    Place it first in ``MIDDLEWARE`` so the timings cover the whole stack. It
+    also publishes the current request so the slow query log can name the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_token = slowlog.current_request.set(request)
+        timer_token = current_timer.set(QueryTimer())
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            self.record(request, response, time.perf_counter() - started)
+            return response
+        finally:
+            current_timer.reset(timer_token)
+            slowlog.current_request.reset(request_token)
+
+    async def __acall__(self, request):
+        request_token = slowlog.current_request.set(request)
+        timer_token = current_timer.set(QueryTimer())
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+            self.record(request, response, time.perf_counter() - started)
+            return response
+        finally:
+            current_timer.reset(timer_token)
+            slowlog.current_request.reset(request_token)
+
+    def record(self, request, response, elapsed: float) -> None:
+        """Observe the request's metrics (in-memory only, so safe on the event loop)."""
+        if not metrics.metrics_config()["ENABLED"]:
+            return
+        timer = current_timer.get()
+        labels = {"view": view_name_for(request), "method": request.method}
+        metrics.REQUEST_LATENCY.observe(elapsed, **labels)
+        metrics.REQUEST_DB_QUERIES.observe(timer.count, **labels)
+        metrics.REQUEST_DB_TIME.observe(timer.seconds, **labels)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), **labels)
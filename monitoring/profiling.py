@@ -0,0 +1,100 @@
+"""On-demand cProfile capture for individual requests.
+
+A request is profiled when a staff user sends the ``PROFILING_CONFIG["HEADER"]``
+header, or when its resolved view name matches one of ``URL_PATTERNS`` and it
+wins the ``SAMPLE_RATE`` draw. Each capture is a ``.pstats`` file plus a
+``.json`` sidecar with the view name, path, parameters, status and duration.
+The directory is trimmed (oldest first) to ``MAX_BYTES``.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import random
+import re
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def profiling_config() -> dict[str, Any]:
+    """The parsed settings (patterns compiled once; cleared when ``PROFILING_CONFIG`` changes)."""
+    config = getattr(settings, "PROFILING_CONFIG", {})
+    return {
+        "HEADER": config.get("HEADER", "X-Profile"),
+        "URL_PATTERNS": [re.compile(pattern) for pattern in config.get("URL_PATTERNS", [])],
+        "SAMPLE_RATE": float(config.get("SAMPLE_RATE", 0.0)),
+        "DIRECTORY": Path(config.get("DIRECTORY", settings.BASE_DIR / "var" / "profiles")),
+        "MAX_BYTES": int(config.get("MAX_BYTES", 200 * 1024 * 1024)),
+    }
+
+
+def should_profile(request, config: dict[str, Any], view_name: Callable[[], str], user=None) -> bool:
+    """
+    Cheap checks first: ``view_name`` is only called for requests that won the sampling draw.
+
+    Async callers pass ``user`` (from ``request.auser()``) since ``request.user`` queries synchronously.
+    """
+    if request.headers.get(config["HEADER"]):
+        user = user if user is not None else getattr(request, "user", None)
+        return bool(user is not None and user.is_staff)
+    if config["SAMPLE_RATE"] <= 0 or not config["URL_PATTERNS"] or random.random() >= config["SAMPLE_RATE"]:
+        return False
+    name = view_name()
+    return any(pattern.search(name) for pattern in config["URL_PATTERNS"])
+
+
+def start() -> cProfile.Profile | None:
+    """Start a profiler, or return None if another one is already active in this thread."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def save(profiler: cProfile.Profile, metadata: dict[str, Any], config: dict[str, Any]) -> str:
+    """Write the capture and its metadata sidecar; return the capture id."""
+    directory = config["DIRECTORY"]
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_view = re.sub(r"[^A-Za-z0-9_.-]+", "_", metadata["view_name"]) or "unresolved"
+    profile_id = f"{safe_view}.{time.strftime('%Y%m%dT%H%M%S')}.{uuid.uuid4().hex[:8]}"
+    profiler.dump_stats(directory / f"{profile_id}.pstats")
+    (directory / f"{profile_id}.json").write_text(json.dumps({"id": profile_id, **metadata}, default=str))
+    enforce_size_cap(directory, config["MAX_BYTES"])
+    return profile_id
+
+
+def enforce_size_cap(directory: Path, max_bytes: int) -> None:
+    """Delete the oldest captures until the directory fits in ``max_bytes``."""
+    captures = sorted(directory.glob("*.pstats"), key=lambda path: path.stat().st_mtime)
+    sizes = {}
+    for path in captures:
+        sidecar = path.with_suffix(".json")
+        sizes[path] = path.stat().st_size + (sidecar.stat().st_size if sidecar.exists() else 0)
+    total = sum(sizes.values())
+    for path in captures:
+        if total <= max_bytes:
+            break
+        total -= sizes[path]
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+
+def load_captures(directory: Path) -> list[tuple[Path, dict[str, Any]]]:
+    """Return ``(pstats path, metadata)`` for every capture in ``directory``."""
+    captures = []
+    for path in sorted(directory.glob("*.pstats")):
+        sidecar = path.with_suffix(".json")
+        try:
+            metadata = json.loads(sidecar.read_text())
+        except (OSError, ValueError):
+            metadata = {"view_name": path.name.split(".", 1)[0]}
+        captures.append((path, metadata))
+    return captures
@@ -0,0 +1,16 @@
+"""Signal handlers for request and query instrumentation."""
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import middleware, profiling, slowlog
+
+connection_created.connect(slowlog.install, dispatch_uid="monitoring.install_slow_query_log")
+connection_created.connect(middleware.install_query_timer, dispatch_uid="monitoring.install_query_timer")
+
+
+@receiver(setting_changed, dispatch_uid="monitoring.reset_profiling_config")
+def reset_profiling_config(sender, setting, **kwargs):
+    """Drop the cached profiling settings when a test overrides them."""
+    if setting == "PROFILING_CONFIG":
+        profiling.profiling_config.cache_clear()
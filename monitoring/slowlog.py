@@ -0,0 +1,233 @@
+"""Slow query log with the query plan captured when the query ran.
+
+An ``execute_wrapper`` installed on every database connection times each
+statement. Statements slower than ``SLOW_QUERY_CONFIG["THRESHOLD_MS"]`` are
+appended to a size-rotated JSON-lines file with their normalized SQL and
+fingerprint, the shape (not the values) of their parameters, the view and
+project function that issued them, and ``EXPLAIN QUERY PLAN`` output.
+``manage.py slow_queries`` groups the entries by fingerprint.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+current_request: ContextVar = ContextVar("monitoring_current_request", default=None)
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_REPEATED_GROUP = re.compile(r"(\((?:\?\s*,\s*)*\?\))(?:\s*,\s*\1)+")
+_IN_LIST = re.compile(r"\bIN \(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_MONITORING_DIR = str(Path(__file__).resolve().parent)
+
+
+def slow_query_config() -> dict[str, Any]:
+    config = getattr(settings, "SLOW_QUERY_CONFIG", {})
+    return {
+        "ENABLED": bool(config.get("ENABLED", True)),
+        "THRESHOLD_MS": float(config.get("THRESHOLD_MS", 100)),
+        "PATH": Path(config.get("PATH", settings.BASE_DIR / "var" / "slow_queries.jsonl")),
+        "MAX_BYTES": int(config.get("MAX_BYTES", 20 * 1024 * 1024)),
+        "BACKUP_COUNT": int(config.get("BACKUP_COUNT", 3)),
+        "EXPLAIN": bool(config.get("EXPLAIN", True)),
+    }
+
+
+def normalize(sql: str) -> str:
+    """Strip literal values and collapse placeholder lists so equivalent statements compare equal."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _REPEATED_GROUP.sub(r"\1, ...", sql)
+    return _IN_LIST.sub("IN (?, ...)", sql)
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def params_shape(params, many: bool) -> Any:
+    """Type names of the parameters (``{"rows": n, "row": [...]}`` for executemany)."""
+    if many:
+        rows = list(params or [])
+        return {"rows": len(rows), "row": params_shape(rows[0], False) if rows else []}
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+def _caller() -> str:
+    """First project frame (outside Django, third-party packages and this app) that issued the query."""
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base)
+            and "site-packages" not in filename
+            and not filename.startswith(_MONITORING_DIR)
+        ):
+            module = frame.f_globals.get("__name__", filename)
+            return f"{module}.{frame.f_code.co_qualname}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _view() -> str | None:
+    request = current_request.get()
+    if request is None:
+        return None
+    from .middleware import view_name_for
+
+    return view_name_for(request)
+
+
+def _explain(connection, sql: str, params) -> list[str]:
+    if not sql.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return []
+    prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+    try:
+        # A savepoint keeps a failing EXPLAIN from poisoning the caller's transaction.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                return [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError as exc:
+        return [f"EXPLAIN failed: {exc}"]
+
+
+def _rotate(path: Path, backup_count: int) -> None:
+    for index in range(backup_count - 1, 0, -1):
+        source = path.with_name(f"{path.name}.{index}")
+        if source.exists():
+            source.replace(path.with_name(f"{path.name}.{index + 1}"))
+    if backup_count > 0:
+        path.replace(path.with_name(f"{path.name}.1"))
+    else:
+        path.unlink()
+
+
+def write_entry(entry: dict[str, Any], config: dict[str, Any]) -> None:
+    path = config["PATH"]
+    line = json.dumps(entry, default=str) + "\n"
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size + len(line) > config["MAX_BYTES"]:
+            _rotate(path, config["BACKUP_COUNT"])
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+
+def log_files(config: dict[str, Any]) -> list[Path]:
+    """The current log file and its rotated backups, oldest first."""
+    path = config["PATH"]
+    backups = [path.with_name(f"{path.name}.{index}") for index in range(config["BACKUP_COUNT"], 0, -1)]
+    return [candidate for candidate in [*backups, path] if candidate.exists()]
+
+
+def read_entries(config: dict[str, Any]) -> list[dict[str, Any]]:
+    entries = []
+    for path in log_files(config):
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # A line cut short by a concurrent rotation.
+    return entries
+
+
+def _record(sql, params, many, context, elapsed_ms: float, config: dict[str, Any]) -> None:
+    connection = context["connection"]
+    normalized = normalize(sql)
+    write_entry(
+        {
+            "fingerprint": fingerprint(normalized),
+            "sql": normalized,
+            "duration_ms": round(elapsed_ms, 3),
+            "params_shape": params_shape(params, many),
+            "view": _view(),
+            "caller": _caller(),
+            "plan": _explain(connection, sql, params) if config["EXPLAIN"] and not many else [],
+            "database": connection.alias,
+            "logged_at": time.time(),
+        },
+        config,
+    )
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrappers`` hook; see the module docstring."""
+    if getattr(_local, "active", False):
+        return execute(sql, params, many, context)  # Our own EXPLAIN and savepoint queries.
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    config = slow_query_config()
+    if config["ENABLED"] and elapsed_ms >= config["THRESHOLD_MS"]:
+        _local.active = True
+        try:
+            _record(sql, params, many, context, elapsed_ms, config)
+        finally:
+            _local.active = False
+    return result
+
+
+def install(connection, **kwargs) -> None:
+    """``connection_created`` receiver adding the wrapper once per connection."""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
+
+
+def summarize(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Group entries by fingerprint, worst total time first."""
+    groups: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        group = groups.setdefault(
+            entry["fingerprint"],
+            {
+                "fingerprint": entry["fingerprint"],
+                "sql": entry["sql"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "views": {},
+                "callers": {},
+            },
+        )
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        if entry["duration_ms"] >= group["max_ms"]:
+            group["max_ms"] = entry["duration_ms"]
+            group["params_shape"] = entry.get("params_shape")
+        group["plan"] = entry.get("plan", [])  # Most recent plan
+        for key, value in (("views", entry.get("view")), ("callers", entry.get("caller"))):
+            if value:
+                group[key][value] = group[key].get(value, 0) + 1
+    results = []
+    for group in groups.values():
+        group["total_ms"] = round(group["total_ms"], 3)
+        group["mean_ms"] = round(group["total_ms"] / group["count"], 3)
+        group["full_scan"] = any(
+            line.startswith("SCAN ") and " USING " not in line for line in group["plan"]
+        )
+        results.append(group)
+    return sorted(results, key=lambda group: -group["total_ms"])
@@ -0,0 +1,125 @@
+"""Tests for the shared metrics store and the Prometheus endpoint."""
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+from monitoring import metrics
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.config = {"PATH": directory / "metrics.sqlite3", "FLUSH_INTERVAL": 0}
+        override = override_settings(METRICS_CONFIG=self.config)
+        override.enable()
+        self.addCleanup(override.disable)
+        metrics.store.reset()
+        self.employee = Employee.objects.create(
+            first_name="Dorothy",
+            last_name="Vaughan",
+            email="dorothy@example.com",
+            position="Supervisor",
+            department="Computing",
+            date_hired=date(2012, 6, 1),
+        )
+        self.staff = get_user_model().objects.create_user(username="ops", password="pass1234", is_staff=True)
+
+    def scrape(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_endpoint_requires_staff(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/admin/login/", response["Location"])
+
+    def test_request_histograms_are_labelled_by_view(self):
+        self.client.get(reverse("employee-list"))
+        self.client.get(reverse("employee-list"))
+        self.client.get(reverse("reports:headcount"))
+        body = self.scrape()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",view="employee-list",le="+Inf"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",view="reports:headcount"} 1', body)
+        self.assertIn('http_request_db_queries_count{method="GET",view="employee-list"} 2', body)
+        self.assertIn('http_response_size_bytes_count{method="GET",view="employee-list"} 2', body)
+
+    def test_async_views_count_their_queries(self):
+        self.client.get(reverse("reports:async-headcount"))
+        body = self.scrape()
+        self.assertIn('http_request_duration_seconds_count{method="GET",view="reports:async-headcount"} 1', body)
+        self.assertNotIn('http_request_db_queries_sum{method="GET",view="reports:async-headcount"} 0', body)
+
+    async def test_async_views_are_served_concurrently(self):
+        async def slow_summary(organization):
+            await asyncio.sleep(0.3)
+            return {}
+
+        client = AsyncClient()
+        with mock.patch("reports.services.aheadcount_summary", slow_summary):
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get(reverse("reports:async-headcount")) for _ in range(4)))
+            elapsed = time.perf_counter() - started
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertLess(elapsed, 0.9)  # Serialized on one thread this would take at least 1.2s
+
+    def test_domain_counters(self):
+        record = AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 3, 4), status="present")
+        record.status = "late"
+        record.save()
+        record.delete()
+        body = self.scrape()
+        self.assertIn('user_provisioning_total{outcome="created"} 1', body)
+        self.assertIn('attendance_writes_total{operation="created",status="present"} 1', body)
+        self.assertIn('attendance_writes_total{operation="updated",status="late"} 1', body)
+        self.assertIn('attendance_writes_total{operation="deleted",status="late"} 1', body)
+
+    def test_processes_share_one_file(self):
+        other_process = metrics.SharedStore()
+        metrics.ATTENDANCE_WRITES.inc(operation="created", status="present")
+        other_process.add(metrics.ATTENDANCE_WRITES.name, {"operation": "created", "status": "present"}, "", 2)
+        other_process.flush()
+        self.assertIn('attendance_writes_total{operation="created",status="present"} 3', metrics.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.REQUEST_DB_QUERIES
+        for value in (0, 3, 3, 1000):
+            histogram.observe(value, view="sample", method="GET")
+        body = metrics.render()
+        self.assertIn('http_request_db_queries_bucket{method="GET",view="sample",le="0.0"} 1', body)
+        self.assertIn('http_request_db_queries_bucket{method="GET",view="sample",le="5.0"} 3', body)
+        self.assertIn('http_request_db_queries_bucket{method="GET",view="sample",le="500.0"} 3', body)
+        self.assertIn('http_request_db_queries_bucket{method="GET",view="sample",le="+Inf"} 4', body)
+        self.assertIn('http_request_db_queries_sum{method="GET",view="sample"} 1006', body)
+
+    def test_unwritable_store_does_not_fail_saves(self):
+        blocker = self.config["PATH"].parent / "not-a-directory"
+        blocker.write_text("")
+        with self.settings(METRICS_CONFIG={**self.config, "PATH": blocker / "metrics.sqlite3"}):
+            AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 3, 4), status="present")
+            with self.assertLogs("monitoring.metrics", "WARNING"):
+                self.assertFalse(metrics.store.flush())
+        self.assertTrue(AttendanceRecord.objects.exists())
+        # The increments stayed buffered and reach the file once it is writable again.
+        self.assertIn('attendance_writes_total{operation="created",status="present"} 1', metrics.render())
+
+    def test_saves_never_write_the_file(self):
+        callers = []
+        record_caller = lambda path: callers.append(threading.current_thread())  # noqa: E731
+        with mock.patch.object(metrics.store, "_connect", side_effect=record_caller):
+            AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 3, 4), status="present")
+        self.assertNotIn(threading.current_thread(), callers)  # Only the background flusher writes
@@ -0,0 +1,87 @@
+"""Tests for on-demand request profiling."""
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from employees.models import Employee
+from monitoring import profiling
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.settings_override = override_settings(PROFILING_CONFIG={"DIRECTORY": self.directory})
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        Employee.objects.create(
+            first_name="Annie",
+            last_name="Easley",
+            email="annie@example.com",
+            position="Programmer",
+            department="Computing",
+            date_hired=date(2015, 1, 5),
+        )
+        self.url = reverse("performance-top-performers")
+
+    def test_header_only_profiles_staff_requests(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+
+        staff = get_user_model().objects.create_user(username="ops", password="pass1234", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(self.url, {"limit": 3}, HTTP_X_PROFILE="1")
+        profile_id = response["X-Profile-Id"]
+        metadata = json.loads((self.directory / f"{profile_id}.json").read_text())
+        self.assertEqual(metadata["view_name"], "performance-top-performers")
+        self.assertEqual(metadata["params"], {"limit": ["3"]})
+        self.assertTrue((self.directory / f"{profile_id}.pstats").exists())
+
+    async def test_header_profiles_async_views(self):
+        response = await self.async_client.get(reverse("reports:async-headcount"), headers={"X-Profile": "1"})
+        self.assertNotIn("X-Profile-Id", response)
+
+        staff = await get_user_model().objects.acreate_user(username="ops", password="pass1234", is_staff=True)
+        await self.async_client.aforce_login(staff)
+        response = await self.async_client.get(reverse("reports:async-headcount"), headers={"X-Profile": "1"})
+        metadata = json.loads((self.directory / f"{response['X-Profile-Id']}.json").read_text())
+        self.assertEqual(metadata["view_name"], "reports:async-headcount")
+
+    def test_url_patterns_are_sampled(self):
+        config = {"DIRECTORY": self.directory, "URL_PATTERNS": [r"^performance-"], "SAMPLE_RATE": 1.0}
+        with self.settings(PROFILING_CONFIG=config):
+            self.assertIn("X-Profile-Id", self.client.get(self.url))
+            self.assertNotIn("X-Profile-Id", self.client.get(reverse("employee-list")))
+
+    def test_unsampled_requests_skip_view_resolution(self):
+        with mock.patch("monitoring.middleware.resolve") as resolve:
+            self.client.get(self.url, HTTP_X_PROFILE="1")  # Anonymous: header ignored
+        resolve.assert_not_called()
+        self.assertIs(profiling.profiling_config(), profiling.profiling_config())
+
+    def test_size_cap_and_report(self):
+        config = {"DIRECTORY": self.directory, "URL_PATTERNS": ["top-performers"], "SAMPLE_RATE": 1.0}
+        with self.settings(PROFILING_CONFIG=config):
+            for _ in range(3):
+                self.client.get(self.url)
+        self.assertEqual(len(list(self.directory.glob("*.pstats"))), 3)
+
+        out = StringIO()
+        call_command("profile_report", "--json", "--top", "5", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report[0]["view_name"], "performance-top-performers")
+        self.assertEqual(report[0]["profiles"], 3)
+        self.assertLessEqual(len(report[0]["functions"]), 5)
+
+        newest = max(self.directory.glob("*.pstats"), key=lambda path: path.stat().st_mtime)
+        profiling.enforce_size_cap(self.directory, newest.stat().st_size + newest.with_suffix(".json").stat().st_size)
+        self.assertEqual(len(list(self.directory.glob("*.pstats"))), 1)
@@ -0,0 +1,82 @@
+"""Tests for the slow query log."""
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+from monitoring import slowlog
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.path = directory / "slow.jsonl"
+        self.employee = Employee.objects.create(
+            first_name="Mary",
+            last_name="Jackson",
+            email="mary@example.com",
+            position="Engineer",
+            department="Aeronautics",
+            date_hired=date(2014, 9, 1),
+        )
+        AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 5, 6), status="present")
+
+    def log_everything(self, **extra):
+        return override_settings(SLOW_QUERY_CONFIG={"THRESHOLD_MS": 0, "PATH": self.path, **extra})
+
+    def test_wrapper_is_installed_on_connections(self):
+        connection.ensure_connection()
+        self.assertIn(slowlog.slow_query_wrapper, connection.execute_wrappers)
+
+    def test_normalize_collapses_literals_and_lists(self):
+        first = slowlog.normalize('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = \'x\' LIMIT 21')
+        second = slowlog.normalize('SELECT * FROM "t" WHERE "id" IN (%s) AND "name" = \'y\'  LIMIT 5')
+        self.assertEqual(first, 'SELECT * FROM "t" WHERE "id" IN (?, ...) AND "name" = ? LIMIT ?')
+        self.assertEqual(slowlog.fingerprint(first), slowlog.fingerprint(second))
+        self.assertEqual(
+            slowlog.normalize('INSERT INTO "t" VALUES (%s, %s), (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" VALUES (?, ?), ...',
+        )
+
+    def test_entries_capture_view_caller_and_plan(self):
+        with self.log_everything():
+            response = self.client.get(reverse("attendance-list"), {"status": "present", "ordering": "-date"})
+        self.assertEqual(response.status_code, 200)
+        entries = [json.loads(line) for line in self.path.read_text().splitlines()]
+        listing = next(entry for entry in entries if entry["sql"].startswith("SELECT") and "LIMIT" in entry["sql"])
+        self.assertEqual(listing["view"], "attendance-list")
+        self.assertIn("str", listing["params_shape"])
+        self.assertNotIn("present", json.dumps(listing))
+        self.assertTrue(listing["plan"])
+        self.assertEqual(len(listing["fingerprint"]), 16)
+
+        out = StringIO()
+        with self.log_everything():
+            call_command("slow_queries", "--json", "--view", "attendance-list", stdout=out)
+        groups = json.loads(out.getvalue())
+        self.assertEqual(groups, sorted(groups, key=lambda group: -group["total_ms"]))
+        self.assertIn(listing["fingerprint"], {group["fingerprint"] for group in groups})
+
+    def test_threshold_and_rotation(self):
+        with override_settings(SLOW_QUERY_CONFIG={"THRESHOLD_MS": 10_000, "PATH": self.path}):
+            list(Employee.objects.all())
+        self.assertFalse(self.path.exists())
+
+        with self.log_everything(MAX_BYTES=2000, BACKUP_COUNT=1, EXPLAIN=False):
+            for _ in range(10):
+                list(Employee.objects.all())
+            config = slowlog.slow_query_config()
+        self.assertTrue(self.path.with_name("slow.jsonl.1").exists())
+        self.assertFalse(self.path.with_name("slow.jsonl.2").exists())
+        self.assertLessEqual(self.path.stat().st_size, 2000)
+        self.assertEqual(slowlog.log_files(config)[-1], self.path)
@@ -0,0 +1,11 @@
+"""Internal monitoring endpoints."""
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+from . import metrics
+
+
+@staff_member_required
+def metrics_view(request):
+    """Prometheus scrape target; staff only (scrape with a staff session or through the admin)."""
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
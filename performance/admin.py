@@ -1,10 +1,40 @@
+from decimal import Decimal
+
 from django.contrib import admin
 
+from core.admin_tools import ScalableAdminMixin
+
 from .models import PerformanceReview
 
 
+class RatingBandFilter(admin.SimpleListFilter):
+    """Fixed rating bands; ``list_filter = ("rating",)`` would SELECT DISTINCT over every review."""
+
+    title = "rating"
+    parameter_name = "rating_band"
+    bands = {  # value: (label, lower bound, upper bound)
+        "below-2": ("Below 2", None, Decimal("2")),
+        "2-3": ("2 to 3", Decimal("2"), Decimal("3")),
+        "3-4": ("3 to 4", Decimal("3"), Decimal("4")),
+        "4-plus": ("4 and above", Decimal("4"), None),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, (label, _, _) in self.bands.items()]
+
+    def queryset(self, request, queryset):
+        if self.value() not in self.bands:
+            return queryset
+        _, low, high = self.bands[self.value()]
+        if low is not None:
+            queryset = queryset.filter(rating__gte=low)
+        if high is not None:
+            queryset = queryset.filter(rating__lt=high)
+        return queryset
+
+
 @admin.register(PerformanceReview)
-class PerformanceReviewAdmin(admin.ModelAdmin):
+class PerformanceReviewAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "employee",
@@ -13,5 +43,8 @@ class PerformanceReviewAdmin(admin.ModelAdmin):
         "reviewer_name",
         "rating",
     )
-    search_fields = ("employee__first_name", "employee__last_name", "reviewer_name")
-    list_filter = ("review_period_end", "rating")
+    list_select_related = ("employee",)
+    search_fields = ("employee__last_name", "employee__first_name", "reviewer_name")
+    list_filter = (RatingBandFilter,)
+    date_hierarchy = "review_period_end"
+    autocomplete_fields = ("employee",)
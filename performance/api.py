@@ -5,6 +5,10 @@ from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.changefeed import ChangeFeedMixin
+from core.fastpath import FastReadMixin
+from employees.models import full_name_expression
+
 from .models import PerformanceReview
 from .serializers import PerformanceReviewSerializer
 
@@ -22,11 +26,12 @@ class PerformanceReviewFilter(django_filters.FilterSet):
         }
 
 
-class PerformanceReviewViewSet(viewsets.ModelViewSet):
+class PerformanceReviewViewSet(ChangeFeedMixin, FastReadMixin, viewsets.ModelViewSet):
     queryset = PerformanceReview.objects.select_related("employee")
     serializer_class = PerformanceReviewSerializer
     filterset_class = PerformanceReviewFilter
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    fast_read_annotations = {"employee_name": full_name_expression("employee__")}
     search_fields = [
         "employee__first_name",
         "employee__last_name",
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PerformanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "performance"
+
+    def ready(self):
+        import performance.signals  # noqa: F401  Registers the rating histogram handlers.
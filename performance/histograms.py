@@ -0,0 +1,181 @@
+"""Per-department monthly rating histograms.
+
+``RatingHistogram`` counts reviews per exact rating (in hundredths) for every
+department and month the review period ended in. The signal handlers adjust
+one bucket per review write, and histograms over any departments and months
+merge by adding counts, so distributions and percentiles over years of
+reviews read a few small rows and never sort the reviews themselves.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Iterable
+
+from django.db import transaction
+
+from employees.models import Employee
+
+from .models import PerformanceReview, RatingHistogram
+
+SCALE = 100  # Ratings have two decimal places
+PERCENTILES = (10, 50, 90)
+
+# {rating in hundredths: review count}
+Buckets = Counter[int]
+
+
+def bucket(rating) -> int:
+    return int(Decimal(str(rating)) * SCALE)
+
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def department_of(employee_id: int) -> int:
+    return Employee.objects.filter(pk=employee_id).values_list("department_id", flat=True).get()
+
+
+def apply(department_id: int, month: date, deltas: dict[int, int]) -> None:
+    """Add ``deltas`` to one department's histogram for ``month`` (empty histograms are deleted)."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # No savepoint: this runs inside the review's own save transaction, and any error aborts both.
+    with transaction.atomic(savepoint=False):
+        row = RatingHistogram.objects.select_for_update().filter(department_id=department_id, month=month).first()
+        if row is None:
+            row = RatingHistogram(department_id=department_id, month=month)
+        counts = Counter({int(key): count for key, count in row.counts.items()})
+        for key, delta in deltas.items():
+            counts[key] += delta
+        row.counts = {str(key): count for key, count in sorted(counts.items()) if count > 0}
+        if row.counts:
+            row.save()
+        elif row.pk is not None:
+            row.delete()
+
+
+def record_review(department_id: int, review_period_end: date, rating) -> None:
+    apply(department_id, month_of(review_period_end), {bucket(rating): 1})
+
+
+def retract_review(department_id: int, review_period_end: date, rating) -> None:
+    apply(department_id, month_of(review_period_end), {bucket(rating): -1})
+
+
+def move_employee(employee_id: int, old_department_id: int, new_department_id: int) -> None:
+    """Move an employee's reviews to their new department's histograms."""
+    moved: dict[date, Counter] = defaultdict(Counter)
+    for review_period_end, rating in PerformanceReview.objects.filter(employee_id=employee_id).values_list(
+        "review_period_end", "rating"
+    ):
+        moved[month_of(review_period_end)][bucket(rating)] += 1
+    for month, counts in moved.items():
+        apply(old_department_id, month, {key: -count for key, count in counts.items()})
+        apply(new_department_id, month, dict(counts))
+
+
+def histogram_rows(start: date, end: date):
+    """``(department name, month, counts)`` for the months from ``start`` to ``end``."""
+    return (
+        RatingHistogram.objects.filter(month__range=(month_of(start), month_of(end)))
+        .order_by()
+        .values_list("department__name", "month", "counts")
+    )
+
+
+def merge(histograms: Iterable[dict[str, int]]) -> Buckets:
+    merged = Counter()
+    for counts in histograms:
+        for key, count in counts.items():
+            merged[int(key)] += count
+    return merged
+
+
+def percentile(keys: list[int], cumulative: list[int], p: float) -> float:
+    """The ``p``-th percentile, interpolating between the closest ranks (like ``numpy.percentile``)."""
+    rank = (cumulative[-1] - 1) * p / 100
+    lower = int(rank)
+
+    def value_at(position: int) -> int:
+        return keys[bisect_right(cumulative, position)]
+
+    low = value_at(lower)
+    high = value_at(min(lower + 1, cumulative[-1] - 1))
+    return (low + (high - low) * (rank - lower)) / SCALE
+
+
+def describe(counts: Buckets) -> dict[str, Any]:
+    """Review count, average, percentiles and the non-empty buckets of a merged histogram."""
+    keys = sorted(key for key, count in counts.items() if count > 0)
+    if not keys:
+        return {
+            "review_count": 0,
+            "average_rating": None,
+            **{f"p{p}": None for p in PERCENTILES},
+            "histogram": [],
+        }
+    cumulative = list(accumulate(counts[key] for key in keys))
+    total = cumulative[-1]
+    return {
+        "review_count": total,
+        "average_rating": round(sum(key * counts[key] for key in keys) / total / SCALE, 2),
+        **{f"p{p}": round(percentile(keys, cumulative, p), 2) for p in PERCENTILES},
+        "histogram": [{"rating": f"{Decimal(key).scaleb(-2):.2f}", "count": counts[key]} for key in keys],
+    }
+
+
+def expected_histograms(queryset=None) -> dict[tuple[int, date], Buckets]:
+    """Histograms computed from ``PerformanceReview`` rows, keyed by ``(department_id, month)``."""
+    queryset = PerformanceReview.objects.all() if queryset is None else queryset
+    expected: dict[tuple[int, date], Buckets] = defaultdict(Counter)
+    rows = queryset.order_by().values_list("employee__department_id", "review_period_end", "rating")
+    for department_id, review_period_end, rating in rows.iterator(chunk_size=5000):
+        expected[(department_id, month_of(review_period_end))][bucket(rating)] += 1
+    return expected
+
+
+def check() -> list[dict[str, Any]]:
+    """Compare stored histograms with ``PerformanceReview``; return one entry per mismatching department/month."""
+    expected = expected_histograms()
+    stored = {
+        (department_id, month): merge([counts])
+        for department_id, month, counts in RatingHistogram.objects.values_list("department_id", "month", "counts")
+    }
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want, have = expected.get(key, Counter()), stored.get(key, Counter())
+        if want != have:
+            mismatches.append(
+                {
+                    "department_id": key[0],
+                    "month": key[1].isoformat(),
+                    "expected_reviews": want.total(),
+                    "stored_reviews": have.total(),
+                }
+            )
+    return mismatches
+
+
+def rebuild() -> int:
+    """Recompute every histogram from ``PerformanceReview``; return the number of rows written."""
+    with transaction.atomic():
+        # Lock the rows first: review writes in flight either commit before the read below or
+        # wait and then apply their change to the rebuilt rows.
+        list(RatingHistogram.objects.select_for_update().values_list("pk", flat=True))
+        rows = [
+            RatingHistogram(
+                department_id=department_id,
+                month=month,
+                counts={str(key): count for key, count in sorted(counts.items())},
+            )
+            for (department_id, month), counts in expected_histograms().items()
+        ]
+        RatingHistogram.objects.all().delete()
+        RatingHistogram.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
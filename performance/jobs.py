@@ -0,0 +1,11 @@
+"""Scheduled performance maintenance."""
+from core.scheduler import job
+
+from . import histograms
+
+
+@job("45 2 * * 0", lock_ttl=4 * 3600)
+def repair_rating_histograms():
+    """Weekly consistency check of the rating histograms; rebuilds them if any drifted."""
+    if histograms.check():
+        histograms.rebuild()
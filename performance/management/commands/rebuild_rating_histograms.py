@@ -0,0 +1,28 @@
+"""Management command to rebuild or verify the department rating histograms."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from performance import histograms
+
+
+class Command(BaseCommand):
+    help = 'Rebuild rating histograms from PerformanceReview, or --check them for drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compare the histograms with PerformanceReview without changing them; fail on mismatches',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = histograms.check()
+            if mismatches:
+                self.stdout.write(json.dumps(mismatches, indent=2))
+                raise CommandError(f'{len(mismatches)} department-months have histograms that disagree with their reviews.')
+            self.stdout.write(self.style.SUCCESS('Rating histograms match PerformanceReview.'))
+            return
+        written = histograms.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} rating histograms.'))
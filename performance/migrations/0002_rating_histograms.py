@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:16
+
+import django.db.models.deletion
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def build_histograms(apps, schema_editor):
+    """Fill the histograms from existing performance reviews."""
+    PerformanceReview = apps.get_model('performance', 'PerformanceReview')
+    RatingHistogram = apps.get_model('performance', 'RatingHistogram')
+    histograms = defaultdict(Counter)
+    rows = PerformanceReview.objects.order_by().values_list('employee__department_id', 'review_period_end', 'rating')
+    for department_id, review_period_end, rating in rows.iterator(chunk_size=5000):
+        histograms[(department_id, review_period_end.replace(day=1))][int(Decimal(str(rating)) * 100)] += 1
+    RatingHistogram.objects.bulk_create(
+        (
+            RatingHistogram(
+                department_id=department_id,
+                month=month,
+                counts={str(key): count for key, count in sorted(counts.items())},
+            )
+            for (department_id, month), counts in histograms.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_name_index'),
+        ('performance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('counts', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_histograms', to='employees.department')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month'], name='performance_month_07fb27_idx')],
+                'constraints': [models.UniqueConstraint(fields=('department', 'month'), name='rating_histogram_unique_department_month')],
+            },
+        ),
+        migrations.RunPython(build_histograms, migrations.RunPython.noop),
+    ]
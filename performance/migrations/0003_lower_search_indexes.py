@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_lower_search_indexes'),
+        ('performance', '0002_rating_histograms'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='performancereview',
+            index=models.Index(django.db.models.functions.text.Lower('reviewer_name'), name='review_reviewer_lower_idx'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 """Performance management models."""
 from django.db import models
+from django.db.models.functions import Lower
 
+from core.models import AtomicSaveMixin
 
-class PerformanceReview(models.Model):
+
+class PerformanceReview(AtomicSaveMixin, models.Model):
     """Stores structured performance review data for an employee."""
 
     employee = models.ForeignKey("employees.Employee", on_delete=models.CASCADE, related_name="performance_reviews")
@@ -22,7 +25,56 @@ class PerformanceReview(models.Model):
         indexes = [
             models.Index(fields=["employee", "review_period_end"]),
             models.Index(fields=["review_period_start", "review_period_end"]),
+            models.Index(Lower("reviewer_name"), name="review_reviewer_lower_idx"),  # Admin prefix search
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded values so the rating histograms can retract the review's old bucket."""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def _remember_loaded_values(self):
+        self._loaded_values = {
+            name: self.__dict__.get(name) for name in ("employee_id", "review_period_end", "rating")
+        }
+
+    def save(self, *args, **kwargs):
+        """Save, then refresh ``_loaded_values`` (every ``post_save`` handler sees the values before this save)."""
+        super().save(*args, **kwargs)
+        self._remember_loaded_values()
+
     def __str__(self) -> str:
         return f"Review {self.review_period_start} - {self.review_period_end} for {self.employee}"
+
+
+class RatingHistogram(models.Model):
+    """
+    Review ratings of one department for one month, as a count per rating.
+
+    ``counts`` maps a rating in hundredths (``"450"`` for 4.50) to the number
+    of reviews with that rating whose period ended in ``month``; a
+    ``DecimalField(3, 2)`` has at most 1,999 distinct values, so the buckets
+    are exact. Histograms for any set of departments and months add up into
+    one, which gives rating distributions and percentiles without sorting
+    reviews (see ``performance.histograms``).
+    """
+
+    department = models.ForeignKey(
+        "employees.Department",
+        on_delete=models.CASCADE,
+        related_name="rating_histograms",
+    )
+    month = models.DateField(help_text="First day of the month")
+    counts = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["department", "month"], name="rating_histogram_unique_department_month")
+        ]
+        indexes = [models.Index(fields=["month"])]
+
+    def __str__(self) -> str:
+        return f"{self.department} {self.month:%Y-%m} ratings"
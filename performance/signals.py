@@ -0,0 +1,67 @@
+"""Signal handlers that keep the department rating histograms in step with reviews."""
+from collections import Counter, defaultdict
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from attendance.alerts import coerce_date
+from employees.models import Employee
+
+from . import histograms
+from .models import PerformanceReview
+
+
+def _department_id(review: PerformanceReview) -> int:
+    if PerformanceReview.employee.is_cached(review):
+        return review.employee.department_id
+    return histograms.department_of(review.employee_id)
+
+
+@receiver(post_save, sender=PerformanceReview)
+def update_rating_histogram(sender, instance, created, raw=False, **kwargs):
+    """Count the review in its department's histogram, retracting the values it was loaded with."""
+    if raw:
+        return  # Fixture loads: run `manage.py rebuild_rating_histograms` afterwards.
+    loaded = getattr(instance, "_loaded_values", None)  # Refreshed by PerformanceReview.save() afterwards
+    if loaded is None and not created:
+        return  # Saved without being loaded first; the weekly repair job reconciles it.
+    current = {
+        "employee_id": instance.employee_id,
+        "review_period_end": coerce_date(instance.review_period_end),
+        "rating": histograms.bucket(instance.rating),
+    }
+    department_id = None
+    changes = defaultdict(Counter)
+    if loaded is not None:
+        previous = {
+            **loaded,
+            "review_period_end": coerce_date(loaded["review_period_end"]),
+            "rating": histograms.bucket(loaded["rating"]),
+        }
+        if previous == current:
+            return
+        department_id = _department_id(instance)
+        previous_department_id = (
+            department_id
+            if previous["employee_id"] == instance.employee_id
+            else histograms.department_of(previous["employee_id"])
+        )
+        changes[(previous_department_id, histograms.month_of(previous["review_period_end"]))][previous["rating"]] -= 1
+    department_id = department_id or _department_id(instance)
+    changes[(department_id, histograms.month_of(current["review_period_end"]))][current["rating"]] += 1
+    for (change_department_id, month), deltas in changes.items():
+        histograms.apply(change_department_id, month, deltas)
+
+
+@receiver(post_delete, sender=PerformanceReview)
+def retract_rating(sender, instance, **kwargs):
+    histograms.retract_review(_department_id(instance), coerce_date(instance.review_period_end), instance.rating)
+
+
+@receiver(post_save, sender=Employee)
+def move_rating_histograms(sender, instance, created, raw=False, **kwargs):
+    """Move an employee's reviews to their new department's histograms."""
+    previous = getattr(instance, "_loaded_department_id", None)
+    if not raw and not created and previous is not None and previous != instance.department_id:
+        histograms.move_employee(instance.pk, previous, instance.department_id)
+    instance._loaded_department_id = instance.department_id
@@ -1,11 +1,13 @@
 """API tests for performance endpoints."""
 from datetime import date
+from unittest import mock
 
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from employees.models import Employee
+from performance.api import PerformanceReviewViewSet
 from performance.models import PerformanceReview
 
 
@@ -38,3 +40,23 @@ class PerformanceAPITests(APITestCase):
         response = self.client.get(url, {"limit": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
+
+    def test_fast_read_path_matches_serializer_output(self):
+        review = PerformanceReview.objects.create(
+            employee=self.employee,
+            review_period_start=date(2023, 7, 1),
+            review_period_end=date(2023, 12, 31),
+            reviewer_name="Director",
+            rating=3.5,
+            strengths="Modelling",
+        )
+        for url in (
+            reverse("performance-list"),
+            reverse("performance-list") + "?ordering=rating",
+            reverse("performance-detail", kwargs={"pk": review.pk}),
+        ):
+            fast = self.client.get(url)
+            with mock.patch.object(PerformanceReviewViewSet, "fast_read_enabled", False):
+                slow = self.client.get(url)
+            self.assertEqual(fast.status_code, status.HTTP_200_OK)
+            self.assertEqual(fast.content, slow.content)
@@ -0,0 +1,129 @@
+"""Tests for the department rating histograms and the distribution report."""
+import statistics
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from employees.models import Department, Employee
+from performance import histograms
+from performance.models import PerformanceReview, RatingHistogram
+
+
+def _employee(name, department):
+    return Employee.objects.create(
+        first_name=name,
+        last_name="Tester",
+        email=f"{name.lower()}@example.com",
+        position="Engineer",
+        department=department,
+        date_hired=date(2019, 1, 7),
+    )
+
+
+def _review(employee, end, rating):
+    return PerformanceReview.objects.create(
+        employee=employee,
+        review_period_start=end.replace(day=1),
+        review_period_end=end,
+        reviewer_name="Manager",
+        rating=rating,
+    )
+
+
+class RatingHistogramTests(TestCase):
+    def setUp(self):
+        self.ada = _employee("Ada", "Engineering")
+        self.grace = _employee("Grace", "Finance")
+
+    def counts(self, employee, month):
+        row = RatingHistogram.objects.filter(department_id=employee.department_id, month=month).first()
+        return row.counts if row else {}
+
+    def test_review_writes_move_single_buckets(self):
+        review = _review(self.ada, date(2024, 3, 31), 4.5)
+        _review(self.ada, date(2024, 3, 15), Decimal("4.50"))
+        self.assertEqual(self.counts(self.ada, date(2024, 3, 1)), {"450": 2})
+
+        review = PerformanceReview.objects.get(pk=review.pk)
+        review.rating = Decimal("3.25")
+        review.save()
+        self.assertEqual(self.counts(self.ada, date(2024, 3, 1)), {"325": 1, "450": 1})
+
+        review.review_period_end = date(2024, 4, 30)
+        review.employee = self.grace
+        review.save()
+        self.assertEqual(self.counts(self.ada, date(2024, 3, 1)), {"450": 1})
+        self.assertEqual(self.counts(self.grace, date(2024, 4, 1)), {"325": 1})
+
+        review.delete()
+        self.assertFalse(RatingHistogram.objects.filter(department_id=self.grace.department_id).exists())
+        self.assertEqual(histograms.check(), [])
+
+    def test_department_change_moves_reviews(self):
+        _review(self.ada, date(2024, 3, 31), 4)
+        _review(self.ada, date(2024, 6, 30), 5)
+        ada = Employee.objects.get(pk=self.ada.pk)
+        ada.department = Department.objects.intern("Finance")
+        ada.save()
+        self.assertFalse(RatingHistogram.objects.filter(department__name="Engineering").exists())
+        self.assertEqual(self.counts(self.grace, date(2024, 6, 1)), {"500": 1})
+        self.assertEqual(histograms.check(), [])
+
+    def test_percentiles_match_sorting_the_ratings(self):
+        ratings = [Decimal("1.00"), Decimal("2.75"), Decimal("3.10"), Decimal("3.10"), Decimal("4.00"), Decimal("4.95")]
+        counts = histograms.merge([{str(histograms.bucket(rating)): 1} for rating in ratings])
+        described = histograms.describe(counts)
+        cut_points = statistics.quantiles([float(rating) for rating in ratings], n=10, method="inclusive")
+        self.assertEqual(described["review_count"], 6)
+        self.assertEqual(described["average_rating"], round(float(sum(ratings)) / 6, 2))
+        self.assertEqual(
+            (described["p10"], described["p50"], described["p90"]),
+            (round(cut_points[0], 2), round(cut_points[4], 2), round(cut_points[8], 2)),
+        )
+        self.assertEqual(described["histogram"][2], {"rating": "3.10", "count": 2})
+        self.assertEqual(histograms.describe(histograms.merge([]))["p50"], None)
+
+    def test_check_and_rebuild(self):
+        _review(self.ada, date(2024, 3, 31), 4)
+        PerformanceReview.objects.filter(employee=self.ada).update(rating=2)  # Bypasses the signals
+        self.assertEqual(len(histograms.check()), 1)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_rating_histograms", "--check", stdout=StringIO())
+        call_command("rebuild_rating_histograms", stdout=StringIO())
+        self.assertEqual(self.counts(self.ada, date(2024, 3, 1)), {"200": 1})
+        call_command("rebuild_rating_histograms", "--check", stdout=StringIO())
+
+
+class RatingDistributionAPITests(APITestCase):
+    def setUp(self):
+        ada, grace = _employee("Ada", "Engineering"), _employee("Grace", "Finance")
+        for end, rating in [(date(2023, 2, 28), 3), (date(2023, 5, 31), 4), (date(2024, 1, 31), 5)]:
+            _review(ada, end, rating)
+        _review(grace, date(2023, 2, 28), 2)
+        self.url = reverse("reports:performance-distribution")
+
+    def test_distribution_per_department_and_quarter(self):
+        response = self.client.get(self.url, {"start": "2023-01", "end": "2024-Q1", "interval": "quarter"})
+        self.assertEqual(response.status_code, 200)
+        periods = {period["period"]: period for period in response.data["periods"]}
+        self.assertEqual(list(periods), ["2023-Q1", "2023-Q2", "2024-Q1"])
+        first = periods["2023-Q1"]
+        self.assertEqual((first["overall"]["review_count"], first["overall"]["p50"]), (2, 2.5))
+        self.assertEqual([row["department"] for row in first["departments"]], ["Engineering", "Finance"])
+        self.assertEqual(first["departments"][1]["histogram"], [{"rating": "2.00", "count": 1}])
+
+    def test_whole_range_and_department_filter(self):
+        response = self.client.get(self.url, {"period": "2023-Q1", "department": "Engineering"})
+        (period,) = response.data["periods"]
+        self.assertEqual(period["period"], "2023-01/2023-03")
+        self.assertEqual(period["overall"]["review_count"], 1)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"interval": "week"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "2023-13"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "2024-01", "end": "2023-01"}).status_code, 400)
@@ -0,0 +1,32 @@
+"""Scheduled precomputation of reports, so requests read snapshots instead of aggregating."""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.scheduler import job
+
+from . import services, timesheets
+from .models import ReportSnapshot
+
+
+def _previous_periods() -> list[str]:
+    """Last month and last quarter as ``YYYY-MM`` / ``YYYY-Qn`` period keys."""
+    today = timezone.localdate()
+    last_month = today.replace(day=1) - timedelta(days=1)
+    quarter_start = today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+    last_quarter = quarter_start - timedelta(days=1)
+    return [f"{last_month:%Y-%m}", f"{last_quarter.year}-Q{(last_quarter.month - 1) // 3 + 1}"]
+
+
+@job("30 0 1 * *")
+def close_timesheet_month():
+    """Snapshot the month that just ended."""
+    timesheets.close_month(timezone.localdate().replace(day=1) - timedelta(days=1))
+
+
+@job("5 * * * *")
+def refresh_period_reports():
+    """Store (or re-version, after late edits) last month's and last quarter's summaries."""
+    for kind in ReportSnapshot.Kind.values:
+        for period in _previous_periods():
+            services.period_report(kind, period)
@@ -0,0 +1,28 @@
+"""Management command that snapshots a finished month's timesheets."""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reports import timesheets
+
+
+class Command(BaseCommand):
+    help = 'Close a month: persist its timesheets so they are served from snapshots from now on'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='Month to close as YYYY-MM (default: the previous month)')
+
+    def handle(self, *args, **options):
+        this_month = timezone.localdate().replace(day=1)
+        if options['month']:
+            try:
+                month = date.fromisoformat(f"{options['month']}-01")
+            except ValueError as exc:
+                raise CommandError('--month must look like YYYY-MM.') from exc
+        else:
+            month = (this_month - timedelta(days=1)).replace(day=1)
+        if month >= this_month:
+            raise CommandError('Only months that have already ended can be closed.')
+        snapshots = timesheets.close_month(month)
+        self.stdout.write(self.style.SUCCESS(f'Closed {month:%Y-%m}: {len(snapshots)} timesheet snapshots stored.'))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:37
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimesheetSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('group_by', models.CharField(max_length=20)),
+                ('period', models.CharField(max_length=10)),
+                ('rows', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-month', 'group_by', 'period'],
+                'constraints': [models.UniqueConstraint(fields=('month', 'group_by', 'period'), name='unique_timesheet_snapshot')],
+            },
+        ),
+    ]
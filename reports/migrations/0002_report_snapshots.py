@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:39
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('attendance', 'Attendance'), ('performance', 'Performance')], max_length=20)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('invalidated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['kind', '-period_start', '-version'],
+                'indexes': [models.Index(fields=['kind', 'period_start', 'period_end'], name='reports_rep_kind_b265df_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'period_start', 'period_end', 'version'), name='unique_report_snapshot_version')],
+            },
+        ),
+    ]
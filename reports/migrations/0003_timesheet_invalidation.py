@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_report_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timesheetsnapshot',
+            name='invalidated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_timesheet_invalidation'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='timesheetsnapshot',
+            options={'ordering': ['-month', 'group_by', 'period', '-version']},
+        ),
+        migrations.RemoveConstraint(
+            model_name='timesheetsnapshot',
+            name='unique_timesheet_snapshot',
+        ),
+        migrations.AddField(
+            model_name='timesheetsnapshot',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddConstraint(
+            model_name='timesheetsnapshot',
+            constraint=models.UniqueConstraint(fields=('month', 'group_by', 'period', 'version'), name='unique_timesheet_snapshot_version'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+"""Persisted reporting results."""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class TimesheetSnapshot(models.Model):
+    """
+    Timesheet of a closed calendar month.
+
+    One row per month, grouping (employee or department), period size and
+    version. Writes to the month's attendance records mark the current version
+    invalidated; the next read stores ``version + 1``, so earlier versions stay
+    available for audit.
+    """
+
+    month = models.DateField()  # First day of the month
+    group_by = models.CharField(max_length=20)
+    period = models.CharField(max_length=10)
+    version = models.PositiveIntegerField(default=1)
+    rows = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    invalidated_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-month", "group_by", "period", "-version"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "group_by", "period", "version"], name="unique_timesheet_snapshot_version"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Timesheet {self.month:%Y-%m} by {self.group_by}/{self.period} v{self.version}"
+
+
+class ReportSnapshot(models.Model):
+    """
+    Stored result of a report over a closed month or quarter.
+
+    Writes to records dated inside the period mark the current version
+    invalidated; the next request computes and stores ``version + 1``, so
+    earlier versions stay available for audit.
+    """
+
+    class Kind(models.TextChoices):
+        ATTENDANCE = "attendance", "Attendance"
+        PERFORMANCE = "performance", "Performance"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    version = models.PositiveIntegerField(default=1)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    invalidated_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["kind", "-period_start", "-version"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "period_start", "period_end", "version"], name="unique_report_snapshot_version"
+            ),
+        ]
+        indexes = [models.Index(fields=["kind", "period_start", "period_end"])]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.period_start}..{self.period_end} v{self.version}"
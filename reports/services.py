@@ -1,19 +1,29 @@
 """Domain services for analytics and reporting."""
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass
+import asyncio
+import calendar
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import date, timedelta
 from typing import Any
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
 from django.db.models import Avg, Count, Max, Q
 from django.utils import timezone
 
+from attendance import bitmaps
 from attendance.models import AttendanceRecord
-from employees.models import Employee
+from employees.models import Department, Employee
+from performance import histograms
 from performance.models import PerformanceReview
 
+from .models import ReportSnapshot
+
 
 @dataclass
 class AttendanceSummary:
@@ -40,38 +50,74 @@ def _reporting_config() -> dict[str, Any]:
     return getattr(settings, "REPORTING_CONFIG", {})
 
 
-def headcount_summary() -> dict[str, Any]:
-    """Compute current headcount distribution across the organization."""
-    employees = Employee.objects.all()
-    totals = employees.aggregate(
+def _in_org(queryset, org: int | None, prefix: str = ""):
+    """
+    Restrict ``queryset`` to the org of manager ``org`` (the manager included).
+
+    One join against the ``OrgClosure`` table, so a VP's whole org costs about
+    the same as a department filter.
+    """
+    if org is None:
+        return queryset
+    return queryset.filter(**{f"{prefix}ancestor_links__ancestor_id": org})
+
+
+def _headcount_queries(org: int | None = None):
+    employees = _in_org(Employee.objects.all(), org)
+    totals = dict(
         total=Count("id"),
         active=Count("id", filter=Q(status=Employee.EmploymentStatus.ACTIVE)),
         on_leave=Count("id", filter=Q(status=Employee.EmploymentStatus.ON_LEAVE)),
         terminated=Count("id", filter=Q(status=Employee.EmploymentStatus.TERMINATED)),
     )
+    # Group on the integer key; names come from the (small) Department table.
     by_department = (
-        employees.values("department")
+        employees.values("department_id")
         .annotate(
             total=Count("id"),
             active=Count("id", filter=Q(status=Employee.EmploymentStatus.ACTIVE)),
         )
-        .order_by("department")
+        .order_by()
+    )
+    department_names = Department.objects.values_list("id", "name")
+    return employees, totals, by_department, department_names
+
+
+def _build_by_department(rows, department_names) -> list[dict[str, Any]]:
+    names = dict(department_names)
+    return sorted(
+        (
+            {"department_id": row["department_id"], "department": names.get(row["department_id"]), **row}
+            for row in rows
+        ),
+        key=lambda item: (item["department"] or "", item["department_id"]),
     )
+
+
+def headcount_summary(org: int | None = None) -> dict[str, Any]:
+    """Compute current headcount distribution across the organization (or one manager's org)."""
+    employees, totals, by_department, department_names = _headcount_queries(org)
     return {
-        "totals": totals,
-        "by_department": list(by_department),
+        "totals": employees.aggregate(**totals),
+        "by_department": _build_by_department(by_department, department_names),
     }
 
 
-def attendance_summary(days: int | None = None) -> AttendanceSummary:
-    """Aggregate attendance mix and rate over a configurable period."""
+def _period(days: int | None, today: date | None = None) -> tuple[date, date]:
     config = _reporting_config()
     window = days or config.get("RECENT_PERIOD_DAYS", 30)
-    period_end = _now_date()
-    period_start = period_end - timedelta(days=window)
-    records = AttendanceRecord.objects.filter(date__range=(period_start, period_end))
+    period_end = today or _now_date()
+    return period_end - timedelta(days=window), period_end
+
+
+def _attendance_totals_query(period_start: date, period_end: date, org: int | None = None):
+    records = _in_org(AttendanceRecord.objects.filter(date__range=(period_start, period_end)), org, "employee__")
+    return records.values("status").annotate(count=Count("id"))
+
+
+def _build_attendance_summary(period_start: date, period_end: date, rows) -> AttendanceSummary:
     totals: dict[str, int] = defaultdict(int)
-    for item in records.values("status").annotate(count=Count("id")):
+    for item in rows:
         totals[item["status"]] = item["count"]
     present_days = totals.get(AttendanceRecord.Status.PRESENT, 0)
     worked_days = sum(totals.values())
@@ -84,14 +130,20 @@ def attendance_summary(days: int | None = None) -> AttendanceSummary:
     )
 
 
-def performance_summary(days: int | None = None) -> PerformanceSummary:
-    """Produce aggregate performance insights across the organization."""
+def attendance_summary(
+    days: int | None = None, org: int | None = None, today: date | None = None
+) -> AttendanceSummary:
+    """Aggregate attendance mix and rate over a configurable period, optionally for one manager's org."""
+    period_start, period_end = _period(days, today)
+    rows = _attendance_totals_query(period_start, period_end, org)
+    return _build_attendance_summary(period_start, period_end, rows)
+
+
+def _performance_queries(period_start: date, period_end: date, org: int | None = None):
     config = _reporting_config()
-    window = days or config.get("RECENT_PERIOD_DAYS", 30)
-    period_end = _now_date()
-    period_start = period_end - timedelta(days=window)
-    reviews = PerformanceReview.objects.filter(review_period_end__range=(period_start, period_end))
-    aggregates = reviews.aggregate(avg_rating=Avg("rating"), review_count=Count("id"))
+    reviews = _in_org(
+        PerformanceReview.objects.filter(review_period_end__range=(period_start, period_end)), org, "employee__"
+    )
     threshold = config.get("PERFORMANCE_RATING_THRESHOLDS", {}).get("excellent", 4.5)
     top_performers = (
         reviews.values("employee", "employee__first_name", "employee__last_name")
@@ -99,6 +151,12 @@ def performance_summary(days: int | None = None) -> PerformanceSummary:
         .filter(avg_rating__gte=threshold)
         .order_by("-avg_rating")
     )
+    return reviews, dict(avg_rating=Avg("rating"), review_count=Count("id")), top_performers
+
+
+def _build_performance_summary(
+    period_start: date, period_end: date, aggregates: dict[str, Any], top_performers
+) -> PerformanceSummary:
     return PerformanceSummary(
         period_start=period_start,
         period_end=period_end,
@@ -116,25 +174,106 @@ def performance_summary(days: int | None = None) -> PerformanceSummary:
     )
 
 
-def employee_snapshot(employee_id: int) -> dict[str, Any]:
-    """Combine HR signals for a specific employee to simulate analytics pipelines."""
-    employee = Employee.objects.get(pk=employee_id)
-    attendance = AttendanceRecord.objects.filter(employee=employee).aggregate(
-        total_days=Count("id"),
-        present_days=Count("id", filter=Q(status=AttendanceRecord.Status.PRESENT)),
-        absent_days=Count("id", filter=Q(status=AttendanceRecord.Status.ABSENT)),
-    )
-    reviews = PerformanceReview.objects.filter(employee=employee)
-    review_stats = reviews.aggregate(
+def performance_summary(
+    days: int | None = None, org: int | None = None, today: date | None = None
+) -> PerformanceSummary:
+    """Produce aggregate performance insights across the organization (or one manager's org)."""
+    period_start, period_end = _period(days, today)
+    reviews, aggregates, top_performers = _performance_queries(period_start, period_end, org)
+    return _build_performance_summary(period_start, period_end, reviews.aggregate(**aggregates), top_performers)
+
+
+def _daily_summary_query(day: date):
+    return AttendanceRecord.objects.filter(date=day).values("status").order_by().annotate(count=Count("id"))
+
+
+def _build_daily_summary(day: date, rows) -> dict[str, Any]:
+    return {"date": day, "summary": {item["status"]: item["count"] for item in rows}}
+
+
+def daily_summary(day: date | None = None) -> dict[str, Any]:
+    """Attendance counts by status for ``day`` (today by default)."""
+    day = day or _now_date()
+    return _build_daily_summary(day, _daily_summary_query(day))
+
+
+DISTRIBUTION_INTERVALS = ("month", "quarter", "year")
+
+
+def _distribution_period(month: date, interval: str | None, start: date, end: date) -> str:
+    if interval == "month":
+        return f"{month:%Y-%m}"
+    if interval == "quarter":
+        return f"{month.year}-Q{(month.month - 1) // 3 + 1}"
+    if interval == "year":
+        return str(month.year)
+    return f"{start:%Y-%m}/{end:%Y-%m}"
+
+
+def rating_distribution(
+    start: date, end: date, interval: str | None = None, department: str | None = None
+) -> dict[str, Any]:
+    """
+    Rating histograms and percentiles per department for the months ``start`` to ``end``.
+
+    Reviews count in the month their period ended. With ``interval`` the range
+    is split into months, quarters or years; periods without reviews are left
+    out. The per-department monthly histograms are merged here, so the cost
+    depends on the number of departments and months, not reviews.
+    """
+    rows = histograms.histogram_rows(start, end)
+    if department is not None:
+        rows = rows.filter(department__name=department)
+    grouped: dict[str, dict[str, list[dict[str, int]]]] = defaultdict(lambda: defaultdict(list))
+    for name, month, counts in rows:
+        grouped[_distribution_period(month, interval, start, end)][name].append(counts)
+    periods = []
+    for period, departments in sorted(grouped.items()):
+        merged = {name: histograms.merge(counts) for name, counts in sorted(departments.items())}
+        periods.append(
+            {
+                "period": period,
+                "overall": histograms.describe(sum(merged.values(), Counter())),
+                "departments": [{"department": name, **histograms.describe(counts)} for name, counts in merged.items()],
+            }
+        )
+    return {
+        "start": histograms.month_of(start),
+        "end": end,
+        "interval": interval,
+        "percentiles": list(histograms.PERCENTILES),
+        "periods": periods,
+    }
+
+
+def _snapshot_queries(employee_id: int):
+    # Attendance totals come from the employee's yearly bitmaps, not a scan of their records.
+    attendance = bitmaps.bitmap_rows(employee_id)
+    reviews = PerformanceReview.objects.filter(employee_id=employee_id)
+    review_aggregates = dict(
         average_rating=Avg("rating"),
         review_count=Count("id"),
         last_review_end=Max("review_period_end"),
     )
+    return attendance, reviews, review_aggregates
+
+
+def _attendance_stats(bitmap_rows) -> dict[str, Any]:
+    attendance_bits = bitmaps.from_rows(bitmap_rows)
+    return {
+        **bitmaps.summary(attendance_bits),
+        "current_streak": bitmaps.current_streak(attendance_bits, _now_date()),
+    }
+
+
+def _build_employee_snapshot(
+    employee: Employee, attendance: dict[str, Any], review_stats: dict[str, Any]
+) -> dict[str, Any]:
     return {
         "employee": {
             "id": employee.id,
             "name": str(employee),
-            "department": employee.department,
+            "department": employee.department.name,
             "position": employee.position,
             "status": employee.status,
         },
@@ -145,3 +284,169 @@ def employee_snapshot(employee_id: int) -> dict[str, Any]:
             "last_review_end": review_stats["last_review_end"],
         },
     }
+
+
+def employee_snapshot(employee_id: int) -> dict[str, Any]:
+    """Combine HR signals for a specific employee to simulate analytics pipelines."""
+    employee = Employee.objects.select_related("department").get(pk=employee_id)
+    attendance, reviews, review_aggregates = _snapshot_queries(employee.pk)
+    return _build_employee_snapshot(
+        employee,
+        _attendance_stats(attendance),
+        reviews.aggregate(**review_aggregates),
+    )
+
+
+PERIOD_PATTERN = re.compile(r"^(?P<year>\d{4})-(?:(?P<month>\d{2})|Q(?P<quarter>[1-4]))$")
+
+
+def period_bounds(period: str) -> tuple[date, date]:
+    """Parse ``YYYY-MM`` or ``YYYY-Qn`` into the first and last day of that period."""
+    match = PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError("Periods look like YYYY-MM or YYYY-Qn.")
+    year = int(match["year"])
+    if match["quarter"]:
+        first_month = (int(match["quarter"]) - 1) * 3 + 1
+        last_month = first_month + 2
+    else:
+        first_month = last_month = int(match["month"])
+        if not 1 <= first_month <= 12:
+            raise ValueError("Months run from 01 to 12.")
+    return date(year, first_month, 1), date(year, last_month, calendar.monthrange(year, last_month)[1])
+
+
+def _compute_period_report(kind: str, period_start: date, period_end: date) -> dict[str, Any]:
+    if kind == ReportSnapshot.Kind.ATTENDANCE:
+        rows = _attendance_totals_query(period_start, period_end)
+        summary = asdict(_build_attendance_summary(period_start, period_end, rows))
+    else:
+        reviews, aggregates, top_performers = _performance_queries(period_start, period_end)
+        summary = asdict(
+            _build_performance_summary(period_start, period_end, reviews.aggregate(**aggregates), top_performers)
+        )
+    # Round-trip through JSON so fresh results look exactly like stored snapshots.
+    return json.loads(json.dumps(summary, cls=DjangoJSONEncoder))
+
+
+def period_report(kind: str, period: str) -> dict[str, Any]:
+    """
+    Attendance or performance summary for a calendar month or quarter.
+
+    Closed periods (ended before today) are computed once and then served from
+    ``ReportSnapshot``; a late edit invalidates the snapshot and the next call
+    stores a new version.
+    """
+    period_start, period_end = period_bounds(period)
+    if period_end >= _now_date():
+        summary = _compute_period_report(kind, period_start, period_end)
+        return {"period": period, "closed": False, "version": None, "summary": summary}
+
+    snapshots = ReportSnapshot.objects.filter(kind=kind, period_start=period_start, period_end=period_end)
+    latest = snapshots.order_by("-version").first()
+    if latest is None or latest.invalidated_at is not None:
+        try:
+            with transaction.atomic():
+                latest = ReportSnapshot.objects.create(
+                    kind=kind,
+                    period_start=period_start,
+                    period_end=period_end,
+                    version=(latest.version + 1) if latest else 1,
+                    payload=_compute_period_report(kind, period_start, period_end),
+                )
+        except IntegrityError:
+            latest = snapshots.order_by("-version").first()  # A concurrent request stored it first.
+    return {"period": period, "closed": True, "version": latest.version, "summary": latest.payload}
+
+
+def invalidate_period_reports(kind: str, *days: date | None) -> int:
+    """Mark current snapshots of ``kind`` that cover any of ``days`` as out of date."""
+    query = Q()
+    for day in {day for day in days if day is not None}:
+        query |= Q(period_start__lte=day, period_end__gte=day)
+    if not query:
+        return 0
+    return ReportSnapshot.objects.filter(query, kind=kind, invalidated_at__isnull=True).update(
+        invalidated_at=timezone.now()
+    )
+
+
+# Async variants. Independent queries are awaited together with asyncio.gather so
+# an ASGI worker can interleave many report requests without a thread each.
+
+
+async def _alist(queryset) -> list[Any]:
+    return [item async for item in queryset]
+
+
+async def aheadcount_summary(org: int | None = None) -> dict[str, Any]:
+    """Async version of :func:`headcount_summary`."""
+    employees, totals, by_department, department_names = _headcount_queries(org)
+    totals_result, departments, names = await asyncio.gather(
+        employees.aaggregate(**totals), _alist(by_department), _alist(department_names)
+    )
+    return {"totals": totals_result, "by_department": _build_by_department(departments, names)}
+
+
+async def aattendance_summary(
+    days: int | None = None, org: int | None = None, today: date | None = None
+) -> AttendanceSummary:
+    """Async version of :func:`attendance_summary`."""
+    period_start, period_end = _period(days, today)
+    rows = await _alist(_attendance_totals_query(period_start, period_end, org))
+    return _build_attendance_summary(period_start, period_end, rows)
+
+
+async def aperformance_summary(
+    days: int | None = None, org: int | None = None, today: date | None = None
+) -> PerformanceSummary:
+    """Async version of :func:`performance_summary`."""
+    period_start, period_end = _period(days, today)
+    reviews, aggregates, top_performers = _performance_queries(period_start, period_end, org)
+    aggregate_result, top = await asyncio.gather(reviews.aaggregate(**aggregates), _alist(top_performers))
+    return _build_performance_summary(period_start, period_end, aggregate_result, top)
+
+
+async def aemployee_snapshot(employee_id: int) -> dict[str, Any]:
+    """Async version of :func:`employee_snapshot`; the three lookups run concurrently."""
+    attendance, reviews, review_aggregates = _snapshot_queries(employee_id)
+    employee, bitmap_rows, review_stats = await asyncio.gather(
+        Employee.objects.select_related("department").aget(pk=employee_id),
+        _alist(attendance),
+        reviews.aaggregate(**review_aggregates),
+    )
+    return _build_employee_snapshot(employee, _attendance_stats(bitmap_rows), review_stats)
+
+
+async def adaily_summary(day: date | None = None) -> dict[str, Any]:
+    """Async version of :func:`daily_summary`."""
+    day = day or _now_date()
+    return _build_daily_summary(day, await _alist(_daily_summary_query(day)))
+
+
+DASHBOARD_SECTIONS = ("headcount", "attendance", "performance", "daily-summary")
+
+
+async def adashboard(sections: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """
+    Several reports in one payload for the HR homepage.
+
+    ``sections`` maps names from ``DASHBOARD_SECTIONS`` to their parameters
+    (``days`` and ``org`` as for the individual reports, ``date`` for
+    ``daily-summary``). Every section is computed for the same ``today``, and
+    the sections run concurrently with ``asyncio.gather``.
+    """
+    today = _now_date()
+    builders = {
+        "headcount": lambda params: aheadcount_summary(params.get("org")),
+        "attendance": lambda params: aattendance_summary(params.get("days"), params.get("org"), today),
+        "performance": lambda params: aperformance_summary(params.get("days"), params.get("org"), today),
+        "daily-summary": lambda params: adaily_summary(params.get("date") or today),
+    }
+    results = await asyncio.gather(*(builders[name](params) for name, params in sections.items()))
+    return {
+        "date": today,
+        "sections": {
+            name: asdict(result) if is_dataclass(result) else result for name, result in zip(sections, results)
+        },
+    }
@@ -0,0 +1,57 @@
+"""Signal handlers that invalidate closed-period report and timesheet snapshots on late edits.
+
+Invalidation runs once the write has committed, so a snapshot rebuilt while
+the write was still in flight (and so without it) is invalidated too.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from attendance.alerts import coerce_date
+from attendance.models import AttendanceRecord
+from performance.models import PerformanceReview
+
+from . import services, timesheets
+from .models import ReportSnapshot
+
+
+def _invalidate_on_commit(kind, *days):
+    transaction.on_commit(lambda: services.invalidate_period_reports(kind, *days))
+
+
+def _invalidate_attendance_on_commit(*days):
+    _invalidate_on_commit(ReportSnapshot.Kind.ATTENDANCE, *days)
+    transaction.on_commit(lambda: timesheets.invalidate_months(*days))
+
+
+@receiver(post_save, sender=AttendanceRecord)
+def invalidate_attendance_reports(sender, instance, raw=False, **kwargs):
+    """Invalidate the periods and timesheet months containing the record's new and previous dates."""
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    _invalidate_attendance_on_commit(coerce_date(instance.date), loaded.get("date"))
+
+
+@receiver(post_delete, sender=AttendanceRecord)
+def invalidate_attendance_reports_on_delete(sender, instance, **kwargs):
+    _invalidate_attendance_on_commit(coerce_date(instance.date))
+
+
+@receiver(post_save, sender=PerformanceReview)
+def invalidate_performance_reports(sender, instance, raw=False, **kwargs):
+    """Invalidate the periods containing the review's new and previous end dates."""
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    previous_end = loaded.get("review_period_end")
+    _invalidate_on_commit(
+        ReportSnapshot.Kind.PERFORMANCE,
+        coerce_date(instance.review_period_end),
+        coerce_date(previous_end) if previous_end else None,
+    )
+
+
+@receiver(post_delete, sender=PerformanceReview)
+def invalidate_performance_reports_on_delete(sender, instance, **kwargs):
+    _invalidate_on_commit(ReportSnapshot.Kind.PERFORMANCE, coerce_date(instance.review_period_end))
@@ -0,0 +1,112 @@
+"""Tests for closed-period report snapshots."""
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+from performance.models import PerformanceReview
+from reports import services
+from reports.models import ReportSnapshot
+
+
+class PeriodReportTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name="Christine",
+            last_name="Darden",
+            email="christine@example.com",
+            position="Engineer",
+            department="Aeronautics",
+            date_hired=date(2016, 3, 14),
+        )
+        self.record = AttendanceRecord.objects.create(
+            employee=self.employee, date=date(2024, 2, 12), status=AttendanceRecord.Status.PRESENT
+        )
+        AttendanceRecord.objects.create(employee=self.employee, date=date(2024, 2, 13), status=AttendanceRecord.Status.SICK)
+
+    def test_period_bounds(self):
+        self.assertEqual(services.period_bounds("2024-02"), (date(2024, 2, 1), date(2024, 2, 29)))
+        self.assertEqual(services.period_bounds("2024-Q4"), (date(2024, 10, 1), date(2024, 12, 31)))
+        with self.assertRaises(ValueError):
+            services.period_bounds("2024-13")
+
+    def test_closed_period_is_served_from_snapshot(self):
+        first = services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-Q1")
+        self.assertEqual(first["version"], 1)
+        self.assertEqual(first["summary"]["totals"], {"present": 1, "sick": 1})
+
+        with self.assertNumQueries(1):
+            again = services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-Q1")
+        self.assertEqual(again, first)
+
+    def test_late_edit_creates_a_new_version(self):
+        services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-02")
+        services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-03")
+
+        self.record.status = AttendanceRecord.Status.REMOTE
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.record.save()
+            self.assertIsNone(ReportSnapshot.objects.get(period_start=date(2024, 2, 1)).invalidated_at)
+        self.assertTrue(callbacks, "Invalidation waits for the commit.")
+
+        february = services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-02")
+        self.assertEqual(february["version"], 2)
+        self.assertEqual(february["summary"]["totals"], {"remote": 1, "sick": 1})
+        self.assertIsNone(
+            ReportSnapshot.objects.get(period_start=date(2024, 3, 1)).invalidated_at,
+            "Snapshots of other periods stay current.",
+        )
+
+    def test_moving_a_record_out_of_a_period_invalidates_it(self):
+        services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-02")
+        self.record.date = date(2024, 4, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record.save()
+        self.assertEqual(services.period_report(ReportSnapshot.Kind.ATTENDANCE, "2024-02")["version"], 2)
+
+    def test_performance_period_endpoint(self):
+        review = PerformanceReview.objects.create(
+            employee=self.employee,
+            review_period_start=date(2023, 10, 1),
+            review_period_end=date(2023, 12, 31),
+            reviewer_name="Manager",
+            rating=4.7,
+        )
+        url = reverse("reports:performance-period", args=["2023-Q4"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["closed"])
+        self.assertEqual(response.data["summary"]["review_count"], 1)
+
+        # Moving the review out of the quarter invalidates it, using the end date it was loaded with.
+        review = PerformanceReview.objects.get(pk=review.pk)
+        review.review_period_end = date(2024, 1, 31)
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+        self.assertEqual(self.client.get(url).data["summary"]["review_count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PerformanceReview.objects.create(
+                employee=self.employee,
+                review_period_start=date(2023, 10, 1),
+                review_period_end=date(2023, 12, 31),
+                reviewer_name="Manager",
+                rating=3.5,
+            )
+        self.assertEqual(self.client.get(url).data["summary"]["review_count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            PerformanceReview.objects.filter(review_period_end=date(2023, 12, 31)).delete()
+        self.assertEqual(self.client.get(url).data["summary"]["review_count"], 0)
+
+    def test_open_period_is_computed_live(self):
+        today = date.today()
+        response = self.client.get(reverse("reports:attendance-period", args=[f"{today:%Y-%m}"]))
+        self.assertFalse(response.data["closed"])
+        self.assertFalse(ReportSnapshot.objects.exists())
+
+    def test_invalid_period(self):
+        response = self.client.get(reverse("reports:attendance-period", args=["last-year"]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -8,6 +8,7 @@ from rest_framework.test import APITestCase
 from attendance.models import AttendanceRecord
 from employees.models import Employee
 from performance.models import PerformanceReview
+from reports.views import AsyncReportView
 
 
 class ReportsAPITests(APITestCase):
@@ -44,3 +45,48 @@ class ReportsAPITests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["employee"]["id"], self.employee.id)
+
+    def test_async_views_match_sync_views(self):
+        pairs = [
+            ("reports:headcount", "reports:async-headcount", {}),
+            ("reports:attendance", "reports:async-attendance", {}),
+            ("reports:performance", "reports:async-performance", {}),
+            ("reports:employee-snapshot", "reports:async-employee-snapshot", {"employee_id": self.employee.id}),
+        ]
+        for sync_name, async_name, kwargs in pairs:
+            sync_response = self.client.get(reverse(sync_name, kwargs=kwargs), {"days": 400})
+            async_response = self.client.get(reverse(async_name, kwargs=kwargs), {"days": 400})
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_dashboard_matches_individual_reports(self):
+        response = self.client.get(reverse("reports:dashboard"), {"days": 400, "performance.days": 30})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sections = response.json()["sections"]
+        self.assertEqual(list(sections), ["headcount", "attendance", "performance", "daily-summary"])
+        expected = {
+            "headcount": self.client.get(reverse("reports:headcount")),
+            "attendance": self.client.get(reverse("reports:attendance"), {"days": 400}),
+            "performance": self.client.get(reverse("reports:performance"), {"days": 30}),
+            "daily-summary": self.client.get(reverse("attendance-daily-summary")),
+        }
+        for name, individual in expected.items():
+            self.assertEqual(sections[name], individual.json(), name)
+        self.assertEqual(sections["performance"]["review_count"], 0)
+
+    def test_dashboard_section_selection_and_errors(self):
+        url = reverse("reports:dashboard")
+        response = self.client.get(url, {"sections": "daily-summary", "date": "2020-01-01"})
+        self.assertEqual(response.json()["sections"], {"daily-summary": {"date": "2020-01-01", "summary": {}}})
+        self.assertEqual(self.client.get(url, {"sections": "headcount,payroll"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"attendance.days": "week"}).status_code, 400)
+
+    def test_async_report_views_must_define_build(self):
+        with self.assertRaises(TypeError):
+            type("MissingBuild", (AsyncReportView,), {})
+        with self.assertRaises(TypeError):
+            type("SyncBuild", (AsyncReportView,), {"build": lambda self, request: {}})
+
+    async def test_async_snapshot_missing_employee(self):
+        response = await self.async_client.get(reverse("reports:async-employee-snapshot", kwargs={"employee_id": 9999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,123 @@
+"""Tests for timesheet aggregation and closed-month snapshots."""
+from datetime import date, time
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attendance.models import AttendanceRecord
+from employees.models import Employee
+from reports import timesheets
+from reports.models import TimesheetSnapshot
+
+
+class TimesheetTests(APITestCase):
+    def setUp(self):
+        self.katherine = Employee.objects.create(
+            first_name="Katherine",
+            last_name="Johnson",
+            email="katherine@example.com",
+            position="Mathematician",
+            department="Research",
+            date_hired=date(2012, 1, 9),
+        )
+        self.mary = Employee.objects.create(
+            first_name="Mary",
+            last_name="Jackson",
+            email="mary.j@example.com",
+            position="Engineer",
+            department="Research",
+            date_hired=date(2013, 4, 2),
+        )
+        shifts = [
+            (self.katherine, date(2024, 4, 1), time(9, 0), time(18, 0)),  # 9h, 1h overtime
+            (self.katherine, date(2024, 4, 2), time(9, 30), time(17, 30)),  # 8h, late
+            (self.mary, date(2024, 4, 8), time(22, 0), time(6, 0)),  # Overnight 8h, late
+            (self.mary, date(2024, 4, 9), time(8, 55), None),  # Still checked in
+        ]
+        for employee, day, check_in, check_out in shifts:
+            AttendanceRecord.objects.create(
+                employee=employee,
+                date=day,
+                status=AttendanceRecord.Status.PRESENT,
+                check_in_time=check_in,
+                check_out_time=check_out,
+            )
+
+    def test_monthly_totals_per_employee(self):
+        rows = timesheets.compute_timesheet(date(2024, 4, 1), date(2024, 4, 30))
+        by_employee = {row["employee_name"]: row for row in rows}
+        self.assertEqual(
+            by_employee["Katherine Johnson"],
+            {
+                "period_start": date(2024, 4, 1),
+                "employee_id": self.katherine.pk,
+                "employee_name": "Katherine Johnson",
+                "days_worked": 2,
+                "worked_hours": 17.0,
+                "overtime_hours": 1.0,
+                "late_arrivals": 1,
+            },
+        )
+        self.assertEqual(by_employee["Mary Jackson"]["worked_hours"], 8.0)
+        self.assertEqual(by_employee["Mary Jackson"]["days_worked"], 1)
+
+    def test_weekly_totals_per_department(self):
+        rows = timesheets.compute_timesheet(date(2024, 4, 1), date(2024, 4, 30), "department", "week")
+        self.assertEqual(
+            [(row["period_start"], row["department"], row["worked_hours"]) for row in rows],
+            [(date(2024, 4, 1), "Research", 17.0), (date(2024, 4, 8), "Research", 8.0)],
+        )
+
+    def test_closed_month_is_served_from_snapshot(self):
+        call_command("close_timesheet_month", "--month", "2024-04", stdout=StringIO())
+        self.assertEqual(TimesheetSnapshot.objects.count(), len(timesheets.GROUPINGS) * len(timesheets.PERIODS))
+
+        AttendanceRecord.objects.filter(employee=self.mary).update(check_out_time=time(23, 0))
+        response = self.client.get(reverse("reports:timesheet"), {"month": "2024-04", "group_by": "department"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["closed"])
+        self.assertEqual(response.data["rows"][0]["worked_hours"], 25.0)
+
+    def test_edits_in_a_closed_month_refresh_its_snapshots(self):
+        timesheets.close_month(date(2024, 4, 1))
+        record = AttendanceRecord.objects.get(employee=self.mary, date=date(2024, 4, 9))
+        record.check_out_time = time(16, 55)
+        with self.captureOnCommitCallbacks(execute=True):
+            record.save()
+        self.assertFalse(TimesheetSnapshot.objects.filter(invalidated_at__isnull=True).exists())
+
+        rows, from_snapshot = timesheets.month_timesheet(date(2024, 4, 1), "department")
+        self.assertTrue(from_snapshot)
+        self.assertEqual(rows[0]["worked_hours"], 33.0)
+        first, second = TimesheetSnapshot.objects.filter(
+            month=date(2024, 4, 1), group_by="department", period="month"
+        ).order_by("version")
+        self.assertEqual((first.version, second.version), (1, 2))
+        self.assertEqual(first.rows[0]["worked_hours"], 25.0)  # Kept for audit
+        self.assertIsNotNone(first.invalidated_at)
+        self.assertIsNone(second.invalidated_at)
+        self.assertEqual(second.rows[0]["worked_hours"], 33.0)
+        rows, _ = timesheets.month_timesheet(date(2024, 4, 1), "department")
+        self.assertEqual(rows[0]["worked_hours"], 33.0)
+        self.assertEqual(TimesheetSnapshot.objects.count(), len(timesheets.GROUPINGS) * len(timesheets.PERIODS) + 1)
+
+    def test_late_threshold_must_fall_within_the_day(self):
+        config = {"TIMESHEET": {"WORKDAY_START": "23:58", "LATE_GRACE_MINUTES": 5}}
+        with self.settings(REPORTING_CONFIG=config), self.assertRaises(ImproperlyConfigured):
+            timesheets.compute_timesheet(date(2024, 4, 1), date(2024, 4, 30))
+
+    def test_open_range_is_computed_live(self):
+        response = self.client.get(
+            reverse("reports:timesheet"), {"start": "2024-04-01", "end": "2024-04-07", "period": "day"}
+        )
+        self.assertFalse(response.data["closed"])
+        self.assertEqual(len(response.data["rows"]), 2)
+
+    def test_invalid_parameters(self):
+        url = reverse("reports:timesheet")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"month": "2024-04", "period": "year"}).status_code, 400)
@@ -0,0 +1,200 @@
+"""Timesheets: worked hours, overtime and late arrivals from attendance check-in/out times.
+
+Everything is aggregated by the database in a single grouped query: per-record
+worked seconds are computed in SQL, bucketed by day/week/month and summed per
+employee or department. Closed months are persisted as ``TimesheetSnapshot``
+rows and served from there; a later edit to one of the month's records marks
+its snapshots invalidated and the next read stores a new version of them.
+"""
+from __future__ import annotations
+
+import calendar
+from datetime import date, time
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Func, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Greatest, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from employees.models import full_name_expression
+
+from .models import TimesheetSnapshot
+
+GROUPINGS = {
+    "employee": ("employee_id",),
+    "department": ("employee__department_id", "employee__department__name"),
+}
+PERIODS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class SecondsBetween(Func):
+    """Seconds from ``start`` to ``end`` (two ``TimeField`` expressions), computed in SQL."""
+
+    arity = 2
+    output_field = IntegerField()
+    template = "CAST(EXTRACT(EPOCH FROM (%(expressions)s)) AS INTEGER)"
+    arg_joiner = " - "
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(ROUND((julianday(%(expressions)s)) * 86400) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="TIME_TO_SEC(TIMEDIFF(%(expressions)s))", arg_joiner=", ", **extra_context
+        )
+
+
+def timesheet_config() -> dict[str, Any]:
+    config = getattr(settings, "REPORTING_CONFIG", {}).get("TIMESHEET", {})
+    return {
+        "STANDARD_DAY_HOURS": float(config.get("STANDARD_DAY_HOURS", 8)),
+        "WORKDAY_START": time.fromisoformat(config.get("WORKDAY_START", "09:00")),
+        "LATE_GRACE_MINUTES": int(config.get("LATE_GRACE_MINUTES", 5)),
+    }
+
+
+def month_bounds(month: date) -> tuple[date, date]:
+    """Return the first and last day of ``month``'s calendar month."""
+    first = month.replace(day=1)
+    return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+
+def _late_after(config: dict[str, Any]) -> time:
+    start = config["WORKDAY_START"]
+    minutes = start.hour * 60 + start.minute + config["LATE_GRACE_MINUTES"]
+    if not 0 <= minutes < 24 * 60:
+        raise ImproperlyConfigured(
+            'REPORTING_CONFIG["TIMESHEET"]: WORKDAY_START plus LATE_GRACE_MINUTES must fall within the day.'
+        )
+    return time(minutes // 60, minutes % 60, start.second)
+
+
+def compute_timesheet(start: date, end: date, group_by: str = "employee", period: str = "month") -> list[dict[str, Any]]:
+    """Aggregate worked hours, overtime and late arrivals for ``start``..``end`` (inclusive)."""
+    if group_by not in GROUPINGS:
+        raise ValueError(f"group_by must be one of {sorted(GROUPINGS)}")
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {sorted(PERIODS)}")
+    config = timesheet_config()
+    standard_seconds = int(config["STANDARD_DAY_HOURS"] * 3600)
+
+    records = (
+        AttendanceRecord.objects.filter(date__range=(start, end), check_in_time__isnull=False)
+        .annotate(raw_seconds=SecondsBetween(F("check_out_time"), F("check_in_time")))
+        .annotate(
+            # A check-out earlier than the check-in is an overnight shift.
+            worked_seconds=Case(
+                When(raw_seconds__lt=0, then=F("raw_seconds") + SECONDS_PER_DAY),
+                default=F("raw_seconds"),
+                output_field=IntegerField(),
+            )
+        )
+        .annotate(
+            overtime_seconds=Greatest(F("worked_seconds") - Value(standard_seconds), Value(0)),
+            bucket=PERIODS[period]("date"),
+        )
+    )
+    keys = GROUPINGS[group_by]
+    rows = (
+        records.values("bucket", *keys)
+        .annotate(
+            days=Count("id", filter=Q(check_out_time__isnull=False)),
+            worked=Sum("worked_seconds"),
+            overtime=Sum("overtime_seconds"),
+            late_arrivals=Count("id", filter=Q(check_in_time__gt=_late_after(config))),
+        )
+        .order_by("bucket", *keys)
+    )
+    if group_by == "employee":
+        rows = rows.annotate(employee_name=full_name_expression("employee__"))
+
+    results = []
+    for row in rows:
+        item = {"period_start": row["bucket"]}
+        if group_by == "employee":
+            item["employee_id"] = row["employee_id"]
+            item["employee_name"] = row["employee_name"]
+        else:
+            item["department_id"] = row["employee__department_id"]
+            item["department"] = row["employee__department__name"]
+        item.update(
+            days_worked=row["days"],
+            worked_hours=round((row["worked"] or 0) / 3600, 2),
+            overtime_hours=round((row["overtime"] or 0) / 3600, 2),
+            late_arrivals=row["late_arrivals"],
+        )
+        results.append(item)
+    return results
+
+
+def _latest(first: date, group_by: str, period: str) -> TimesheetSnapshot | None:
+    snapshots = TimesheetSnapshot.objects.filter(month=first, group_by=group_by, period=period)
+    return snapshots.order_by("-version").first()
+
+
+def _store_version(first: date, group_by: str, period: str, latest: TimesheetSnapshot | None) -> TimesheetSnapshot:
+    """Compute and store the version after ``latest`` (version 1 if there is none yet)."""
+    _, last = month_bounds(first)
+    try:
+        with transaction.atomic():
+            return TimesheetSnapshot.objects.create(
+                month=first,
+                group_by=group_by,
+                period=period,
+                version=(latest.version + 1) if latest else 1,
+                rows=compute_timesheet(first, last, group_by, period),
+            )
+    except IntegrityError:
+        return _latest(first, group_by, period)  # A concurrent request stored it first.
+
+
+def close_month(month: date) -> list[TimesheetSnapshot]:
+    """Persist every grouping/period of ``month``'s timesheet; current snapshots are left untouched."""
+    first, _ = month_bounds(month)
+    snapshots = []
+    for group_by in GROUPINGS:
+        for period in PERIODS:
+            latest = _latest(first, group_by, period)
+            if latest is None or latest.invalidated_at is not None:
+                latest = _store_version(first, group_by, period, latest)
+            snapshots.append(latest)
+    return snapshots
+
+
+def month_timesheet(month: date, group_by: str = "employee", period: str = "month") -> tuple[list[dict[str, Any]], bool]:
+    """Return ``(rows, from_snapshot)`` for a calendar month, preferring the latest version of its closed snapshot."""
+    first, last = month_bounds(month)
+    latest = _latest(first, group_by, period)
+    if latest is None:
+        return compute_timesheet(first, last, group_by, period), False
+    if latest.invalidated_at is not None:
+        latest = _store_version(first, group_by, period, latest)
+    return latest.rows, True
+
+
+def invalidate_months(*days: date | None) -> int:
+    """Mark the current snapshots of the months containing any of ``days`` as out of date."""
+    months = {day.replace(day=1) for day in days if day is not None}
+    if not months:
+        return 0
+    return TimesheetSnapshot.objects.filter(month__in=months, invalidated_at__isnull=True).update(
+        invalidated_at=timezone.now()
+    )
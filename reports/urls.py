@@ -9,5 +9,20 @@ urlpatterns = [
     path("headcount/", views.HeadcountReportView.as_view(), name="headcount"),
     path("attendance/", views.AttendanceReportView.as_view(), name="attendance"),
     path("performance/", views.PerformanceReportView.as_view(), name="performance"),
+    path("performance/distribution/", views.RatingDistributionView.as_view(), name="performance-distribution"),
+    path("attendance/periods/<str:period>/", views.AttendancePeriodReportView.as_view(), name="attendance-period"),
+    path("performance/periods/<str:period>/", views.PerformancePeriodReportView.as_view(), name="performance-period"),
     path("employee/<int:employee_id>/", views.EmployeeSnapshotView.as_view(), name="employee-snapshot"),
+    path("timesheet/", views.TimesheetReportView.as_view(), name="timesheet"),
+    # Async (ASGI-native) variants of the reports above
+    path("async/headcount/", views.AsyncHeadcountReportView.as_view(), name="async-headcount"),
+    path("async/attendance/", views.AsyncAttendanceReportView.as_view(), name="async-attendance"),
+    path("async/performance/", views.AsyncPerformanceReportView.as_view(), name="async-performance"),
+    path(
+        "async/employee/<int:employee_id>/",
+        views.AsyncEmployeeSnapshotView.as_view(),
+        name="async-employee-snapshot",
+    ),
+    # Several of the reports above in one round trip (async, so the sections run concurrently)
+    path("dashboard/", views.AsyncDashboardView.as_view(), name="dashboard"),
 ]
@@ -1,21 +1,59 @@
 """REST endpoints that expose reporting insights."""
+import inspect
 from dataclasses import asdict
+from datetime import date
+from typing import Any
 
-from django.http import Http404
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.views import View
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from employees.models import Employee
 
-from . import services
+from . import services, timesheets
+from .models import ReportSnapshot
+
+
+def _days_arg(request):
+    days = request.GET.get("days")
+    return int(days) if days is not None and days.isdigit() else None
+
+
+def _org_arg(request):
+    """``?org=<manager id>`` scopes a report to that manager's whole org."""
+    org = request.GET.get("org")
+    return int(org) if org is not None and org.isdigit() else None
+
+
+def _section_params(params: dict[str, str]) -> dict[str, Any]:
+    parsed: dict[str, Any] = {}
+    for key in ("days", "org"):
+        if params.get(key):
+            if not params[key].isdigit():
+                raise ValueError(key)
+            parsed[key] = int(params[key])
+    if params.get("date"):
+        parsed["date"] = date.fromisoformat(params["date"])
+    return parsed
+
+
+def _json_error(detail: str) -> HttpResponse:
+    return HttpResponse(JSONRenderer().render({"detail": detail}), content_type="application/json", status=400)
+
+
+class InvalidReportParameters(Exception):
+    """Raised from ``AsyncReportView.build`` to answer 400 with the message as ``detail``."""
 
 
 class HeadcountReportView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        payload = services.headcount_summary()
+        payload = services.headcount_summary(_org_arg(request))
         return Response(payload)
 
 
@@ -23,9 +61,7 @@ class AttendanceReportView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        days = request.query_params.get("days")
-        days_arg = int(days) if days is not None and days.isdigit() else None
-        summary = services.attendance_summary(days_arg)
+        summary = services.attendance_summary(_days_arg(request), _org_arg(request))
         return Response(asdict(summary))
 
 
@@ -33,12 +69,43 @@ class PerformanceReportView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        days = request.query_params.get("days")
-        days_arg = int(days) if days is not None and days.isdigit() else None
-        summary = services.performance_summary(days_arg)
+        summary = services.performance_summary(_days_arg(request), _org_arg(request))
         return Response(asdict(summary))
 
 
+class RatingDistributionView(APIView):
+    """
+    Rating histograms with p10/p50/p90 per department.
+
+    ``start`` and ``end`` take ``YYYY-MM`` or ``YYYY-Qn`` (``period`` sets
+    both) and default to the last twelve months; ``interval=month|quarter|year``
+    splits the range and ``department=<name>`` narrows it to one department.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        params = request.query_params
+        interval = params.get("interval") or None
+        if interval is not None and interval not in services.DISTRIBUTION_INTERVALS:
+            return Response({"detail": "interval must be month, quarter or year."}, status=400)
+        today = timezone.localdate()
+        first_month = today.year * 12 + today.month - 12  # Eleven months before this one
+        try:
+            start_period = params.get("start") or params.get("period")
+            start = (
+                services.period_bounds(start_period)[0]
+                if start_period
+                else date(first_month // 12, first_month % 12 + 1, 1)
+            )
+            end = services.period_bounds(params.get("end") or params.get("period") or f"{today:%Y-%m}")[1]
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+        if end < start:
+            return Response({"detail": "end must not be before start."}, status=400)
+        return Response(services.rating_distribution(start, end, interval, params.get("department")))
+
+
 class EmployeeSnapshotView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -48,3 +115,151 @@ class EmployeeSnapshotView(APIView):
         except Employee.DoesNotExist as exc:
             raise Http404 from exc
         return Response(payload)
+
+
+class PeriodReportView(APIView):
+    """Attendance or performance summary for ``YYYY-MM`` or ``YYYY-Qn``, snapshotted once closed."""
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    kind = None
+
+    def get(self, request, period: str):
+        try:
+            payload = services.period_report(self.kind, period)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+        return Response(payload)
+
+
+class AttendancePeriodReportView(PeriodReportView):
+    kind = ReportSnapshot.Kind.ATTENDANCE
+
+
+class PerformancePeriodReportView(PeriodReportView):
+    kind = ReportSnapshot.Kind.PERFORMANCE
+
+
+class TimesheetReportView(APIView):
+    """
+    Worked hours, overtime and late arrivals.
+
+    Pass ``month=YYYY-MM`` (served from the closed-month snapshot when there is
+    one) or an explicit ``start``/``end`` date range, plus optional
+    ``group_by=employee|department`` and ``period=day|week|month``.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        group_by = request.query_params.get("group_by", "employee")
+        period = request.query_params.get("period", "month")
+        if group_by not in timesheets.GROUPINGS or period not in timesheets.PERIODS:
+            return Response(
+                {"detail": "group_by must be employee or department; period must be day, week or month."},
+                status=400,
+            )
+        try:
+            if "month" in request.query_params:
+                month = date.fromisoformat(f"{request.query_params['month']}-01")
+                start, end = timesheets.month_bounds(month)
+                rows, from_snapshot = timesheets.month_timesheet(month, group_by, period)
+            else:
+                start = date.fromisoformat(request.query_params["start"])
+                end = date.fromisoformat(request.query_params["end"])
+                rows, from_snapshot = timesheets.compute_timesheet(start, end, group_by, period), False
+        except (KeyError, ValueError):
+            return Response({"detail": "Provide month=YYYY-MM or start and end as YYYY-MM-DD."}, status=400)
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "group_by": group_by,
+                "period": period,
+                "closed": from_snapshot,
+                "rows": rows,
+            }
+        )
+
+
+class AsyncReportView(View):
+    """
+    Read-only report endpoint served natively under ASGI.
+
+    DRF views are synchronous, so these render with DRF's JSON renderer directly.
+    Like the APIViews above, reports are readable without authentication.
+    Subclasses must define ``async def build()``; ``View`` does not use
+    ``ABCMeta``, so ``__init_subclass__`` enforces that when the class is defined.
+    """
+
+    http_method_names = ["get", "head"]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.build is AsyncReportView.build or not inspect.iscoroutinefunction(cls.build):
+            raise TypeError(f"{cls.__name__} must define an async build(request, **kwargs) method.")
+
+    async def build(self, request, **kwargs):
+        """Return the report payload for ``request``."""
+
+    async def get(self, request, **kwargs):
+        try:
+            payload = await self.build(request, **kwargs)
+        except InvalidReportParameters as exc:
+            return _json_error(str(exc))
+        return HttpResponse(JSONRenderer().render(payload), content_type="application/json")
+
+
+class AsyncHeadcountReportView(AsyncReportView):
+    async def build(self, request):
+        return await services.aheadcount_summary(_org_arg(request))
+
+
+class AsyncAttendanceReportView(AsyncReportView):
+    async def build(self, request):
+        return asdict(await services.aattendance_summary(_days_arg(request), _org_arg(request)))
+
+
+class AsyncPerformanceReportView(AsyncReportView):
+    async def build(self, request):
+        return asdict(await services.aperformance_summary(_days_arg(request), _org_arg(request)))
+
+
+class AsyncEmployeeSnapshotView(AsyncReportView):
+    async def build(self, request, employee_id: int):
+        try:
+            return await services.aemployee_snapshot(employee_id)
+        except Employee.DoesNotExist as exc:
+            raise Http404 from exc
+
+
+class AsyncDashboardView(AsyncReportView):
+    """
+    Several reports in one round trip for the HR homepage.
+
+    ``sections`` is a comma-separated list of ``headcount``, ``attendance``,
+    ``performance`` and ``daily-summary`` (all of them by default). ``days``,
+    ``org`` and ``date`` apply to every section that takes them; prefix a
+    parameter with a section name to set it for that section only, e.g.
+    ``?sections=attendance,performance&days=30&performance.days=90``.
+    """
+
+    async def build(self, request):
+        names = [name for name in request.GET.get("sections", "").split(",") if name] or services.DASHBOARD_SECTIONS
+        unknown = sorted(set(names) - set(services.DASHBOARD_SECTIONS))
+        if unknown:
+            raise InvalidReportParameters(
+                f"Unknown sections: {', '.join(unknown)}. Choose from {', '.join(services.DASHBOARD_SECTIONS)}."
+            )
+        sections = {}
+        for name in names:
+            params = {key: request.GET[key] for key in ("days", "org", "date") if key in request.GET}
+            params.update(
+                {key.split(".", 1)[1]: value for key, value in request.GET.items() if key.startswith(f"{name}.")}
+            )
+            try:
+                sections[name] = _section_params(params)
+            except ValueError as exc:
+                raise InvalidReportParameters(
+                    f"{name}: days and org must be integers and date must be YYYY-MM-DD."
+                ) from exc
+        return await services.adashboard(sections)
@@ -25,7 +25,7 @@ print("="*80)
 
 # Simple SELECT
 print_query(
-    Employee.objects.filter(department="Engineering"),
+    Employee.objects.filter(department__name="Engineering"),
     "1. SELECT with WHERE"
 )
 
@@ -37,7 +37,7 @@ print_query(
 
 # GROUP BY
 print_query(
-    Employee.objects.values('department').annotate(count=Count('id')),
+    Employee.objects.values('department_id').annotate(count=Count('id')),
     "3. SELECT with GROUP BY"
 )
 
@@ -53,7 +53,7 @@ print_query(
 # Complex WHERE
 print_query(
     Employee.objects.filter(
-        Q(department='Engineering') | Q(department='Analytics'),
+        Q(department__name='Engineering') | Q(department__name='Analytics'),
         status=Employee.EmploymentStatus.ACTIVE,
         date_hired__gte='2019-01-01'
     ),
@@ -17,10 +17,10 @@ print("="*80)
 # Employees
 print("\n📊 EMPLOYEES")
 print("-"*80)
-employees = Employee.objects.all()
+employees = Employee.objects.select_related('department')
 for emp in employees:
     print(f"ID: {emp.id:2} | {emp.first_name} {emp.last_name:20} | "
-          f"{emp.department:15} | {emp.position}")
+          f"{emp.department.name:15} | {emp.position}")
 print(f"\nTotal: {employees.count()} employees")
 
 # Attendance Records